@@ -28,6 +28,11 @@ def create_app(config_overrides: dict | None = None):
     db.init_app(app)
     Migrate(app, db)
 
+    # Publish job state/progress deltas for /api/jobs/<id>/events
+    from app.services import job_events
+
+    job_events.install()
+
     # Blueprints
     from app.routes import api_bp, storage_bp, pipeline_bp
     from app.routes.job_routes import job_bp
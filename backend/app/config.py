@@ -31,6 +31,7 @@ class Config:
     S3_BUCKET = os.getenv("S3_BUCKET", "edu-dubbing")
     S3_BUCKET_UPLOADS = os.getenv("S3_BUCKET_UPLOADS", "uploads")
     S3_BUCKET_OUTPUTS = os.getenv("S3_BUCKET_OUTPUTS", "outputs")
+    S3_BUCKET_CHECKPOINTS = os.getenv("S3_BUCKET_CHECKPOINTS", "checkpoints")
 
 
 # Instantiate a global config object for legacy imports
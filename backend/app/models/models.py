@@ -0,0 +1,202 @@
+import uuid
+from sqlalchemy.sql import func
+from sqlalchemy import (
+    Column, Text, JSON, ForeignKey, Boolean, Numeric, CheckConstraint, Index, Enum as ENUM, TIMESTAMP, BigInteger,
+    DDL, cast, event
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from app.database import db
+
+class AppUser(db.Model):
+    __tablename__ = "app_user"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email = Column(Text, unique=True, nullable=False)
+    display_name = Column(Text)
+    password_hash = Column(Text, nullable=False)
+    role = Column(Text, default="creator")
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    projects = relationship("Project", backref="owner", cascade="all,delete")
+    __table_args__ = (
+        Index(
+            "idx_app_user_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# The trigram indexes on app_user.email and asset.original_name need pg_trgm
+# (app_user is created first)
+event.listen(
+    AppUser.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+class Project(db.Model):
+    __tablename__ = "project"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("app_user.id", ondelete="CASCADE"))
+    name = Column(Text, nullable=False)
+    meta = Column(JSON, default={})
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    __table_args__ = (Index("idx_project_owner", "owner_id"),)
+
+
+class Asset(db.Model):
+    __tablename__ = "asset"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("app_user.id", ondelete="CASCADE"))
+    project_id = Column(UUID(as_uuid=True), ForeignKey("project.id"))
+
+    kind = Column(Text, nullable=False)
+    uri = Column(Text, nullable=False)
+    duration_sec = Column(Numeric)
+    # SHA-256 of the uploaded bytes (computed server-side while ingesting)
+    content_sha256 = Column(Text)
+    # Uploaded filename (also in meta), as a column so job search can index it
+    original_name = Column(Text)
+    meta = Column(JSON, default={})
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    __table_args__ = (
+    CheckConstraint("kind IN ('video','audio','subtitle','text')"),
+    Index("idx_asset_owner", "owner_id"),
+    Index("idx_asset_project", "project_id"),
+    Index("idx_asset_content_sha256", "content_sha256"),
+    Index(
+        "idx_asset_original_name_trgm",
+        "original_name",
+        postgresql_using="gin",
+        postgresql_ops={"original_name": "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql"),
+    )
+
+
+class Job(db.Model):
+    __tablename__ = "job"
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id = db.Column(UUID(as_uuid=True), db.ForeignKey("app_user.id", ondelete="CASCADE"), nullable=False)
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey("project.id"))
+    input_asset_id = db.Column(UUID(as_uuid=True), db.ForeignKey("asset.id"))
+    state = db.Column(
+        ENUM("queued", "running", "succeeded", "failed", "cancelled", name="job_status"),
+        nullable=False,
+        default="queued",
+    )
+    error_code = db.Column(Text)
+    model_version = db.Column(Text)
+    meta = db.Column(JSONB, nullable=False, default=dict)
+    current_step = db.Column(Text)
+    progress = db.Column(db.Float)
+    retry_count = db.Column(db.Integer, nullable=False, server_default="0", default=0)
+    last_error_message = db.Column(Text)
+    created_at = db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+    started_at = db.Column(TIMESTAMP(timezone=True))
+    finished_at = db.Column(TIMESTAMP(timezone=True))
+    __table_args__ = (
+        Index("idx_job_owner", "owner_id"),
+        Index("idx_job_state", "state"),
+        # Keyset pagination of the job lists: (created_at, id) for /admin, per owner for /my
+        Index("idx_job_created_id", "created_at", "id"),
+        Index("idx_job_owner_created_id", "owner_id", "created_at", "id"),
+        # Job id prefix search (id::text LIKE 'abc%')
+        Index(
+            "idx_job_id_text",
+            cast(id, Text).label("id_text"),
+            postgresql_ops={"id_text": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        db.UniqueConstraint('input_asset_id', name='unique_job_input'),
+    )
+
+
+class JobStep(db.Model):
+    __tablename__ = "job_step"
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    name = db.Column(Text, nullable=False)
+    # states: pending | running | succeeded | failed | retrying
+    state = db.Column(Text, nullable=False, default="pending")
+    started_at = db.Column(TIMESTAMP(timezone=True))
+    finished_at = db.Column(TIMESTAMP(timezone=True))
+    metrics = db.Column(JSONB, nullable=False, default=dict)
+    retry_count = db.Column(db.Integer, nullable=False, server_default="0", default=0)
+    log_ref = db.Column(Text)
+    __table_args__ = (
+        Index("idx_jobstep_job", "job_id"),
+    )
+
+
+class TranscriptSegment(db.Model):
+    """
+    One timestamped transcript segment of a finished job (lang "en" or "sw"),
+    or at seq -1 the full text of that language.
+    Kept out of Job.meta so reading a job row doesn't load its transcripts;
+    see app/services/transcripts.py.
+    """
+    __tablename__ = "transcript_segment"
+    id = db.Column(BigInteger, primary_key=True, autoincrement=True)
+    job_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    lang = db.Column(Text, nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    start_sec = db.Column(db.Float)
+    end_sec = db.Column(db.Float)
+    text = db.Column(Text, nullable=False)
+    __table_args__ = (
+        db.UniqueConstraint("job_id", "lang", "seq", name="uq_transcript_segment_job_lang_seq"),
+    )
+
+
+class JobOutput(db.Model):
+    __tablename__ = "job_output"
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    kind = db.Column(Text, nullable=False)
+    asset_id = db.Column(UUID(as_uuid=True), db.ForeignKey("asset.id"))
+    meta = db.Column(JSONB, nullable=False, default=dict)
+    created_at = db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+    __table_args__ = (
+        CheckConstraint("kind IN ('translated_text','tts_audio','lipsynced_video','subtitle')"),
+        Index("idx_joboutput_job", "job_id"),
+    )
+
+class Feedback(db.Model):
+    __tablename__ = "feedback"
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("app_user.id"))
+    verdict = db.Column(Text, nullable=False)
+    comment = db.Column(Text)
+    meta = db.Column(JSONB, nullable=False, default=dict)
+    created_at = db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+    __table_args__ = (
+        CheckConstraint("verdict IN ('approve','reject','edit')"),
+        Index("idx_feedback_job", "job_id"),
+    )
+
+class DatasetQueue(db.Model):
+    __tablename__ = "dataset_queue"
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    sample_ref = db.Column(Text)
+    lang_pair = db.Column(Text)
+    approved = db.Column(Boolean, default=False)
+    created_at = db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+
+class AnalyticsEvent(db.Model):
+    __tablename__ = "analytics_event"
+    id = db.Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("app_user.id"))
+    job_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job.id"))
+    event_name = db.Column(Text, nullable=False)
+    event_ts = db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+    payload = db.Column(JSONB, nullable=False, default=dict)
+    __table_args__ = (
+        Index("idx_analytics_event_name", "event_name"),
+        Index("idx_analytics_event_ts", "event_ts"),
+    )
@@ -10,8 +10,9 @@ from flask import Blueprint, jsonify, request
 from sqlalchemy import func
 
 from app.database import db
-from app.models.models import Job, JobStep
+from app.models.models import Asset, Job, JobStep
 from app.routes.auth_routes import require_admin
+from app.services.transcripts import iter_job_segments
 from app.utils.minio_client import get_minio_client
 
 logger = logging.getLogger(__name__)
@@ -102,6 +103,19 @@ def metrics_overview():
             .scalar() or 0
         )
 
+        # Content dedup: share of hashed uploads that re-used an earlier job's outputs
+        dedup_eligible = (
+            db.session.query(func.count(Job.id))
+            .join(Asset, Job.input_asset_id == Asset.id)
+            .filter(Asset.content_sha256.isnot(None))
+            .scalar() or 0
+        )
+        dedup_hits = (
+            db.session.query(func.count(Job.id))
+            .filter(Job.meta.has_key("dedup_of"))
+            .scalar() or 0
+        )
+
         return jsonify({
             "total_jobs": total_jobs,
             "jobs_by_state": {
@@ -113,6 +127,11 @@ def metrics_overview():
             },
             "avg_processing_time_seconds": avg_processing_time,
             "active_tasks": active_tasks,
+            "dedup": {
+                "hits": dedup_hits,
+                "eligible": dedup_eligible,
+                "hit_rate": round(dedup_hits / dedup_eligible, 4) if dedup_eligible else None,
+            },
         }), 200
 
     except Exception as e:
@@ -350,8 +369,12 @@ def monitoring_external_ai():
 
         if response.status_code == 200:
             data = response.json()
+            # Servers without warmup tracking load models on first use
+            ready = data.get("ready", True)
             return jsonify({
-                "status": "online",
+                "status": "online" if ready else "warming_up",
+                "ready": ready,
+                "warmup": data.get("warmup"),
                 "response_time_ms": round(response_time, 2),
                 "health_data": data,
                 "url": health_url,
@@ -453,6 +476,13 @@ def metrics_pipeline():
                         "max": max(durations),
                         "count": len(durations),
                     }
+                    # Measured by external_ai's stage profiler (newer jobs only)
+                    cpu = [s.metrics["cpu_seconds"] for s in steps if s.metrics and s.metrics.get("cpu_seconds") is not None]
+                    rss = [s.metrics["peak_rss_mb"] for s in steps if s.metrics and s.metrics.get("peak_rss_mb") is not None]
+                    if cpu:
+                        step_durations[step_name]["avg_cpu"] = sum(cpu) / len(cpu)
+                    if rss:
+                        step_durations[step_name]["max_peak_rss_mb"] = max(rss)
 
         return jsonify({
             "text_analytics": {
@@ -599,3 +629,102 @@ def metrics_pipeline_text_analytics():
         logger.error(f"Error fetching text analytics: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+
+
+# ------------------------------------------------------------------------------
+# TRANSLATION MEMORY
+# ------------------------------------------------------------------------------
+
+TM_IMPORT_BATCH_SIZE = 500
+
+
+def _segment_pairs(english_segments, swahili_segments):
+    """
+    Pair English and Swahili segments of one job.
+
+    Segments are aligned by index when both lists have the same length,
+    otherwise by identical (start, end) timestamps.
+    """
+    english_segments = [s for s in english_segments or [] if isinstance(s, dict)]
+    swahili_segments = [s for s in swahili_segments or [] if isinstance(s, dict)]
+
+    if len(english_segments) == len(swahili_segments):
+        candidates = zip(english_segments, swahili_segments)
+    else:
+        by_time = {(s.get("start"), s.get("end")): s for s in swahili_segments}
+        candidates = (
+            (en, by_time[(en.get("start"), en.get("end"))])
+            for en in english_segments
+            if (en.get("start"), en.get("end")) in by_time
+        )
+
+    pairs = []
+    for en, sw in candidates:
+        en_text = (en.get("text") or "").strip()
+        sw_text = (sw.get("text") or "").strip()
+        if en_text and sw_text:
+            pairs.append([en_text, sw_text])
+    return pairs
+
+
+@admin_bp.route("/translation-memory/warm", methods=["POST"])
+def warm_translation_memory():
+    """Push English/Swahili segment pairs of finished jobs into external_ai's translation memory."""
+    if not require_admin():
+        return jsonify({"error": "Admin privileges required"}), 403
+
+    external_ai_url = os.getenv("EXTERNAL_AI_URL", "http://host.docker.internal:7001").rstrip("/")
+    import_url = f"{external_ai_url}/tm/import"
+
+    jobs_scanned = 0
+    pairs_sent = 0
+    pairs_stored = 0
+    batch = []
+
+    def flush():
+        nonlocal pairs_sent, pairs_stored
+        if not batch:
+            return
+        resp = requests.post(import_url, json={"pairs": batch, "source": "backend-warm"}, timeout=60)
+        resp.raise_for_status()
+        pairs_sent += len(batch)
+        pairs_stored += resp.json().get("stored", 0)
+        batch.clear()
+
+    try:
+        for _, english_segments, swahili_segments in iter_job_segments(Job.state == "succeeded"):
+            jobs_scanned += 1
+            batch.extend(_segment_pairs(english_segments, swahili_segments))
+            if len(batch) >= TM_IMPORT_BATCH_SIZE:
+                flush()
+
+        # Jobs whose transcripts are still in meta (not yet migrated)
+        jobs = (
+            Job.query.filter(Job.state == "succeeded", Job.meta.has_key("english_segments"))
+            .order_by(Job.finished_at.desc().nullslast())
+            .yield_per(100)
+        )
+        for job in jobs:
+            jobs_scanned += 1
+            meta = job.meta or {}
+            batch.extend(_segment_pairs(meta.get("english_segments"), meta.get("swahili_segments")))
+            if len(batch) >= TM_IMPORT_BATCH_SIZE:
+                flush()
+        flush()
+
+        return jsonify({
+            "jobs_scanned": jobs_scanned,
+            "pairs_sent": pairs_sent,
+            "pairs_stored": pairs_stored,
+        }), 200
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error warming translation memory: {e}", exc_info=True)
+        return jsonify({
+            "error": f"external_ai import failed: {e}",
+            "jobs_scanned": jobs_scanned,
+            "pairs_sent": pairs_sent,
+        }), 502
+    except Exception as e:
+        logger.error(f"Error warming translation memory: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
@@ -1,12 +1,20 @@
+import base64
 import datetime
+import hashlib
+import hmac
+import json
 import logging
+import mimetypes
 import os
+import time
 import uuid
 from decimal import Decimal
 from pathlib import Path
 from uuid import UUID
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
+from sqlalchemy import select, text, union
+from werkzeug.utils import secure_filename
 
 from app.database import db
 from app.models.models import AppUser, Project, Job, JobStep, JobOutput, Asset
@@ -17,23 +25,91 @@ logger = logging.getLogger(__name__)
 # Lazily load heavy dependencies when needed (avoid circular imports)
 celery_app = None
 upload_file = None
+upload_stream = None
+presign_put_url = None
+stat_object = None
+object_sha256 = None
 queue_dubbing_chain = None
 TESTING_ENV = os.getenv("FLASK_ENV") == "testing" or os.getenv("TESTING") == "1"
 
+# Live status stream (/<job_id>/events): streams end after SSE_MAX_SECONDS and the
+# browser reconnects; a comment line every SSE_HEARTBEAT_SECONDS keeps proxies from
+# timing out an idle stream
+SSE_MAX_SECONDS = int(os.getenv("SSE_MAX_SECONDS", "300"))
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# /status/<job_id> meta keys left out unless asked for with fields=meta.<key>. The
+# transcripts (in meta on jobs finalized before the transcript_segment table) are
+# only served by /<job_id>/transcripts
+TRANSCRIPT_META_KEYS = ("english", "swahili", "english_segments", "swahili_segments")
+STATUS_OMITTED_META_KEYS = TRANSCRIPT_META_KEYS + ("pipeline_metrics",)
+
+# Top-level fields of /status/<job_id>, selectable with ?fields=
+STATUS_FIELDS = (
+    "id",
+    "state",
+    "current_step",
+    "progress",
+    "steps",
+    "retry_count",
+    "last_error_message",
+    "error",
+    "meta",
+    "input_s3_uri",
+    "output_s3_uri",
+    "created_at",
+    "started_at",
+    "finished_at",
+)
+
+# Most job ids accepted by one /status:batch request
+STATUS_BATCH_MAX_IDS = int(os.getenv("STATUS_BATCH_MAX_IDS", "300"))
+
+# Re-use the outputs of an earlier successful job when the same video is uploaded again
+JOB_DEDUP_ENABLED = os.getenv("JOB_DEDUP_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Exact pipeline steps (must match pipeline decorators)
+JOB_STEP_NAMES = [
+    "asr",
+    "punctuate",
+    "translate",
+    "tts",
+    "separate_music",
+    "mix",
+    "replace_audio",
+]
+JOB_OUTPUT_KINDS = ["translated_text", "tts_audio", "lipsynced_video", "subtitle"]
+
 
 def _ensure_dependencies():
-    global celery_app, upload_file, queue_dubbing_chain
+    global celery_app, upload_file, upload_stream, presign_put_url, stat_object, object_sha256, queue_dubbing_chain
     if celery_app is None:
         from app.celery_app import celery_app as _celery
         celery_app = _celery
     if upload_file is None:
         from app.utils.minio_client import upload_file as _upload
         upload_file = _upload
+    if upload_stream is None:
+        from app.utils.minio_client import upload_stream as _upload_stream
+        upload_stream = _upload_stream
+    if presign_put_url is None:
+        from app.utils.minio_client import presign_put_url as _presign_put
+        presign_put_url = _presign_put
+    if stat_object is None:
+        from app.utils.minio_client import stat_object as _stat
+        stat_object = _stat
+    if object_sha256 is None:
+        from app.utils.minio_client import object_sha256 as _object_sha256
+        object_sha256 = _object_sha256
     if queue_dubbing_chain is None:
         from app.tasks.pipeline_chain import queue_dubbing_chain as _queue
         queue_dubbing_chain = _queue
 
 
+def _uploads_bucket() -> str:
+    return os.getenv("S3_BUCKET_UPLOADS", os.getenv("MINIO_BUCKET_UPLOADS", "uploads"))
+
+
 job_bp = Blueprint("job_bp", __name__)
 
 
@@ -42,9 +118,26 @@ job_bp = Blueprint("job_bp", __name__)
 # ------------------------------------------------------------------------------
 @job_bp.route("/create", methods=["POST"])
 def create_job():
+    """
+    Create a dubbing job from an uploaded video.
+
+    Two upload modes are accepted:
+      • multipart/form-data { file, owner_id, project_id } — the file is
+        spooled to JOB_UPLOAD_TMP and then pushed to MinIO.
+      • streaming: the raw video is the request body (application/octet-stream
+        or video/*), with owner_id / project_id / filename passed as query
+        args (or the X-Filename header). The body is piped straight into a
+        MinIO multipart upload and hashed on the way through.
+    Any other content type is rejected with 415.
+    """
     if not TESTING_ENV:
         _ensure_dependencies()
 
+    if request.mimetype == "application/octet-stream" or request.mimetype.startswith("video/"):
+        return _create_job_streaming()
+    if request.mimetype != "multipart/form-data":
+        return jsonify({"error": "Send multipart/form-data, or the raw video as application/octet-stream or video/*"}), 415
+
     if upload_file is None or queue_dubbing_chain is None:
         return jsonify({"error": "Job creation disabled in testing mode"}), 503
 
@@ -67,12 +160,12 @@ def create_job():
     tmp_dir.mkdir(parents=True, exist_ok=True)
 
     temp_path = tmp_dir / f"{uuid.uuid4()}_{file.filename}"
-    file.save(str(temp_path))
+    content_sha256 = _save_hashed(file.stream, temp_path)
 
     if not temp_path.exists():
         raise FileNotFoundError(f"Upload temp file was not created: {temp_path}")
 
-    bucket = os.getenv("S3_BUCKET_UPLOADS", os.getenv("MINIO_BUCKET_UPLOADS", "uploads"))
+    bucket = _uploads_bucket()
     object_name = f"{owner.id}/{uuid.uuid4()}_{file.filename}"
     s3_uri = upload_file(bucket, object_name, str(temp_path))
 
@@ -80,56 +173,277 @@ def create_job():
     if temp_path.exists():
         temp_path.unlink()
 
+    job = _create_job_records(
+        owner, project, s3_uri, {"original_name": file.filename}, content_sha256=content_sha256
+    )
+    return _start_job(job, s3_uri)
+
+
+def _create_job_streaming():
+    """Streaming ingest: request body → MinIO multipart upload, no temp file."""
+    if upload_stream is None or queue_dubbing_chain is None:
+        return jsonify({"error": "Job creation disabled in testing mode"}), 503
+
+    filename = request.args.get("filename") or request.headers.get("X-Filename")
+    if not filename:
+        return jsonify({"error": "Missing filename"}), 400
+    if request.content_length == 0:
+        return jsonify({"error": "Missing file"}), 400
+
+    try:
+        owner = _resolve_owner(request.args.get("owner_id"))
+        project = _resolve_project(request.args.get("project_id"), owner.id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    bucket = _uploads_bucket()
+    object_name = f"{owner.id}/{uuid.uuid4()}_{secure_filename(filename) or 'upload.bin'}"
+    content_type = request.mimetype or "application/octet-stream"
+    if content_type == "application/octet-stream":
+        content_type = mimetypes.guess_type(filename)[0] or content_type
+
+    uploaded = upload_stream(bucket, object_name, request.stream, content_type=content_type)
+    if not uploaded["size"]:
+        from app.utils.minio_client import remove_object
+
+        remove_object(bucket, object_name)
+        return jsonify({"error": "Missing file"}), 400
+
+    job = _create_job_records(
+        owner,
+        project,
+        uploaded["uri"],
+        {
+            "original_name": filename,
+            "size_bytes": uploaded["size"],
+        },
+        content_sha256=uploaded["sha256"],
+    )
+    return _start_job(job, uploaded["uri"])
+
+
+# ------------------------------------------------------------------------------
+# DIRECT-TO-MINIO UPLOADS (two-phase: presigned PUT, then commit)
+# ------------------------------------------------------------------------------
+@job_bp.route("/upload-url", methods=["POST"])
+def create_upload_url():
+    """
+    Phase 1: hand the client a presigned PUT URL in the uploads bucket.
+
+    Body: { "filename": "...", "owner_id": "...", "expires_in": 3600 }
+    The client PUTs the video to `upload_url`, then calls /commit with the
+    returned object_name.
+    """
+    if not TESTING_ENV:
+        _ensure_dependencies()
+
+    if presign_put_url is None:
+        return jsonify({"error": "Direct uploads disabled in testing mode"}), 503
+
+    data = request.get_json(silent=True) or {}
+    filename = data.get("filename")
+    if not filename:
+        return jsonify({"error": "Missing filename"}), 400
+
+    try:
+        owner = _resolve_owner(data.get("owner_id"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    try:
+        expires_in = min(max(int(data.get("expires_in", 3600)), 60), 7 * 24 * 3600)
+    except (TypeError, ValueError):
+        expires_in = 3600
+
+    bucket = _uploads_bucket()
+    object_name = f"{owner.id}/{uuid.uuid4()}_{secure_filename(filename) or 'upload.bin'}"
+
+    try:
+        url = presign_put_url(bucket, object_name, expires_in=expires_in)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify(
+        {
+            "upload_url": url,
+            "method": "PUT",
+            "bucket": bucket,
+            "object_name": object_name,
+            "uri": f"s3://{bucket}/{object_name}",
+            "expires_in": expires_in,
+        }
+    ), 200
+
+
+@job_bp.route("/commit", methods=["POST"])
+def commit_upload():
+    """
+    Phase 2: verify the uploaded object with a HEAD request, hash it for
+    dedup, then create the Asset / Job / JobStep / JobOutput rows and queue
+    the dubbing chain.
+
+    Body: { "object_name": "...", "filename": "...", "owner_id": "...", "project_id": "..." }
+    """
+    if not TESTING_ENV:
+        _ensure_dependencies()
+
+    if stat_object is None or queue_dubbing_chain is None:
+        return jsonify({"error": "Direct uploads disabled in testing mode"}), 503
+
+    data = request.get_json(silent=True) or {}
+    object_name = data.get("object_name")
+    if not object_name:
+        return jsonify({"error": "Missing object_name"}), 400
+
+    try:
+        owner = _resolve_owner(data.get("owner_id"))
+        project = _resolve_project(data.get("project_id"), owner.id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    # Objects handed out by /upload-url are always namespaced by owner
+    if not object_name.startswith(f"{owner.id}/"):
+        return jsonify({"error": "object_name does not belong to this owner"}), 403
+
+    bucket = _uploads_bucket()
+    s3_uri = f"s3://{bucket}/{object_name}"
+
+    if Asset.query.filter_by(uri=s3_uri).first():
+        return jsonify({"error": "Upload already committed"}), 409
+
+    try:
+        obj = stat_object(bucket, object_name)
+    except Exception as e:
+        return jsonify({"error": f"Failed to verify upload: {e}"}), 502
+
+    if obj is None:
+        return jsonify({"error": "Uploaded object not found"}), 404
+    if not obj.size:
+        return jsonify({"error": "Uploaded object is empty"}), 400
+
+    # The bytes never passed through the backend, so read them back once for
+    # dedup; a client-supplied hash can't be trusted to match the object
+    content_sha256 = None
+    if JOB_DEDUP_ENABLED and object_sha256 is not None:
+        try:
+            content_sha256 = object_sha256(bucket, object_name)
+        except Exception as exc:
+            logger.warning("Could not hash %s for dedup: %s", s3_uri, exc)
+
+    filename = data.get("filename") or object_name.split("/", 1)[-1].split("_", 1)[-1]
+    job = _create_job_records(
+        owner,
+        project,
+        s3_uri,
+        {
+            "original_name": filename,
+            "size_bytes": obj.size,
+            "etag": obj.etag,
+        },
+        content_sha256=content_sha256,
+    )
+    return _start_job(job, s3_uri)
+
+
+def _save_hashed(stream, path: Path) -> str:
+    """Write an upload stream to `path`, returning its SHA-256 (one pass over the data)."""
+    digest = hashlib.sha256()
+    with open(path, "wb") as fh:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+            fh.write(chunk)
+    return digest.hexdigest()
+
+
+def _find_dedup_source(content_sha256: str, owner_id) -> Job | None:
+    """
+    The owner's most recent succeeded job whose input had the same content
+    hash and has an output. Other users' jobs are never matched: a
+    deduplicated job shares its source's output objects, so deleting them
+    must only ever affect the same owner.
+    """
+    return (
+        Job.query.join(Asset, Job.input_asset_id == Asset.id)
+        .filter(
+            Job.owner_id == owner_id,
+            Asset.content_sha256 == content_sha256,
+            Job.state == "succeeded",
+            Job.meta.has_key("output_s3_uri"),
+        )
+        .order_by(Job.finished_at.desc().nullslast())
+        .first()
+    )
+
+
+def _create_job_records(
+    owner: AppUser,
+    project: Project | None,
+    s3_uri: str,
+    asset_meta: dict,
+    content_sha256: str | None = None,
+) -> Job:
+    """
+    Create the Asset, Job, JobStep and JobOutput rows for a new upload.
+
+    Every job gets its own Asset row (unique_job_input), even when the same
+    bytes were processed before. If a previous job of the same owner already
+    dubbed identical content, the job is tagged with meta["dedup_of"] and
+    run_chain reuses that job's outputs instead of running the full pipeline.
+    """
     # Store Asset
     asset = Asset(
         owner_id=owner.id,
         project_id=project.id if project else None,
         kind="video",
         uri=s3_uri,
-        meta={"original_name": file.filename},
+        content_sha256=content_sha256,
+        original_name=asset_meta.get("original_name"),
+        meta=asset_meta,
     )
     db.session.add(asset)
     db.session.flush()
 
+    job_meta = {"pipeline": "local_dubbing"}
+    if JOB_DEDUP_ENABLED and content_sha256:
+        source = _find_dedup_source(content_sha256, owner.id)
+        if source:
+            job_meta["dedup_of"] = str(source.id)
+            logger.info(f"Upload {asset.id} matches job {source.id}, reusing its outputs")
+
     # Create Job
     job = Job(
         owner_id=owner.id,
         project_id=project.id if project else None,
         input_asset_id=asset.id,
         state="queued",
-        meta={"pipeline": "local_dubbing"},
+        meta=job_meta,
         created_at=datetime.datetime.now(datetime.UTC),
     )
     db.session.add(job)
     db.session.flush()
 
-    # Exact pipeline steps (must match pipeline decorators)
-    for step in [
-        "asr",
-        "punctuate",
-        "translate",
-        "tts",
-        "separate_music",
-        "mix",
-        "replace_audio",
-    ]:
+    for step in JOB_STEP_NAMES:
         db.session.add(JobStep(job_id=job.id, name=step, state="pending"))
 
     # Output placeholders
-    for output_kind in ["translated_text", "tts_audio", "lipsynced_video", "subtitle"]:
+    for output_kind in JOB_OUTPUT_KINDS:
         db.session.add(JobOutput(job_id=job.id, kind=output_kind, meta={}))
 
     db.session.commit()
+    return job
 
+
+def _start_job(job: Job, s3_uri: str):
+    """Queue the dubbing chain for a freshly created job and build the response."""
     try:
         task = queue_dubbing_chain(str(job.id), s3_uri)
-        
+
         # Store task_id in job.meta for cancellation support
         meta = dict(job.meta or {})
         meta["task_id"] = task.id
         job.meta = meta
         db.session.commit()
-        
+
         return jsonify(
             {
                 "job_id": str(job.id),
@@ -234,27 +548,226 @@ def _serialize_job_brief(job: Job, asset: Asset | None = None, owner: AppUser |
         "finished_at": _safe_serialize(job.finished_at),
         "input_s3_uri": asset.uri if asset else None,
         "output_s3_uri": meta.get("output_s3_uri"),
-        "video_name": (asset.meta or {}).get("original_name") if asset else None,
+        "video_name": asset.original_name if asset else None,
         "owner_email": owner.email if owner else None,
     }
 
 
+def _job_brief_query():
+    """
+    Job list rows with their input asset and owner email, projected to the
+    columns _job_brief_row needs, in one outer-joined SELECT.
+    """
+    return (
+        db.session.query(
+            Job.id,
+            Job.state,
+            Job.current_step,
+            Job.progress,
+            Job.retry_count,
+            Job.last_error_message,
+            Job.created_at,
+            Job.started_at,
+            Job.finished_at,
+            Job.meta["output_s3_uri"].as_string().label("output_s3_uri"),
+            Asset.uri.label("input_s3_uri"),
+            Asset.original_name.label("video_name"),
+            AppUser.email.label("owner_email"),
+        )
+        .outerjoin(Asset, Job.input_asset_id == Asset.id)
+        .outerjoin(AppUser, Job.owner_id == AppUser.id)
+    )
+
+
+def _job_brief_row(row) -> dict:
+    """_serialize_job_brief for a row of _job_brief_query()."""
+    return {
+        "id": str(row.id),
+        "state": row.state,
+        "current_step": row.current_step,
+        "progress": _safe_serialize(row.progress),
+        "retry_count": row.retry_count or 0,
+        "last_error_message": row.last_error_message,
+        "created_at": _safe_serialize(row.created_at),
+        "started_at": _safe_serialize(row.started_at),
+        "finished_at": _safe_serialize(row.finished_at),
+        "input_s3_uri": row.input_s3_uri,
+        "output_s3_uri": row.output_s3_uri,
+        "video_name": row.video_name,
+        "owner_email": row.owner_email,
+    }
+
+
+def _like_escape(term: str) -> str:
+    """Escape LIKE wildcards in `term`, for use with ESCAPE '/'."""
+    return term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def _job_search_filter(search: str, owner_email: bool = False):
+    """
+    Jobs whose id starts with `search`, whose video filename contains it or,
+    with owner_email, whose owner's email contains it.
+
+    Each match is its own indexed lookup (idx_job_id_text, then the pg_trgm
+    GIN indexes on asset.original_name and app_user.email) joined back to
+    job ids. An OR across the joined tables can only be checked row by row
+    after the join.
+    """
+    term = _like_escape(search.lower())
+    matches = [
+        select(Job.id).where(db.cast(Job.id, db.Text).like(f"{term}%", escape="/")),
+        select(Job.id)
+        .join(Asset, Job.input_asset_id == Asset.id)
+        .where(Asset.original_name.ilike(f"%{term}%", escape="/")),
+    ]
+    if owner_email:
+        matches.append(
+            select(Job.id)
+            .join(AppUser, Job.owner_id == AppUser.id)
+            .where(AppUser.email.ilike(f"%{term}%", escape="/"))
+        )
+    return Job.id.in_(union(*matches))
+
+
+def _encode_cursor(created_at: datetime.datetime, job_id) -> str:
+    raw = json.dumps([created_at.isoformat(), str(job_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime.datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, job_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(created_at), UUID(job_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _estimate_count(query, filtered: bool) -> int:
+    """
+    Row count from the planner's statistics instead of a scan: pg_class.reltuples
+    for the whole job table, the EXPLAIN row estimate for a filtered query.
+    Exact count on databases other than Postgres.
+    """
+    if db.engine.dialect.name != "postgresql":
+        return query.count()
+    if not filtered:
+        estimate = db.session.execute(text("SELECT reltuples FROM pg_class WHERE oid = 'job'::regclass")).scalar()
+    else:
+        sql = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})
+        plan = db.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+    # reltuples is -1 for a table that was never analyzed
+    return max(int(estimate or 0), 0)
+
+
+def _job_list_page(query, filtered: bool, default_page_size: int, max_page_size: int) -> dict:
+    """
+    One page of _job_brief_query() rows, newest first (created_at, then id).
+
+    Offset mode (?page=N) returns page, total and total_pages as before.
+    Keyset mode, selected by passing ?cursor= (empty for the first page),
+    returns the rows after the cursor's (created_at, id) plus next_cursor
+    (null on the last page). Every keyset page costs the same however deep
+    it is, and no count is run unless ?total= asks for one.
+    ?total=approx swaps the exact count for the planner's estimate in
+    either mode.
+    """
+    try:
+        page_size = max(min(int(request.args.get("page_size", str(default_page_size))), max_page_size), 1)
+    except ValueError:
+        page_size = default_page_size
+    total_mode = request.args.get("total") or ""
+    # Totals always count the whole filtered list, not just the rows after a cursor
+    count_query = query
+
+    def count():
+        return _estimate_count(count_query, filtered) if total_mode == "approx" else count_query.count()
+
+    query = query.order_by(Job.created_at.desc(), Job.id.desc())
+
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        if cursor:
+            created_at, job_id = _decode_cursor(cursor)
+            query = query.filter(db.tuple_(Job.created_at, Job.id) < db.tuple_(created_at, job_id))
+        rows = query.limit(page_size + 1).all()
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        result = {
+            "jobs": [_job_brief_row(row) for row in rows],
+            "page_size": page_size,
+            "next_cursor": _encode_cursor(rows[-1].created_at, rows[-1].id) if more else None,
+        }
+        if total_mode:
+            result["total"] = count()
+            result["total_is_estimate"] = total_mode == "approx"
+        return result
+
+    try:
+        page = max(int(request.args.get("page", "1")), 1)
+    except ValueError:
+        page = 1
+    total = count()
+    rows = query.offset((page - 1) * page_size).limit(page_size).all()
+    return {
+        "jobs": [_job_brief_row(row) for row in rows],
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": (total // page_size) + (1 if total % page_size else 0),
+        "total_is_estimate": total_mode == "approx",
+    }
+
+
 # ------------------------------------------------------------------------------
 # STATUS ENDPOINT (includes retry info + URIs)
 # ------------------------------------------------------------------------------
-@job_bp.route("/status/<job_id>", methods=["GET"])
-def job_status(job_id):
-    job = db.session.get(Job, job_id)
-    if not job:
-        return jsonify({"error": "Job not found"}), 404
+def _parse_status_fields(raw: str | None) -> tuple[set, set]:
+    """
+    Split ?fields= into (top-level fields, extra meta keys). Raises ValueError
+    for unknown fields and for transcript keys.
+    """
+    if not raw:
+        return set(STATUS_FIELDS), set()
+    fields, meta_keys = {"id"}, set()
+    for name in filter(None, (f.strip() for f in raw.split(","))):
+        if name.startswith("meta."):
+            key = name[len("meta."):]
+            if key in TRANSCRIPT_META_KEYS:
+                raise ValueError(f"{key} is served by /api/jobs/<job_id>/transcripts")
+            fields.add("meta")
+            meta_keys.add(key)
+        elif name in STATUS_FIELDS:
+            fields.add(name)
+        else:
+            raise ValueError(f"Unknown field: {name}")
+    return fields, meta_keys
+
+
+def _status_meta(job: Job, extra_keys=()) -> dict:
+    """job.meta for /status: everything but STATUS_OMITTED_META_KEYS (unless in extra_keys)."""
+    meta = {
+        key: _safe_serialize(value)
+        for key, value in (job.meta or {}).items()
+        if key not in STATUS_OMITTED_META_KEYS or (key in extra_keys and key not in TRANSCRIPT_META_KEYS)
+    }
+    if getattr(job, "progress", None) is not None:
+        meta["progress"] = _safe_serialize(job.progress)
+    if getattr(job, "current_step", None) is not None:
+        meta["current_step"] = _safe_serialize(job.current_step)
+    return meta
 
-    # Resolve input asset
-    asset = db.session.get(Asset, job.input_asset_id) if job.input_asset_id else None
 
-    # Build steps list
+def _status_steps(job_id) -> list[dict]:
     steps = []
     for s in JobStep.query.filter_by(job_id=job_id).all():
+        # Live per-step progress reported by external_ai, if any
         step_progress = getattr(s, "progress", None)
+        if step_progress is None:
+            step_progress = (s.metrics or {}).get("progress")
         steps.append(
             {
                 "name": s.name,
@@ -264,37 +777,197 @@ def job_status(job_id):
                 "finished_at": _safe_serialize(getattr(s, "finished_at", None)),
             }
         )
+    return steps
 
-    meta = _safe_serialize(dict(job.meta or {}))
-    if getattr(job, "progress", None) is not None:
-        meta["progress"] = _safe_serialize(job.progress)
-    if getattr(job, "current_step", None) is not None:
-        meta["current_step"] = _safe_serialize(job.current_step)
 
-    api_state = "completed" if job.state == "succeeded" else job.state
+def _input_uri(job: Job) -> str | None:
+    asset = db.session.get(Asset, job.input_asset_id) if job.input_asset_id else None
+    return asset.uri if asset else None
 
-    # input & output URIs
-    input_s3_uri = asset.uri if asset else None
-    output_s3_uri = meta.get("output_s3_uri")
 
-    return jsonify(
+@job_bp.route("/status/<job_id>", methods=["GET"])
+def job_status(job_id):
+    """
+    Job state, progress, steps, URIs and meta.
+
+    `?fields=state,progress,steps` returns only those fields (plus id);
+    `fields=meta.<key>` adds one meta key. meta never carries the transcripts
+    (english, swahili and their segments), which come from
+    /<job_id>/transcripts, and pipeline_metrics only when asked for.
+    """
+    try:
+        fields, meta_keys = _parse_status_fields(request.args.get("fields"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    values = {
+        "id": lambda: str(job.id),
+        "state": lambda: "completed" if job.state == "succeeded" else job.state,
+        "current_step": lambda: _safe_serialize(getattr(job, "current_step", None)),
+        "progress": lambda: _safe_serialize(getattr(job, "progress", None)),
+        "steps": lambda: _status_steps(job.id),
+        "retry_count": lambda: job.retry_count or 0,
+        "last_error_message": lambda: job.last_error_message,
+        "error": lambda: getattr(job, "error_message", None),
+        "meta": lambda: _status_meta(job, meta_keys),
+        "input_s3_uri": lambda: _input_uri(job),
+        "output_s3_uri": lambda: (job.meta or {}).get("output_s3_uri"),
+        "created_at": lambda: _safe_serialize(job.created_at),
+        "started_at": lambda: _safe_serialize(job.started_at),
+        "finished_at": lambda: _safe_serialize(job.finished_at),
+    }
+    return jsonify({name: values[name]() for name in STATUS_FIELDS if name in fields}), 200
+
+
+def _parse_job_ids(values: list[str]) -> list[UUID]:
+    """ids from ?ids=a,b&ids=c, de-duplicated in order; ValueError on a bad id."""
+    ids = []
+    for raw in values:
+        for part in filter(None, (p.strip() for p in raw.split(","))):
+            try:
+                job_id = UUID(part)
+            except ValueError as exc:
+                raise ValueError(f"Invalid job id: {part}") from exc
+            if job_id not in ids:
+                ids.append(job_id)
+    return ids
+
+
+@job_bp.route("/status:batch", methods=["GET"])
+def job_status_batch():
+    """
+    State, progress and a step summary for many jobs at once.
+
+    `?ids=<uuid>,<uuid>,...` (up to STATUS_BATCH_MAX_IDS). Takes two queries
+    whatever the number of ids: one for the jobs and one that counts their
+    JobSteps per state. Ids with no job are listed in "missing". The response
+    carries an ETag, so a client repeating the request with If-None-Match
+    gets a 304 while nothing changed.
+    """
+    try:
+        ids = _parse_job_ids(request.args.getlist("ids"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if not ids:
+        return jsonify({"error": "Missing ids"}), 400
+    if len(ids) > STATUS_BATCH_MAX_IDS:
+        return jsonify({"error": f"At most {STATUS_BATCH_MAX_IDS} ids per request"}), 400
+
+    rows = (
+        db.session.query(
+            Job.id,
+            Job.state,
+            Job.progress,
+            Job.current_step,
+            Job.retry_count,
+            Job.last_error_message,
+            Job.finished_at,
+            Job.meta["output_s3_uri"].as_string(),
+        )
+        .filter(Job.id.in_(ids))
+        .all()
+    )
+
+    step_counts = {}
+    for job_id, state, count in (
+        db.session.query(JobStep.job_id, JobStep.state, db.func.count())
+        .filter(JobStep.job_id.in_(ids))
+        .group_by(JobStep.job_id, JobStep.state)
+    ):
+        counts = step_counts.setdefault(job_id, {"total": 0})
+        counts[state] = count
+        counts["total"] += count
+
+    jobs = {}
+    for job_id, state, progress, current_step, retry_count, last_error, finished_at, output_uri in rows:
+        jobs[job_id] = {
+            "id": str(job_id),
+            "state": "completed" if state == "succeeded" else state,
+            "progress": _safe_serialize(progress),
+            "current_step": current_step,
+            "retry_count": retry_count or 0,
+            "last_error_message": last_error,
+            "finished_at": _safe_serialize(finished_at),
+            "output_s3_uri": output_uri,
+            "steps": step_counts.get(job_id, {"total": 0}),
+        }
+
+    response = jsonify(
         {
-            "id": str(job.id),
-            "state": api_state,
-            "current_step": _safe_serialize(getattr(job, "current_step", None)),
-            "progress": _safe_serialize(getattr(job, "progress", None)),
-            "steps": steps,
-            "retry_count": job.retry_count or 0,
-            "last_error_message": job.last_error_message,
-            "error": getattr(job, "error_message", None),
-            "meta": meta,
-            "input_s3_uri": input_s3_uri,
-            "output_s3_uri": output_s3_uri,
-            "created_at": _safe_serialize(job.created_at),
-            "started_at": _safe_serialize(job.started_at),
-            "finished_at": _safe_serialize(job.finished_at),
+            "jobs": [jobs[job_id] for job_id in ids if job_id in jobs],
+            "missing": [str(job_id) for job_id in ids if job_id not in jobs],
         }
-    ), 200
+    )
+    response.add_etag()
+    # Always revalidate, so the browser sends If-None-Match instead of reusing a stale copy
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+# ------------------------------------------------------------------------------
+# LIVE STATUS STREAM (Server-Sent Events)
+# ------------------------------------------------------------------------------
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@job_bp.route("/<job_id>/events", methods=["GET"])
+def job_events_stream(job_id):
+    """
+    Server-Sent Events for one job. The first event ("snapshot") has the job's
+    state, progress, current step and steps. Each later "delta" event has
+    only what changed, as published by app/services/job_events.py after each
+    commit. The stream ends once the job reaches a terminal state.
+
+    Nothing touches the database after the snapshot. Answers 503 when Redis
+    is unavailable, so the client falls back to polling /status/<job_id>.
+    """
+    from app.services import job_events
+
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    # Subscribe before reading the snapshot, so no change can fall in between
+    try:
+        pubsub = job_events.redis_client().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(job_events.channel(job.id))
+    except Exception as exc:
+        logger.warning("Live job events unavailable: %s", exc)
+        return jsonify({"error": "Live updates unavailable, poll /status instead"}), 503
+
+    steps = JobStep.query.filter_by(job_id=job.id).all()
+    snapshot = job_events.job_snapshot(job, steps)
+    # Don't hold a pooled DB connection for the life of the stream
+    db.session.remove()
+
+    def stream():
+        try:
+            yield f"retry: 5000\n{_sse('snapshot', snapshot)}"
+            if snapshot["state"] in job_events.TERMINAL_API_STATES:
+                return
+            deadline = time.monotonic() + SSE_MAX_SECONDS
+            while time.monotonic() < deadline:
+                message = pubsub.get_message(timeout=SSE_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                delta = json.loads(message["data"])
+                yield _sse("delta", delta)
+                if delta.get("state") in job_events.TERMINAL_API_STATES:
+                    return
+        finally:
+            pubsub.close()
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ------------------------------------------------------------------------------
@@ -302,66 +975,30 @@ def job_status(job_id):
 # ------------------------------------------------------------------------------
 @job_bp.route("/my", methods=["GET"])
 def list_my_jobs():
-    """Return jobs for the currently logged-in user."""
+    """
+    Return jobs for the currently logged-in user. Paged by ?page= or, for
+    deep lists, by ?cursor= (see _job_list_page).
+    """
     user = get_current_user()
     if not user:
         return jsonify({"error": "Authentication required"}), 401
 
-    # pagination
-    try:
-        page = max(int(request.args.get("page", "1")), 1)
-    except ValueError:
-        page = 1
-    try:
-        page_size = max(min(int(request.args.get("page_size", "20")), 100), 1)
-    except ValueError:
-        page_size = 20
-
     state_filter = request.args.get("state") or ""
     search = (request.args.get("search") or "").strip()
 
-    query = Job.query.filter_by(owner_id=user.id)
+    query = _job_brief_query().filter(Job.owner_id == user.id)
 
     if state_filter:
         query = query.filter(Job.state == state_filter)
 
-    # simple search: by video filename (Asset.meta.original_name) or job id
+    # search: job id prefix or video filename
     if search:
-        search_like = f"%{search.lower()}%"
-
-        query = (
-            query.join(Asset, Job.input_asset_id == Asset.id, isouter=True)
-            .filter(
-                db.or_(
-                    db.func.lower(db.func.cast(Job.id, db.Text)).like(search_like),
-                    db.func.lower(
-                        db.func.coalesce(
-                            db.func.cast(Asset.meta['original_name'], db.Text),
-                            ''
-                        )
-                    ).like(search_like),
-                )
-            )
-        )
-
+        query = query.filter(_job_search_filter(search))
 
-    total = query.count()
-    jobs = (
-        query.order_by(Job.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
-
-    return jsonify(
-        {
-            "jobs": [_serialize_job_brief(job) for job in jobs],
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total // page_size) + (1 if total % page_size else 0),
-        }
-    ), 200
+    try:
+        return jsonify(_job_list_page(query, True, 20, 100)), 200
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
 
 # ------------------------------------------------------------------------------
@@ -372,72 +1009,27 @@ def admin_list_jobs():
     """
     Admin-only endpoint:
       - lists all jobs (most recent first)
-      - supports pagination, state filter, search
+      - supports pagination (?page= or keyset ?cursor=), state filter, search
     """
     if not require_admin():
         return jsonify({"error": "Admin privileges required"}), 403
 
-    try:
-        page = max(int(request.args.get("page", "1")), 1)
-    except ValueError:
-        page = 1
-    try:
-        page_size = max(min(int(request.args.get("page_size", "50")), 200), 1)
-    except ValueError:
-        page_size = 50
-
     state_filter = request.args.get("state") or ""
     search = (request.args.get("search") or "").strip()
 
-    query = Job.query
+    query = _job_brief_query()
 
     if state_filter:
         query = query.filter(Job.state == state_filter)
 
+    # search: job id prefix, video filename or owner email
     if search:
-        search_like = f"%{search.lower()}%"
-
-        query = (
-            query.join(Asset, Job.input_asset_id == Asset.id, isouter=True)
-            .join(AppUser, Job.owner_id == AppUser.id, isouter=True)
-            .filter(
-                db.or_(
-                    db.func.lower(db.func.cast(Job.id, db.Text)).like(search_like),
-                    db.func.lower(AppUser.email).like(search_like),
-                    db.func.lower(
-                        db.func.coalesce(
-                            db.func.cast(Asset.meta['original_name'], db.Text),
-                            ''
-                        )
-                    ).like(search_like),
-                )
-            )
-        )
-
-
-    total = query.count()
-    jobs = (
-        query.order_by(Job.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
-
-    result = []
-    for job in jobs:
-        asset = db.session.get(Asset, job.input_asset_id) if job.input_asset_id else None
-        owner = db.session.get(AppUser, job.owner_id) if job.owner_id else None
-        result.append(_serialize_job_brief(job, asset=asset, owner=owner))
+        query = query.filter(_job_search_filter(search, owner_email=True))
 
-    return jsonify(
-        {
-            "jobs": result,
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total // page_size) + (1 if total % page_size else 0),
-        }
-    ), 200
+    try:
+        return jsonify(_job_list_page(query, bool(state_filter or search), 50, 200)), 200
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
 
 # ------------------------------------------------------------------------------
@@ -546,6 +1138,86 @@ def cancel_job(job_id):
     ), 200
 
 
+# ------------------------------------------------------------------------------
+# EXTERNAL_AI COMPLETION WEBHOOK — EXTERNAL_AI_MODE=async
+# ------------------------------------------------------------------------------
+def _valid_callback_token() -> bool:
+    """external_ai authenticates with the shared EXTERNAL_AI_CALLBACK_TOKEN in the query string."""
+    expected = os.getenv("EXTERNAL_AI_CALLBACK_TOKEN", "")
+    token = request.args.get("token", "")
+    return bool(expected) and hmac.compare_digest(token, expected)
+
+
+@job_bp.route("/<job_id>/external-ai-callback", methods=["POST"])
+def external_ai_callback(job_id):
+    """
+    Called by external_ai when an async /jobs run finishes. Authenticated by
+    the shared EXTERNAL_AI_CALLBACK_TOKEN in the query string; triggers an
+    immediate status check instead of waiting for the next scheduled poll.
+    """
+    if not _valid_callback_token():
+        return jsonify({"error": "Invalid callback token"}), 403
+
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    ext_job_id = data.get("job_id")
+    if not ext_job_id or ext_job_id != (job.meta or {}).get("external_ai_job_id"):
+        # Stale run (job was resubmitted or retried); nothing to collect
+        return jsonify({"status": "ignored"}), 200
+
+    if not TESTING_ENV:
+        _ensure_dependencies()
+    if celery_app is None:
+        return jsonify({"error": "Task queue not available"}), 503
+
+    celery_app.send_task("pipeline.poll_external_ai", args=(str(job.id), ext_job_id), queue="default")
+    return jsonify({"status": "accepted"}), 202
+
+
+# ------------------------------------------------------------------------------
+# LIVE PROGRESS FROM EXTERNAL_AI
+# ------------------------------------------------------------------------------
+_progress_coalescer = None
+
+
+def _get_progress_coalescer():
+    global _progress_coalescer
+    if _progress_coalescer is None:
+        from app.services.job_progress import ProgressCoalescer, apply_progress
+
+        app = current_app._get_current_object()
+
+        def write(job_id, snapshot):
+            # Also runs on the flusher thread, outside any request
+            with app.app_context():
+                apply_progress(job_id, snapshot)
+
+        _progress_coalescer = ProgressCoalescer(write)
+    return _progress_coalescer
+
+
+@job_bp.route("/<job_id>/progress", methods=["POST"])
+def external_ai_progress(job_id):
+    """
+    Progress snapshots POSTed by external_ai while it runs the pipeline
+    (stage states, segment counts, overall %). Coalesced and throttled before
+    they reach Job.progress / current_step and the JobStep rows; see
+    app/services/job_progress.py.
+    """
+    if not _valid_callback_token():
+        return jsonify({"error": "Invalid callback token"}), 403
+
+    snapshot = request.get_json(silent=True)
+    if not isinstance(snapshot, dict):
+        return jsonify({"error": "Expected a JSON progress snapshot"}), 400
+
+    outcome = _get_progress_coalescer().submit(job_id, snapshot)
+    return jsonify({"status": outcome}), 202
+
+
 # ------------------------------------------------------------------------------
 # RETRY ENDPOINT — restart a single job
 # ------------------------------------------------------------------------------
@@ -583,9 +1255,11 @@ def retry_job(job_id):
     job.retry_count = (job.retry_count or 0) + 1
     job.last_error_message = None
 
-    # Clear output reference from meta
+    # Clear output reference from meta; a manual retry always re-runs the
+    # pipeline rather than re-using a deduplicated result
     meta = dict(job.meta or {})
     meta.pop("output_s3_uri", None)
+    meta.pop("dedup_of", None)
     job.meta = meta
 
     # Reset all JobStep rows
@@ -662,6 +1336,7 @@ def admin_retry_failed_jobs():
 
         meta = dict(job.meta or {})
         meta.pop("output_s3_uri", None)
+        meta.pop("dedup_of", None)
         job.meta = meta
 
         steps = JobStep.query.filter_by(job_id=job.id).all()
@@ -808,20 +1483,16 @@ def get_transcripts(job_id):
     if not is_admin and (not user or user.id != job.owner_id):
         return jsonify({"error": "Not authorized to view transcripts for this job"}), 403
 
-    meta = dict(job.meta or {})
-    
-    # Extract transcript data from meta
-    english = meta.get("english", "")
-    swahili = meta.get("swahili", "")
-    english_segments = meta.get("english_segments", [])
-    swahili_segments = meta.get("swahili_segments", [])
+    from app.services.transcripts import load_transcripts
+
+    transcript = load_transcripts(job)
 
     return jsonify(
         {
             "job_id": str(job.id),
-            "english": english,
-            "swahili": swahili,
-            "english_segments": _safe_serialize(english_segments),
-            "swahili_segments": _safe_serialize(swahili_segments),
+            "english": transcript["english"],
+            "swahili": transcript["swahili"],
+            "english_segments": _safe_serialize(transcript["english_segments"]),
+            "swahili_segments": _safe_serialize(transcript["swahili_segments"]),
         }
     ), 200
@@ -0,0 +1,201 @@
+# app/services/external_ai.py
+"""Thin HTTP client for the external_ai endpoints used by chunked runs."""
+import logging
+import os
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from app.utils.ranged_download import DownloadError, download_resumable
+
+EXTERNAL_AI_URL = os.getenv("EXTERNAL_AI_URL", "http://host.docker.internal:7001")
+# How inputs reach external_ai: "presigned" (it GETs a presigned URL),
+# "s3" (it reads s3:// with its own credentials) or "upload" (the worker
+# downloads the video and POSTs it, as before)
+EXTERNAL_AI_INPUT_MODE = os.getenv("EXTERNAL_AI_INPUT_MODE", "presigned").lower()
+EXTERNAL_AI_PRESIGN_SECONDS = int(os.getenv("EXTERNAL_AI_PRESIGN_SECONDS", str(6 * 3600)))
+
+logger = logging.getLogger(__name__)
+
+
+def input_reference(video_s3_uri: str, mode: str | None = None) -> dict | None:
+    """
+    Reference external_ai can fetch the input from itself, or None in upload mode.
+    """
+    mode = mode or EXTERNAL_AI_INPUT_MODE
+    if mode == "s3":
+        return {"video_s3_uri": video_s3_uri}
+    if mode == "presigned":
+        from app.utils.minio_client import presign_url
+
+        parsed = urlparse(video_s3_uri)
+        url = presign_url(parsed.netloc, parsed.path.lstrip("/"), expires_in=EXTERNAL_AI_PRESIGN_SECONDS)
+        return {"video_url": url}
+    return None
+
+
+class ExternalAIError(Exception):
+    """external_ai answered with an error."""
+
+
+class SourceMissing(ExternalAIError):
+    """The staged source is gone (external_ai restarted or cleaned up); stage it again."""
+
+
+class JobMissing(ExternalAIError):
+    """external_ai no longer knows an async job (restarted or expired); submit it again."""
+
+
+class ExternalAINotReady(ExternalAIError):
+    """external_ai is up but its models are still loading (or failed to load)."""
+
+
+class InputFetchFailed(ExternalAIError):
+    """external_ai couldn't fetch an input reference; upload the video instead."""
+
+
+def _error_code(resp) -> str | None:
+    try:
+        return resp.json().get("code")
+    except ValueError:
+        return None
+
+
+class ExternalAIClient:
+    def __init__(self, base_url: str = EXTERNAL_AI_URL, timeout: float | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _check(self, resp, what: str, expect_success: bool = True) -> dict:
+        if resp.status_code == 404:
+            try:
+                body = resp.json()
+            except ValueError:
+                body = {}
+            if body.get("code") == "source_missing":
+                raise SourceMissing(body.get("error", what))
+            if body.get("code") == "job_missing":
+                raise JobMissing(body.get("error", what))
+        if resp.status_code == 502 and _error_code(resp) == "input_fetch_failed":
+            raise InputFetchFailed(f"{what}: {resp.text}")
+        if resp.status_code not in (200, 202):
+            raise ExternalAIError(f"{what} failed: {resp.text}")
+        data = resp.json()
+        if expect_success and data.get("status", "success") != "success":
+            raise ExternalAIError(f"{what} returned error: {data}")
+        return data
+
+    def readiness(self) -> dict:
+        """
+        GET /ready → {"ready": bool, "warmup": {...}}. Servers predating /ready
+        load models on first use, so they count as ready.
+        """
+        resp = requests.get(f"{self.base_url}/ready", timeout=self.timeout or 5)
+        if resp.status_code == 404:
+            return {"ready": True, "warmup": None}
+        if resp.status_code not in (200, 503):
+            raise ExternalAIError(f"/ready failed: HTTP {resp.status_code}")
+        return resp.json()
+
+    def wait_until_ready(self, max_wait: float, interval: float = 5.0) -> dict:
+        """Poll /ready until the models are loaded; raises ExternalAINotReady after `max_wait` seconds."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            try:
+                state = self.readiness()
+                if state.get("ready"):
+                    return state
+                warmup = state.get("warmup") or {}
+                logger.info("external_ai warming up (loading %s)", warmup.get("loading"))
+            except requests.RequestException as exc:
+                state = {"ready": False, "error": str(exc)}
+                logger.info("external_ai not reachable yet: %s", exc)
+            if time.monotonic() + interval > deadline:
+                raise ExternalAINotReady(f"external_ai not ready after {max_wait:.0f}s: {state}")
+            time.sleep(interval)
+
+    def stage_source(self, local_video: str | None = None, reference: dict | None = None) -> dict:
+        """Stage a source from a local file, or let external_ai fetch `reference` itself."""
+        if reference:
+            resp = requests.post(f"{self.base_url}/sources", json=reference, timeout=self.timeout)
+        else:
+            with open(local_video, "rb") as fh:
+                resp = requests.post(f"{self.base_url}/sources", files={"video": fh}, timeout=self.timeout)
+        return self._check(resp, "/sources")
+
+    def release_source(self, source_id: str) -> None:
+        requests.delete(f"{self.base_url}/sources/{source_id}", timeout=self.timeout)
+
+    def plan_chunks(self, source_id: str, target_seconds: float) -> list[dict]:
+        resp = requests.post(
+            f"{self.base_url}/chunks/plan",
+            json={"source_id": source_id, "target_seconds": target_seconds},
+            timeout=self.timeout,
+        )
+        return self._check(resp, "/chunks/plan")["chunks"]
+
+    def process_chunk(self, source_id: str, chunk: dict) -> dict:
+        resp = requests.post(
+            f"{self.base_url}/full",
+            json={
+                "source_id": source_id,
+                "start": chunk["start"],
+                "end": chunk["end"],
+                "audio_only": True,
+            },
+            timeout=self.timeout,
+        )
+        return self._check(resp, f"/full chunk {chunk.get('index')}")
+
+    def submit_full(
+        self,
+        local_video: str | None = None,
+        callback_url: str | None = None,
+        reference: dict | None = None,
+        progress_url: str | None = None,
+    ) -> dict:
+        """POST /jobs; returns {"job_id", "status", "status_url"} without waiting for the run."""
+        extra = {k: v for k, v in (("callback_url", callback_url), ("progress_url", progress_url)) if v}
+        if reference:
+            resp = requests.post(f"{self.base_url}/jobs", json={**reference, **extra}, timeout=self.timeout)
+        else:
+            with open(local_video, "rb") as fh:
+                resp = requests.post(
+                    f"{self.base_url}/jobs",
+                    files={"video": fh},
+                    data=extra or None,
+                    timeout=self.timeout,
+                )
+        return self._check(resp, "/jobs", expect_success=False)
+
+    def get_job(self, job_id: str) -> dict:
+        resp = requests.get(f"{self.base_url}/jobs/{job_id}", timeout=self.timeout)
+        if resp.status_code == 404:
+            raise JobMissing(job_id)
+        if resp.status_code != 200:
+            raise ExternalAIError(f"/jobs/{job_id} failed: {resp.text}")
+        return resp.json()
+
+    def download(self, remote_path: str, dest: str) -> str:
+        """Resumable, checksum-verified download of an external_ai file via /files."""
+        try:
+            download_resumable(f"{self.base_url}/files", dest, params={"path": remote_path})
+        except DownloadError as exc:
+            raise ExternalAIError(f"Failed to download {remote_path}: {exc}") from exc
+        return dest
+
+    def stitch(self, source_id: str, chunk_audios: list[str], output_name: str) -> dict:
+        handles = [open(p, "rb") for p in chunk_audios]
+        try:
+            files = {f"chunk_{i:04d}": fh for i, fh in enumerate(handles)}
+            resp = requests.post(
+                f"{self.base_url}/stitch",
+                data={"source_id": source_id, "output_name": output_name},
+                files=files,
+                timeout=self.timeout,
+            )
+        finally:
+            for fh in handles:
+                fh.close()
+        return self._check(resp, "/stitch")
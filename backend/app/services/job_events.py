@@ -0,0 +1,156 @@
+# backend/app/services/job_events.py
+"""
+Job state/progress deltas over Redis pub/sub, for the SSE stream at
+/api/jobs/<id>/events.
+
+install() hooks the SQLAlchemy session. On flush it notes which Job columns
+(state, progress, current_step, ...) and JobStep fields (state, progress)
+changed. After the commit it publishes one delta per job on
+"job-events:<job_id>". Rolled-back changes are never published. Because this
+hooks the session, every writer is covered: the Celery worker, progress
+callbacks and API routes. A browser tab listening on the stream costs no
+queries until something actually changes.
+
+Publishing is best effort. If Redis is unreachable the delta is dropped and
+clients fall back to polling /status.
+"""
+
+import json
+import logging
+import os
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.models import Job, JobStep
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+JOB_EVENTS_ENABLED = os.getenv("JOB_EVENTS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+JOB_FIELDS = ("state", "progress", "current_step", "retry_count", "last_error_message", "finished_at")
+TERMINAL_API_STATES = ("completed", "failed", "cancelled")
+
+# After a failed publish, skip publishing for a while rather than stall every commit
+PUBLISH_BACKOFF_SECONDS = 30
+
+_redis = None
+_retry_at = 0.0
+_installed = False
+
+
+def channel(job_id) -> str:
+    return f"job-events:{job_id}"
+
+
+def api_state(state: str | None) -> str | None:
+    """Job state as the API reports it (matches /status)."""
+    return "completed" if state == "succeeded" else state
+
+
+def _serialize(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _step_progress(step: JobStep):
+    return (step.metrics or {}).get("progress")
+
+
+def redis_client():
+    global _redis
+    if _redis is None:
+        import redis
+
+        _redis = redis.from_url(REDIS_URL, socket_connect_timeout=1, socket_timeout=5)
+    return _redis
+
+
+def step_view(step: JobStep) -> dict:
+    return {"name": step.name, "state": step.state, "progress": _step_progress(step)}
+
+
+def job_snapshot(job: Job, steps: list[JobStep]) -> dict:
+    """Compact state of a job for the first SSE event (no meta, no transcripts)."""
+    return {
+        "id": str(job.id),
+        "state": api_state(job.state),
+        "progress": job.progress,
+        "current_step": job.current_step,
+        "retry_count": job.retry_count or 0,
+        "last_error_message": job.last_error_message,
+        "finished_at": _serialize(job.finished_at),
+        "steps": [step_view(s) for s in steps],
+    }
+
+
+# ---------------------------------------------------------------------
+# Collecting deltas from the session
+# ---------------------------------------------------------------------
+def _pending(session) -> dict:
+    return session.info.setdefault("job_event_deltas", {})
+
+
+def _changed(obj, fields) -> list[str]:
+    state = inspect(obj)
+    return [f for f in fields if state.attrs[f].history.has_changes()]
+
+
+def _after_flush(session, flush_context):
+    deltas = None
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Job):
+            changed = _changed(obj, JOB_FIELDS)
+            if not changed or obj.id is None:
+                continue
+            deltas = deltas if deltas is not None else _pending(session)
+            delta = deltas.setdefault(str(obj.id), {})
+            for field in changed:
+                value = getattr(obj, field)
+                delta[field] = api_state(value) if field == "state" else _serialize(value)
+        elif isinstance(obj, JobStep):
+            if obj.job_id is None or not _changed(obj, ("state", "metrics")):
+                continue
+            deltas = deltas if deltas is not None else _pending(session)
+            delta = deltas.setdefault(str(obj.job_id), {})
+            delta.setdefault("steps", {})[obj.name] = step_view(obj)
+
+
+def _after_commit(session):
+    deltas = session.info.pop("job_event_deltas", None)
+    if deltas:
+        publish(deltas)
+
+
+def _after_rollback(session):
+    session.info.pop("job_event_deltas", None)
+
+
+def publish(deltas: dict):
+    """Publish {job_id: delta} (steps keyed by name are sent as a list)."""
+    global _retry_at
+    if time.monotonic() < _retry_at:
+        return
+    try:
+        client = redis_client()
+        for job_id, delta in deltas.items():
+            if "steps" in delta:
+                delta = {**delta, "steps": list(delta["steps"].values())}
+            client.publish(channel(job_id), json.dumps(delta))
+    except Exception as exc:
+        _retry_at = time.monotonic() + PUBLISH_BACKOFF_SECONDS
+        logger.warning("Could not publish job events (retrying in %ds): %s", PUBLISH_BACKOFF_SECONDS, exc)
+
+
+def install():
+    """Publish Job/JobStep deltas after every commit (idempotent)."""
+    global _installed
+    if _installed or not JOB_EVENTS_ENABLED:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _installed = True
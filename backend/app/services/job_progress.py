@@ -0,0 +1,183 @@
+# backend/app/services/job_progress.py
+"""
+Live job progress reported by external_ai.
+
+While a /full or /jobs run is in flight, external_ai POSTs progress
+snapshots to /api/jobs/<id>/progress (see external_ai/progress_events.py).
+Each snapshot holds the whole state of the run, so only the newest one per
+job matters.
+
+ProgressCoalescer keeps that newest snapshot and writes it to the database
+at most once every PROGRESS_DB_MIN_SECONDS (default 5) per job. A stage
+starting or finishing is written at once. A snapshot held back by the
+throttle is written when its window ends, so the last update before a
+quiet spell still lands. The coalescing is per web process.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import time
+
+from app.database import db
+from app.models.models import Job, JobStep
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_DB_MIN_SECONDS = float(os.getenv("PROGRESS_DB_MIN_SECONDS", "5"))
+
+# _finalize_job sets 100 once the outputs are stored
+PROGRESS_CAP = 99.0
+
+# external_ai stage names → JobStep names
+STAGE_STEPS = {
+    "asr": "asr",
+    "punctuation": "punctuate",
+    "mt": "translate",
+    "tts": "tts",
+    "separation": "separate_music",
+    "mix": "mix",
+    "mux": "replace_audio",
+}
+
+TERMINAL_JOB_STATES = ("succeeded", "failed", "cancelled")
+
+
+def apply_progress(job_id: str, snapshot: dict) -> bool:
+    """
+    Write one progress snapshot to the Job and its JobSteps (one commit).
+    Progress only moves forward, steps only advance pending → running →
+    succeeded, and finished jobs are left alone. Returns whether anything
+    was written.
+    """
+    job = db.session.get(Job, job_id)
+    if not job or job.state in TERMINAL_JOB_STATES:
+        return False
+
+    progress = min(float(snapshot.get("progress") or 0.0), PROGRESS_CAP)
+    if job.progress is None or progress > job.progress:
+        job.progress = progress
+    step = STAGE_STEPS.get(snapshot.get("stage"))
+    if step:
+        job.current_step = step
+
+    states = snapshot.get("stages") or {}
+    stage_progress = snapshot.get("stage_progress") or {}
+    items = snapshot.get("items") or {}
+    now = datetime.datetime.utcnow()
+    step_stages = {step: stage for stage, step in STAGE_STEPS.items()}
+    for js in JobStep.query.filter_by(job_id=job_id).all():
+        stage = step_stages.get(js.name)
+        if stage is None or (stage not in states and stage not in stage_progress):
+            continue
+        state = states.get(stage)
+        if state == "running" and js.state in ("pending", "retrying"):
+            js.state = "running"
+            js.started_at = js.started_at or now
+        elif (state == "succeeded" or stage_progress.get(stage) == 100.0) and js.state in ("pending", "running"):
+            js.state = "succeeded"
+            js.finished_at = now
+        metrics = dict(js.metrics or {})
+        if stage in stage_progress:
+            metrics["progress"] = stage_progress[stage]
+        if stage in items:
+            metrics["items"] = items[stage]
+        js.metrics = metrics
+
+    db.session.commit()
+    return True
+
+
+class ProgressCoalescer:
+    def __init__(self, write, min_interval: float = PROGRESS_DB_MIN_SECONDS, clock=time.monotonic, autoflush: bool = True):
+        """
+        `write(job_id, snapshot)` persists a snapshot (normally apply_progress
+        in an app context). Without `autoflush`, held-back snapshots are only
+        written by calling flush_due().
+        """
+        self.write = write
+        self.min_interval = min_interval
+        self.clock = clock
+        self.autoflush = autoflush
+        self.writes = 0
+        self.coalesced = 0
+        self._written = {}  # job_id -> (at, seq, stages)
+        self._pending = {}  # job_id -> snapshot
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def submit(self, job_id: str, snapshot: dict) -> str:
+        """Take a snapshot; returns "written", "coalesced" or "stale"."""
+        seq = snapshot.get("seq") or 0
+        with self._lock:
+            now = self.clock()
+            last = self._written.get(job_id)
+            pending = self._pending.get(job_id)
+            newest = max(last[1] if last else 0, (pending or {}).get("seq") or 0)
+            if seq and seq <= newest:
+                return "stale"
+            stages = snapshot.get("stages") or {}
+            due = last is None or now - last[0] >= self.min_interval or stages != last[2]
+            if not due:
+                if pending is not None:
+                    self.coalesced += 1
+                self._pending[job_id] = snapshot
+                self._ensure_flusher()
+                return "coalesced"
+            if pending is not None:
+                self.coalesced += 1
+            self._pending.pop(job_id, None)
+            self._written[job_id] = (now, seq, stages)
+            self._prune(now)
+        self._write(job_id, snapshot)
+        return "written"
+
+    def flush_due(self) -> float | None:
+        """Write held-back snapshots whose window has ended; returns seconds until the next one."""
+        due = []
+        wait = None
+        with self._lock:
+            now = self.clock()
+            for job_id, snapshot in list(self._pending.items()):
+                remaining = self._written[job_id][0] + self.min_interval - now
+                if remaining <= 0:
+                    del self._pending[job_id]
+                    self._written[job_id] = (now, snapshot.get("seq") or 0, snapshot.get("stages") or {})
+                    due.append((job_id, snapshot))
+                else:
+                    wait = remaining if wait is None else min(wait, remaining)
+        for job_id, snapshot in due:
+            self._write(job_id, snapshot)
+        return wait
+
+    def _write(self, job_id: str, snapshot: dict):
+        try:
+            self.write(job_id, snapshot)
+            self.writes += 1
+        except Exception as exc:
+            logger.warning("Could not record progress for job %s: %s", job_id, exc)
+
+    def _ensure_flusher(self):
+        if not self.autoflush:
+            return
+        self._wake.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._flush_loop, name="progress-flush", daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            wait = self.flush_due()
+            while wait is not None:
+                time.sleep(wait)
+                wait = self.flush_due()
+
+    def _prune(self, now: float):
+        # Forget jobs that stopped reporting a while ago
+        horizon = max(self.min_interval * 10, 300)
+        for job_id in [j for j, (at, _, _) in self._written.items() if now - at > horizon and j not in self._pending]:
+            del self._written[job_id]
@@ -0,0 +1,168 @@
+# backend/app/services/transcripts.py
+"""
+Transcripts of finished jobs, stored as TranscriptSegment rows.
+
+_finalize_job used to keep english/swahili and their segment lists in
+Job.meta, so every read of a job row (status polls, retries, the admin
+metrics that load all succeeded jobs) pulled megabytes of JSON through
+TOAST. Now store_transcripts() bulk-inserts one row per segment and
+Job.meta keeps only a pointer with the counts:
+
+    meta["transcript"] = {"store": "transcript_segment", "english_segments": 412, "swahili_segments": 412}
+
+The full english/swahili texts are stored as they came from external_ai,
+one untimed row per language at seq FULL_TEXT_SEQ (-1): the pipeline
+punctuates and joins them on its own, so they aren't always the segment
+texts joined with spaces. Jobs finalized before this change keep the old
+meta keys until migration f2c6d8e0b3a7 moves them, and load_transcripts()
+reads both layouts.
+"""
+
+from sqlalchemy import insert, select
+
+from app.database import db
+from app.models.models import Job, TranscriptSegment
+
+STORE = "transcript_segment"
+
+# payload/meta key prefix → TranscriptSegment.lang
+LANGS = {"english": "en", "swahili": "sw"}
+
+# Old Job.meta keys, replaced by meta["transcript"]
+LEGACY_META_KEYS = ("english", "swahili", "english_segments", "swahili_segments")
+
+# TranscriptSegment.seq of the row holding a language's full text
+FULL_TEXT_SEQ = -1
+
+
+def _rows(job_id, lang: str, text: str | None, segments) -> tuple[list[dict], int]:
+    """Rows for one language (full text first), and how many of them are segments."""
+    segments = [s for s in segments or [] if isinstance(s, dict) and (s.get("text") or "").strip()]
+    rows = [
+        {
+            "job_id": job_id,
+            "lang": lang,
+            "seq": seq,
+            "start_sec": seg.get("start"),
+            "end_sec": seg.get("end"),
+            "text": seg["text"].strip(),
+        }
+        for seq, seg in enumerate(segments)
+    ]
+    if text and text.strip():
+        rows.insert(
+            0,
+            {"job_id": job_id, "lang": lang, "seq": FULL_TEXT_SEQ, "start_sec": None, "end_sec": None, "text": text},
+        )
+    return rows, len(segments)
+
+
+def store_transcripts(job_id, payload: dict) -> dict | None:
+    """
+    Replace the job's segments with those in `payload` (english/swahili text
+    and *_segments) in one executemany INSERT. Returns the meta["transcript"]
+    pointer, or None when the payload has no transcript. Doesn't commit.
+    """
+    rows = []
+    counts = {}
+    for prefix, lang in LANGS.items():
+        lang_rows, counts[f"{prefix}_segments"] = _rows(
+            job_id, lang, payload.get(prefix), payload.get(f"{prefix}_segments")
+        )
+        rows += lang_rows
+
+    TranscriptSegment.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+    if not rows:
+        return None
+    db.session.execute(insert(TranscriptSegment), rows)
+    return {"store": STORE, **counts}
+
+
+def copy_transcripts(source_job_id, job_id) -> dict | None:
+    """Copy another job's segments with INSERT ... SELECT (dedup); returns the pointer like store_transcripts."""
+    source = db.session.get(Job, source_job_id)
+    pointer = (source.meta or {}).get("transcript") if source else None
+    if not pointer:
+        return None
+    TranscriptSegment.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+    columns = ("lang", "seq", "start_sec", "end_sec", "text")
+    db.session.execute(
+        insert(TranscriptSegment).from_select(
+            ("job_id",) + columns,
+            select(
+                db.literal(job_id, TranscriptSegment.job_id.type),
+                *(getattr(TranscriptSegment, c) for c in columns),
+            ).where(TranscriptSegment.job_id == source_job_id),
+        )
+    )
+    return dict(pointer)
+
+
+def _segment_dict(seg: TranscriptSegment) -> dict:
+    out = {"text": seg.text}
+    if seg.start_sec is not None:
+        out["start"] = seg.start_sec
+    if seg.end_sec is not None:
+        out["end"] = seg.end_sec
+    return out
+
+
+def load_transcripts(job: Job) -> dict:
+    """english, swahili, english_segments and swahili_segments of a job."""
+    meta = job.meta or {}
+    if not meta.get("transcript"):
+        return {
+            "english": meta.get("english", ""),
+            "swahili": meta.get("swahili", ""),
+            "english_segments": meta.get("english_segments", []),
+            "swahili_segments": meta.get("swahili_segments", []),
+        }
+
+    by_lang = {lang: [] for lang in LANGS.values()}
+    segments = (
+        TranscriptSegment.query.filter_by(job_id=job.id)
+        .order_by(TranscriptSegment.lang, TranscriptSegment.seq)
+        .all()
+    )
+    for seg in segments:
+        by_lang.setdefault(seg.lang, []).append(seg)
+
+    result = {}
+    for prefix, lang in LANGS.items():
+        rows = [seg for seg in by_lang[lang] if seg.seq != FULL_TEXT_SEQ]
+        full = [seg.text for seg in by_lang[lang] if seg.seq == FULL_TEXT_SEQ]
+        # Without a full text (external_ai sent only segments), fall back to joining them
+        result[prefix] = full[0] if full else " ".join(seg.text for seg in rows)
+        result[f"{prefix}_segments"] = [_segment_dict(seg) for seg in rows if seg.start_sec is not None]
+    return result
+
+
+def iter_job_segments(*criteria, batch_size: int = 5000):
+    """
+    Yield (job_id, english_segments, swahili_segments) for the jobs matching
+    `criteria` (filters on Job), most recently finished first. Only timed
+    segments, as in load_transcripts(). Rows are streamed, never loaded all
+    at once.
+    """
+    rows = db.session.execute(
+        select(
+            TranscriptSegment.job_id,
+            TranscriptSegment.lang,
+            TranscriptSegment.start_sec,
+            TranscriptSegment.end_sec,
+            TranscriptSegment.text,
+        )
+        .join(Job, Job.id == TranscriptSegment.job_id)
+        .where(TranscriptSegment.start_sec.isnot(None), *criteria)
+        .order_by(Job.finished_at.desc().nullslast(), Job.id, TranscriptSegment.lang, TranscriptSegment.seq)
+        .execution_options(yield_per=batch_size)
+    )
+    current, segments = None, {}
+    for job_id, lang, start, end, text in rows:
+        if job_id != current:
+            if current is not None:
+                yield current, segments.get("en", []), segments.get("sw", [])
+            current, segments = job_id, {}
+        segments.setdefault(lang, []).append({"text": text, "start": start, "end": end})
+    if current is not None:
+        yield current, segments.get("en", []), segments.get("sw", [])
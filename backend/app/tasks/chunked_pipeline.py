@@ -0,0 +1,213 @@
+# backend/app/tasks/chunked_pipeline.py
+
+"""
+Chunked, resumable variant of the full dubbing chain.
+
+The source is split at silence boundaries by external_ai (/chunks/plan) and
+each chunk is dubbed on its own (/full with source_id + start/end). Every
+finished chunk is checkpointed to MinIO as
+
+    <job_id>/plan.json          source_id + chunk ranges
+    <job_id>/chunk_0003.m4a     dubbed chunk audio
+    <job_id>/chunk_0003.json    transcripts/segments (written last = "done")
+
+so when pipeline_step retries the task after a failure, run_chunked skips
+every checkpointed chunk and resumes at the first unfinished one. Once all
+chunks exist their audio is stitched and muxed onto the source once.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from app.services.external_ai import InputFetchFailed, SourceMissing
+
+logger = logging.getLogger(__name__)
+
+CHUNK_TARGET_SECONDS = float(os.getenv("CHUNK_TARGET_SECONDS", "600"))
+
+PLAN_NAME = "plan.json"
+
+
+def _chunk_name(index: int) -> str:
+    return f"chunk_{index:04d}"
+
+
+def _offset_segments(segments, offset: float) -> list[dict]:
+    shifted = []
+    for seg in segments or []:
+        if not isinstance(seg, dict):
+            continue
+        seg = dict(seg)
+        seg["start"] = round(float(seg.get("start", 0.0)) + offset, 3)
+        seg["end"] = round(float(seg.get("end", 0.0)) + offset, 3)
+        shifted.append(seg)
+    return shifted
+
+
+def merge_chunk_results(records: list[dict]) -> dict:
+    """Join per-chunk transcripts in order, shifting segment times onto the source timeline."""
+    records = sorted(records, key=lambda r: r["index"])
+    english_segments, swahili_segments = [], []
+    for rec in records:
+        english_segments += _offset_segments(rec.get("english_segments"), rec["start"])
+        swahili_segments += _offset_segments(rec.get("swahili_segments"), rec["start"])
+    return {
+        "english": " ".join(r["english"].strip() for r in records if r.get("english")),
+        "swahili": " ".join(r["swahili"].strip() for r in records if r.get("swahili")),
+        "english_segments": english_segments,
+        "swahili_segments": swahili_segments,
+    }
+
+
+class ChunkRunner:
+    """
+    Chunk-level operations shared by the sequential (run_chunked) and the
+    parallel (Celery chord) modes. All state lives in the checkpoint store,
+    so any worker can pick up any chunk.
+
+    `client` is an ExternalAIClient, `store` a MinioCheckpointStore and
+    `fetch_source(uri) -> local path` downloads the source (only needed when
+    external_ai doesn't already hold it). With `reference_for(uri) -> dict`,
+    external_ai is asked to fetch the source itself first and the download
+    is only the fallback.
+    """
+
+    def __init__(self, video_s3_uri: str, client, store, fetch_source, workdir: str, reference_for=None):
+        self.video_s3_uri = video_s3_uri
+        self.client = client
+        self.store = store
+        self.fetch_source = fetch_source
+        self.reference_for = reference_for
+        self.workdir = Path(workdir)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self.plan = None
+        self._local_source = None
+
+    def _stage(self) -> str:
+        reference = self.reference_for(self.video_s3_uri) if self.reference_for else None
+        if reference and self._local_source is None:
+            try:
+                return self.client.stage_source(reference=reference)["source_id"]
+            except InputFetchFailed as exc:
+                logger.warning("[CHUNKED] external_ai could not fetch the source (%s); uploading it", exc)
+        if self._local_source is None:
+            self._local_source = self.fetch_source(self.video_s3_uri)
+        return self.client.stage_source(self._local_source)["source_id"]
+
+    def _with_source(self, call):
+        # external_ai may have restarted (or this is a different instance)
+        # since the plan was made; source ids are content hashes, so restaging
+        # yields the same id
+        try:
+            return call(self.plan["source_id"])
+        except SourceMissing:
+            logger.info("[CHUNKED] Source missing on external_ai, staging again")
+            self.plan["source_id"] = self._stage()
+            self.store.put_json(PLAN_NAME, self.plan)
+            return call(self.plan["source_id"])
+
+    def load_plan(self, target_seconds: float = CHUNK_TARGET_SECONDS) -> dict:
+        """Return the checkpointed plan, or stage the source and plan chunks now."""
+        plan = self.store.get_json(PLAN_NAME)
+        if not plan or not plan.get("chunks"):
+            source_id = self._stage()
+            plan = {
+                "video_s3_uri": self.video_s3_uri,
+                "source_id": source_id,
+                "chunks": self.client.plan_chunks(source_id, target_seconds),
+            }
+            self.store.put_json(PLAN_NAME, plan)
+        self.plan = plan
+        return plan
+
+    def run_chunk(self, chunk: dict) -> tuple[dict, bool]:
+        """Dub one chunk unless already checkpointed. Returns (record, reused)."""
+        name = _chunk_name(chunk["index"])
+        record = self.store.get_json(f"{name}.json")
+        if record is not None:
+            return record, True
+
+        logger.info("[CHUNKED] Chunk %d: %.1fs → %.1fs", chunk["index"], chunk["start"], chunk["end"])
+        data = self._with_source(lambda source_id: self.client.process_chunk(source_id, chunk))
+        audio = self.client.download(data["output"], str(self.workdir / f"{name}.m4a"))
+        self.store.put_file(f"{name}.m4a", audio)
+
+        record = {
+            "index": chunk["index"],
+            "start": chunk["start"],
+            "end": chunk["end"],
+            "english": data.get("english", ""),
+            "swahili": data.get("swahili", ""),
+            "english_segments": data.get("english_segments", []),
+            "swahili_segments": data.get("swahili_segments", []),
+            "pipeline_metrics": data.get("pipeline_metrics"),
+        }
+        # The record is the completion marker, so it goes up after the audio
+        self.store.put_json(f"{name}.json", record)
+        return record, False
+
+    def stitch(self, records: list[dict], output_name: str) -> dict:
+        """Stitch chunk audio onto the source once and merge transcripts onto its timeline."""
+        records = sorted(records, key=lambda r: r["index"])
+        audios = []
+        for rec in records:
+            name = _chunk_name(rec["index"])
+            local = self.workdir / f"{name}.m4a"
+            if not local.exists():
+                self.store.get_file(f"{name}.m4a", str(local))
+            audios.append(str(local))
+
+        stitched = self._with_source(lambda source_id: self.client.stitch(source_id, audios, output_name))
+
+        result = merge_chunk_results(records)
+        result["output"] = stitched["output"]
+        result["output_s3_uri"] = stitched.get("output_s3_uri")
+        result["source_id"] = self.plan["source_id"]
+        result["pipeline_metrics"] = {
+            "chunks": [
+                {"index": r["index"], "start": r["start"], "end": r["end"], "metrics": r.get("pipeline_metrics")}
+                for r in records
+            ],
+        }
+        return result
+
+
+def run_chunked(
+    video_s3_uri: str,
+    client,
+    store,
+    fetch_source,
+    workdir: str,
+    output_name: str,
+    target_seconds: float = CHUNK_TARGET_SECONDS,
+    reference_for=None,
+) -> dict:
+    """
+    Dub `video_s3_uri` chunk by chunk, resuming from checkpoints in `store`.
+
+    Returns the merged transcripts plus the external_ai path of the stitched
+    video in "output".
+    """
+    runner = ChunkRunner(video_s3_uri, client, store, fetch_source, workdir, reference_for=reference_for)
+    plan = runner.load_plan(target_seconds)
+
+    records = []
+    resumed_from = None
+    reused = 0
+    for chunk in plan["chunks"]:
+        record, was_reused = runner.run_chunk(chunk)
+        if was_reused:
+            reused += 1
+        elif resumed_from is None:
+            resumed_from = chunk["index"]
+        records.append(record)
+
+    result = runner.stitch(records, output_name)
+    result["pipeline_metrics"]["chunked"] = {
+        "chunks": len(plan["chunks"]),
+        "chunks_reused": reused,
+        "resumed_from": resumed_from if reused else None,
+        "target_seconds": target_seconds,
+    }
+    return result
@@ -8,19 +8,40 @@ NEW (Option A):
   - JobSteps for the classic stages (asr, punctuate, translate, tts,
     separate_music, mix, replace_audio) are still created so the
     dashboard remains compatible. _finalize_job marks them all as
-    succeeded once the full chain completes.
+    succeeded once the full chain completes, using the per-stage timings
+    external_ai reports in pipeline_metrics["stages"].
 """
 
 import datetime
-from celery import shared_task, chain
+import os
+from celery import shared_task, chain, chord, group
 from app.database import db
 from app.models.models import Job, JobStep
-from app.tasks.progress_tracker import set_step_success
+from app.services import transcripts
+from app.services.job_progress import STAGE_STEPS
+from app.tasks.progress_tracker import set_step_failed, set_step_running, set_step_success
 
 from .pipeline_tasks import (
     task_full_chain,  # 👈 NEW single-call task
+    task_full_chain_chunked,
+    task_submit_full,
+    task_dub_range,
+    task_stitch_ranges,
+    _chunk_runner,
 )
 
+# "full" = one /full call per video; "chunked" = silence-aligned chunks with
+# MinIO checkpoints so retries resume mid-video; "parallel" = the same chunks
+# dubbed concurrently by a Celery chord across workers
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "full").lower()
+
+# "sync" = task_full_chain blocks on /full; "async" = submit to external_ai
+# /jobs and re-check on a countdown, freeing the worker (full mode only)
+EXTERNAL_AI_MODE = os.getenv("EXTERNAL_AI_MODE", "sync").lower()
+
+# Range length for parallel mode; shorter ranges spread better over more workers
+PARALLEL_RANGE_SECONDS = float(os.getenv("PARALLEL_RANGE_SECONDS", "300"))
+
 
 def _calculate_text_metrics(payload: dict) -> dict:
     """Calculate text analytics metrics from pipeline payload."""
@@ -88,6 +109,43 @@ PIPELINE_STEPS = [
     "replace_audio",
 ]
 
+def stage_timings(pipeline_metrics: dict | None) -> dict:
+    """
+    Per-JobStep timings from external_ai's stage profile.
+
+    Chunked and parallel runs carry one profile per chunk; those are summed
+    (wall/CPU/items), spanned (start/finish) and maxed (peak RSS).
+    """
+    pipeline_metrics = pipeline_metrics or {}
+    profiles = [pipeline_metrics.get("stages")]
+    profiles += [(c.get("metrics") or {}).get("stages") for c in pipeline_metrics.get("chunks") or []]
+
+    timings = {}
+    for profile in profiles:
+        for stage, t in (profile or {}).items():
+            step = STAGE_STEPS.get(stage)
+            if step is None or t.get("started_at") is None or t.get("finished_at") is None:
+                continue
+            acc = timings.get(step)
+            if acc is None:
+                timings[step] = {
+                    "started_at": t["started_at"],
+                    "finished_at": t["finished_at"],
+                    "wall_seconds": t.get("wall_seconds") or 0.0,
+                    "cpu_seconds": t.get("cpu_seconds") or 0.0,
+                    "peak_rss_mb": t.get("peak_rss_mb"),
+                    "items": t.get("items") or 0,
+                }
+                continue
+            acc["started_at"] = min(acc["started_at"], t["started_at"])
+            acc["finished_at"] = max(acc["finished_at"], t["finished_at"])
+            acc["wall_seconds"] += t.get("wall_seconds") or 0.0
+            acc["cpu_seconds"] += t.get("cpu_seconds") or 0.0
+            acc["items"] += t.get("items") or 0
+            if t.get("peak_rss_mb") is not None:
+                acc["peak_rss_mb"] = max(acc["peak_rss_mb"] or 0.0, t["peak_rss_mb"])
+    return timings
+
 
 # ============================================================================
 # MAIN ENTRY TASK
@@ -121,11 +179,50 @@ def run_chain(self, job_id: str, video_s3_uri: str):
             db.session.add(JobStep(job_id=job_id, name=step, state="pending"))
     db.session.commit()
 
+    # ----------------------------------------------------------------------
+    # Dedup: identical content already dubbed → finalize straight from the
+    # earlier job's outputs, skipping external_ai entirely
+    # ----------------------------------------------------------------------
+    dedup_of = (job.meta or {}).get("dedup_of")
+    if dedup_of:
+        source = Job.query.get(dedup_of)
+        if source and source.state == "succeeded" and (source.meta or {}).get("output_s3_uri"):
+            async_result = _finalize_job.s(
+                {"video_s3_uri": video_s3_uri, "dedup_of": dedup_of},
+                job_id,
+            ).apply_async()
+            return {"task_id": async_result.id, "job_id": job_id, "dedup_of": dedup_of}
+
+        # Source job is gone or was reset; fall back to a full run
+        meta = dict(job.meta or {})
+        meta.pop("dedup_of", None)
+        job.meta = meta
+        db.session.commit()
+
     # ----------------------------------------------------------------------
     # Chain definition: single full-chain task + finalizer
     # ----------------------------------------------------------------------
+    if PIPELINE_MODE == "parallel":
+        async_result = task_parallel_dispatch.s(video_s3_uri, job_id=job_id).apply_async()
+        return {"task_id": async_result.id, "job_id": job_id, "mode": "parallel"}
+
+    if PIPELINE_MODE == "full" and EXTERNAL_AI_MODE == "async":
+        # _finalize_job is queued by the poll task once external_ai is done
+        meta = dict(job.meta or {})
+        for key in ("external_ai_job_id", "external_ai_collected", "external_ai_partial"):
+            meta.pop(key, None)
+        job.meta = meta
+        db.session.commit()
+        async_result = task_submit_full.s(video_s3_uri, job_id).apply_async()
+        return {"task_id": async_result.id, "job_id": job_id, "mode": "async"}
+
+    if PIPELINE_MODE == "chunked":
+        first = task_full_chain_chunked.s(video_s3_uri, job_id)
+    else:
+        first = task_full_chain.s(video_s3_uri)
+
     workflow = chain(
-        task_full_chain.s(video_s3_uri),
+        first,
         _finalize_job.s(job_id),
     )
 
@@ -133,6 +230,37 @@ def run_chain(self, job_id: str, video_s3_uri: str):
     return {"task_id": async_result.id, "job_id": job_id}
 
 
+@shared_task(bind=True)
+def task_parallel_dispatch(self, video_s3_uri: str, job_id: str):
+    """
+    Plan silence-aligned ranges and fan them out:
+
+        chord(group(task_dub_range × N), task_stitch_ranges | _finalize_job)
+
+    Each range task can land on a different worker, so wall time for a long
+    lecture shrinks with the number of workers (and EXTERNAL_AI_URLS).
+    Finished ranges are checkpointed, so re-running the job only redoes the
+    ranges that never completed.
+    """
+    try:
+        plan = _chunk_runner(video_s3_uri, job_id).load_plan(PARALLEL_RANGE_SECONDS)
+    except Exception as exc:
+        set_step_failed(job_id, "asr", f"Range planning failed: {exc}")
+        raise
+    # One step for all ranges: each range task records its progress in it
+    set_step_running(job_id, "asr")
+
+    header = group(
+        task_dub_range.s(video_s3_uri, chunk, job_id=job_id) for chunk in plan["chunks"]
+    )
+    body = chain(
+        task_stitch_ranges.s(video_s3_uri, job_id=job_id),
+        _finalize_job.s(job_id),
+    )
+    async_result = chord(header)(body)
+    return {"task_id": async_result.id, "job_id": job_id, "ranges": len(plan["chunks"])}
+
+
 def queue_dubbing_chain(job_id: str, video_s3_uri: str):
     """
     Called by Flask route /jobs/create.
@@ -146,6 +274,33 @@ def queue_dubbing_chain(job_id: str, video_s3_uri: str):
     )
 
 
+# Result fields copied from an earlier job when a duplicate upload is detected
+# (transcripts are copied by copy_transcripts; the text keys are only present
+# on jobs finalized before the transcript_segment table)
+DEDUP_META_KEYS = [
+    "output_s3_uri",
+    "english",
+    "swahili",
+    "english_segments",
+    "swahili_segments",
+    "text_metrics",
+]
+
+
+def _dedup_payload(payload: dict) -> dict:
+    """Build a finalizer payload from the outputs of the job named in payload['dedup_of']."""
+    source = Job.query.get(payload["dedup_of"])
+    if not source or not (source.meta or {}).get("output_s3_uri"):
+        raise Exception(f"Dedup source job {payload['dedup_of']} has no outputs")
+
+    source_meta = dict(source.meta or {})
+    merged = dict(payload)
+    for key in DEDUP_META_KEYS:
+        if source_meta.get(key) is not None:
+            merged[key] = source_meta[key]
+    return merged
+
+
 # ============================================================================
 # FINALIZER
 # ============================================================================
@@ -153,15 +308,21 @@ def queue_dubbing_chain(job_id: str, video_s3_uri: str):
 def _finalize_job(self, payload: dict, job_id: str):
     """
     Finalize job after successful pipeline completion.
-    Marks all steps as succeeded and updates job state to 'succeeded'.
+    Marks all steps as succeeded (with their measured stage timings, when
+    external_ai sent them) and updates job state to 'succeeded'.
     """
     import logging
     logger = logging.getLogger(__name__)
     
     try:
-        # Mark all logical pipeline steps as successful for this job
+        if payload.get("dedup_of"):
+            payload = _dedup_payload(payload)
+
+        # Mark all logical pipeline steps as successful for this job, with the
+        # stage timings external_ai measured (a deduplicated job ran nothing)
+        timings = {} if payload.get("dedup_of") else stage_timings(payload.get("pipeline_metrics"))
         for step_name in PIPELINE_STEPS:
-            set_step_success(job_id, step_name)
+            set_step_success(job_id, step_name, timing=timings.get(step_name))
 
         job = Job.query.get(job_id)
         if not job:
@@ -181,25 +342,30 @@ def _finalize_job(self, payload: dict, job_id: str):
         # propagate output_s3_uri from payload
         if payload.get("output_s3_uri"):
             meta["output_s3_uri"] = payload.get("output_s3_uri")
-        # Store transcriptions and translations (both plain text and timestamped segments)
-        if payload.get("english"):
-            meta["english"] = payload.get("english")
-        if payload.get("swahili"):
-            meta["swahili"] = payload.get("swahili")
-        if payload.get("english_segments"):
-            meta["english_segments"] = payload.get("english_segments")
-        if payload.get("swahili_segments"):
-            meta["swahili_segments"] = payload.get("swahili_segments")
+        # Store transcriptions and translations as TranscriptSegment rows;
+        # meta only points at them. A deduplicated job copies the source's rows
+        # (or its old meta transcripts, which _dedup_payload put in the payload)
+        if payload.get("dedup_of") and not any(payload.get(k) for k in transcripts.LEGACY_META_KEYS):
+            transcript = transcripts.copy_transcripts(payload["dedup_of"], job.id)
+        else:
+            transcript = transcripts.store_transcripts(job.id, payload)
+        for key in transcripts.LEGACY_META_KEYS:
+            meta.pop(key, None)
+        if transcript:
+            meta["transcript"] = transcript
         
         # Store pipeline metrics (ASR confidence, model versions, processing time, etc.)
         if payload.get("pipeline_metrics"):
             meta["pipeline_metrics"] = payload.get("pipeline_metrics")
         
-        # Calculate and store text metrics
-        text_metrics = _calculate_text_metrics(payload)
+        # Calculate and store text metrics (copied as-is for deduplicated jobs)
+        text_metrics = payload.get("text_metrics") or _calculate_text_metrics(payload)
         if text_metrics:
             meta["text_metrics"] = text_metrics
         
+        if payload.get("dedup_of"):
+            meta["dedup_of"] = payload["dedup_of"]
+
         job.meta = meta
 
         db.session.commit()
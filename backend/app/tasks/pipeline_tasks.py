@@ -5,11 +5,14 @@ Everything heavy (ASR, MT, TTS, Demucs, Muxing) runs in external_ai.
 This worker:
   - downloads files from MinIO
   - calls external_ai endpoints
-  - uploads final outputs
+  - uploads final outputs (when external_ai's output sink hasn't already)
   - updates JobStep state via progress_tracker
 """
 
+import datetime
+import logging
 import os
+import shutil
 import tempfile
 from pathlib import Path
 
@@ -18,70 +21,73 @@ from celery import shared_task
 
 from app.utils.minio_downloader import download_minio_uri
 from app.utils.minio_client import upload_file
+from app.utils.ranged_download import DownloadError, download_resumable
 from app.config import config
-from app.tasks.progress_tracker import pipeline_step
+from app.database import db
+from app.models.models import Job
+from app.tasks.progress_tracker import (
+    pipeline_step,
+    resolve_job_id,
+    set_range_done,
+    set_step_failed,
+    set_step_running,
+    set_step_success,
+)
+from app.tasks.chunked_pipeline import ChunkRunner, run_chunked
+from app.services.external_ai import ExternalAIClient, JobMissing, _error_code, input_reference
+from app.utils.checkpoint_store import MinioCheckpointStore
+
+logger = logging.getLogger(__name__)
 
 
 EXTERNAL_AI_URL = os.getenv("EXTERNAL_AI_URL", "http://host.docker.internal:7001")
-
-
-# ============================================================================
-# 🔄 NEW: Single full-chain local dubbing task (Option A)
-# ============================================================================
-@shared_task(bind=True)
-@pipeline_step("asr")
-def task_full_chain(self, video_s3_uri: str):
+# How long task_full_chain waits for external_ai's models to finish loading
+# before giving up (and retrying via pipeline_step)
+EXTERNAL_AI_READY_WAIT_SECONDS = int(os.getenv("EXTERNAL_AI_READY_WAIT_SECONDS", "600"))
+
+# Async mode (EXTERNAL_AI_MODE=async): submit to /jobs, then re-check on a countdown
+EXTERNAL_AI_POLL_SECONDS = int(os.getenv("EXTERNAL_AI_POLL_SECONDS", "30"))
+EXTERNAL_AI_MAX_WAIT_SECONDS = int(os.getenv("EXTERNAL_AI_MAX_WAIT_SECONDS", str(6 * 3600)))
+EXTERNAL_AI_MAX_RESUBMITS = int(os.getenv("EXTERNAL_AI_MAX_RESUBMITS", "2"))
+# Where external_ai can reach this backend; callbacks are only requested when
+# both this and the shared token are set (polling alone still works)
+BACKEND_CALLBACK_URL = os.getenv("BACKEND_CALLBACK_URL", "").rstrip("/")
+EXTERNAL_AI_CALLBACK_TOKEN = os.getenv("EXTERNAL_AI_CALLBACK_TOKEN", "")
+
+# Parallel mode fans ranges out round-robin over these external_ai instances
+EXTERNAL_AI_URLS = [
+    u.strip() for u in os.getenv("EXTERNAL_AI_URLS", EXTERNAL_AI_URL).split(",") if u.strip()
+]
+
+
+def _collect_output(data: dict) -> str:
     """
-    Single-call pipeline:
-      1) Download source video from MinIO
-      2) POST to external_ai /full
-      3) Download the produced dubbed video via /files
-      4) Upload final video to MinIO outputs bucket
-      5) Return payload with output_s3_uri (and transcripts)
+    s3:// URI of the dubbed video in an external_ai response: uploaded directly
+    by its output sink when available, else fetched via /files and uploaded here.
     """
+    if data.get("output_s3_uri"):
+        return data["output_s3_uri"]
+    return _store_external_output(data["output"])
 
-    # 1) Download source video from MinIO
-    local_video = download_minio_uri(video_s3_uri)
-
-    # 2) Call external_ai /full with the video file
-    with open(local_video, "rb") as fh:
-        resp = requests.post(
-            f"{EXTERNAL_AI_URL}/full",
-            files={"video": fh},
-        )
-
-    if resp.status_code != 200:
-        raise Exception(f"/full pipeline failed: {resp.text}")
-
-    data = resp.json()
-    if data.get("status") != "success":
-        raise Exception(f"/full pipeline returned error: {data}")
-
-    # Local path (on external_ai machine) to the dubbed video
-    output_local = data.get("output")
-    if not output_local:
-        raise Exception(f"/full did not return 'output' path: {data}")
-
-    # 3) Download the dubbed video from external_ai via /files
-    download_resp = requests.get(
-        f"{EXTERNAL_AI_URL}/files",
-        params={"path": output_local},
-        stream=True,
-    )
 
-    if download_resp.status_code != 200:
-        raise Exception(f"Failed to download dubbed video: {download_resp.text}")
+def _store_external_output(output_local: str) -> str:
+    """
+    Download a file produced by external_ai via /files and upload it to the outputs bucket.
 
+    The download is fetched in parallel byte ranges, resumed after dropped
+    connections (also by a task retry, since the local path is stable) and
+    checked against external_ai's SHA-256 digest.
+    """
     tmp_dir = Path(tempfile.gettempdir()) / "pipeline_outputs_full"
     tmp_dir.mkdir(parents=True, exist_ok=True)
     tmp_file = tmp_dir / Path(output_local).name
 
-    with open(tmp_file, "wb") as fh:
-        for chunk in download_resp.iter_content(1024 * 1024):
-            if chunk:
-                fh.write(chunk)
+    try:
+        download_resumable(f"{EXTERNAL_AI_URL}/files", str(tmp_file), params={"path": output_local})
+    except DownloadError as exc:
+        raise Exception(f"Failed to download dubbed video: {exc}") from exc
 
-    # 4) Normalize path & upload to MinIO (same pattern as old replace_audio)
+    # Normalize path & upload to MinIO (same pattern as old replace_audio)
     # Fix Windows slashes and remove any bucket prefix to avoid duplication
     clean = output_local.replace("\\", "/").lstrip("/")
     
@@ -103,6 +109,69 @@ def task_full_chain(self, video_s3_uri: str):
     )
 
     tmp_file.unlink(missing_ok=True)
+    return s3_uri
+
+
+
+# ============================================================================
+# 🔄 NEW: Single full-chain local dubbing task (Option A)
+# ============================================================================
+@shared_task(bind=True)
+@pipeline_step("asr")
+def task_full_chain(self, video_s3_uri: str):
+    """
+    Single-call pipeline:
+      0) Wait until external_ai reports its models loaded (/ready)
+      1) Reference the source video in MinIO (presigned URL or s3:// URI)
+      2) POST to external_ai /full, which fetches it; if it can't, download
+         the video here and upload it instead
+      3) + 4) Use the output_s3_uri external_ai's sink uploaded to, or fall
+         back to downloading the dubbed video via /files and uploading it
+      5) Return payload with output_s3_uri (and transcripts)
+    """
+
+    # 0) Wait out a cold start instead of spending the soft time limit
+    #    inside /full while the models load
+    ExternalAIClient(EXTERNAL_AI_URL).wait_until_ready(EXTERNAL_AI_READY_WAIT_SECONDS)
+
+    # Live stage/segment progress while /full runs (see job_progress)
+    progress_url = _progress_url(resolve_job_id(self, (video_s3_uri,), {}))
+    extra = {"progress_url": progress_url} if progress_url else {}
+
+    # 1) + 2) Let external_ai fetch the source itself by reference; only
+    #         download and re-upload it when that isn't possible
+    resp = None
+    reference = input_reference(video_s3_uri)
+    if reference:
+        resp = requests.post(f"{EXTERNAL_AI_URL}/full", json={**reference, **extra})
+        if resp.status_code == 502 and _error_code(resp) == "input_fetch_failed":
+            logger.warning("external_ai could not fetch %s (%s); uploading instead", video_s3_uri, resp.text)
+            resp = None
+
+    if resp is None:
+        local_video = download_minio_uri(video_s3_uri)
+        with open(local_video, "rb") as fh:
+            resp = requests.post(
+                f"{EXTERNAL_AI_URL}/full",
+                files={"video": fh},
+                data=extra or None,
+            )
+
+    if resp.status_code != 200:
+        raise Exception(f"/full pipeline failed: {resp.text}")
+
+    data = resp.json()
+    if data.get("status") != "success":
+        raise Exception(f"/full pipeline returned error: {data}")
+
+    # Local path (on external_ai machine) to the dubbed video
+    output_local = data.get("output")
+    if not output_local:
+        raise Exception(f"/full did not return 'output' path: {data}")
+
+    # 3) + 4) external_ai's output sink normally uploaded it already; otherwise
+    #         download the dubbed video via /files and upload it to MinIO
+    s3_uri = _collect_output(data)
 
     # 5) Build payload forwarded into _finalize_job
     # Include both plain text and timestamped segments, plus pipeline metrics
@@ -118,6 +187,297 @@ def task_full_chain(self, video_s3_uri: str):
     return payload
 
 
+# ============================================================================
+# Asynchronous full-chain (EXTERNAL_AI_MODE=async)
+#   task_submit_full posts the video to external_ai /jobs and returns at once;
+#   task_poll_external_ai re-checks on a countdown (or right away when the
+#   completion webhook fires), so no worker slot is held during the run.
+# ============================================================================
+def _update_job_meta(job_id: str, **values):
+    job = Job.query.get(job_id)
+    if job:
+        meta = dict(job.meta or {})
+        meta.update(values)
+        job.meta = meta
+        db.session.commit()
+    return job
+
+
+def _callback_url(job_id: str) -> str | None:
+    if not (BACKEND_CALLBACK_URL and EXTERNAL_AI_CALLBACK_TOKEN):
+        return None
+    return f"{BACKEND_CALLBACK_URL}/api/jobs/{job_id}/external-ai-callback?token={EXTERNAL_AI_CALLBACK_TOKEN}"
+
+
+def _progress_url(job_id: str | None) -> str | None:
+    if not (job_id and BACKEND_CALLBACK_URL and EXTERNAL_AI_CALLBACK_TOKEN):
+        return None
+    return f"{BACKEND_CALLBACK_URL}/api/jobs/{job_id}/progress?token={EXTERNAL_AI_CALLBACK_TOKEN}"
+
+
+def _claim_external_result(job_id: str, ext_job_id: str) -> bool:
+    """
+    Atomically mark an external_ai job's result as collected, so the
+    webhook-triggered check and the scheduled one can't both finalize it.
+    """
+    from sqlalchemy import literal
+    from sqlalchemy.dialects.postgresql import JSONB
+
+    claimed = (
+        Job.query.filter(
+            Job.id == job_id,
+            Job.meta["external_ai_job_id"].astext == ext_job_id,
+            ~Job.meta.has_key("external_ai_collected"),
+        ).update(
+            {Job.meta: Job.meta.op("||")(literal({"external_ai_collected": ext_job_id}, type_=JSONB))},
+            synchronize_session=False,
+        )
+    )
+    db.session.commit()
+    return claimed == 1
+
+
+@shared_task(bind=True, max_retries=3)
+def task_submit_full(self, video_s3_uri: str, job_id: str, resubmits: int = 0, upload: bool = False):
+    """
+    Submit the source to external_ai /jobs and schedule the first status check.
+    By reference unless `upload` is set (or EXTERNAL_AI_INPUT_MODE=upload).
+    """
+    set_step_running(job_id, "asr")
+    local_video = None
+    try:
+        client = ExternalAIClient(EXTERNAL_AI_URL)
+        reference = None if upload else input_reference(video_s3_uri)
+        if reference:
+            submitted = client.submit_full(
+                reference=reference, callback_url=_callback_url(job_id), progress_url=_progress_url(job_id)
+            )
+        else:
+            local_video = download_minio_uri(video_s3_uri)
+            submitted = client.submit_full(
+                local_video, callback_url=_callback_url(job_id), progress_url=_progress_url(job_id)
+            )
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=10 * (2 ** self.request.retries))
+        set_step_failed(job_id, "asr", f"external_ai submission failed: {exc}")
+        raise
+    finally:
+        if local_video:
+            Path(local_video).unlink(missing_ok=True)
+
+    ext_job_id = submitted["job_id"]
+    _update_job_meta(
+        job_id,
+        video_s3_uri=video_s3_uri,
+        external_ai_job_id=ext_job_id,
+        external_ai_submitted_at=datetime.datetime.utcnow().isoformat(),
+        external_ai_resubmits=resubmits,
+        external_ai_input="upload" if local_video else "reference",
+    )
+    task_poll_external_ai.apply_async(args=(job_id, ext_job_id), countdown=EXTERNAL_AI_POLL_SECONDS)
+    return {"job_id": job_id, "external_ai_job_id": ext_job_id}
+
+
+@shared_task(name="pipeline.poll_external_ai", bind=True, max_retries=3)
+def task_poll_external_ai(self, job_id: str, ext_job_id: str, claimed: bool = False):
+    """Check an async external_ai job once; reschedule itself while it is still running."""
+    job = Job.query.get(job_id)
+    if not job or job.state in ("cancelled", "failed", "succeeded"):
+        return {"job_id": job_id, "skipped": job.state if job else "missing"}
+
+    meta = dict(job.meta or {})
+    if meta.get("external_ai_job_id") != ext_job_id:
+        # Superseded by a resubmission
+        return {"job_id": job_id, "skipped": "superseded"}
+    if meta.get("external_ai_collected") and not claimed:
+        return {"job_id": job_id, "skipped": "collected"}
+
+    client = ExternalAIClient(EXTERNAL_AI_URL)
+    try:
+        doc = client.get_job(ext_job_id)
+    except JobMissing:
+        resubmits = int(meta.get("external_ai_resubmits", 0))
+        if resubmits >= EXTERNAL_AI_MAX_RESUBMITS:
+            set_step_failed(job_id, "asr", f"external_ai lost job {ext_job_id} too many times")
+            return {"job_id": job_id, "status": "failed"}
+        logger.warning("external_ai lost job %s for %s, resubmitting", ext_job_id, job_id)
+        task_submit_full.delay(meta["video_s3_uri"], job_id, resubmits + 1)
+        return {"job_id": job_id, "status": "resubmitted"}
+    except requests.RequestException as exc:
+        logger.warning("Polling external_ai job %s failed: %s", ext_job_id, exc)
+        task_poll_external_ai.apply_async(args=(job_id, ext_job_id), countdown=EXTERNAL_AI_POLL_SECONDS)
+        return {"job_id": job_id, "status": "unreachable"}
+
+    status = doc.get("status")
+    if status in ("queued", "running"):
+        submitted_at = datetime.datetime.fromisoformat(meta["external_ai_submitted_at"])
+        if (datetime.datetime.utcnow() - submitted_at).total_seconds() > EXTERNAL_AI_MAX_WAIT_SECONDS:
+            set_step_failed(job_id, "asr", f"external_ai job {ext_job_id} exceeded {EXTERNAL_AI_MAX_WAIT_SECONDS}s")
+            return {"job_id": job_id, "status": "timeout"}
+        if doc.get("partial") != meta.get("external_ai_partial"):
+            _update_job_meta(job_id, external_ai_partial=doc.get("partial"))
+        task_poll_external_ai.apply_async(args=(job_id, ext_job_id), countdown=EXTERNAL_AI_POLL_SECONDS)
+        return {"job_id": job_id, "status": status}
+
+    if status != "succeeded":
+        if doc.get("error_code") == "input_fetch_failed" and meta.get("external_ai_input") == "reference":
+            logger.warning("external_ai could not fetch the input for %s, resubmitting as upload", job_id)
+            task_submit_full.delay(meta["video_s3_uri"], job_id, int(meta.get("external_ai_resubmits", 0)), upload=True)
+            return {"job_id": job_id, "status": "resubmitted"}
+        set_step_failed(job_id, "asr", f"/jobs pipeline failed: {doc.get('error')}")
+        return {"job_id": job_id, "status": "failed"}
+
+    if not claimed and not _claim_external_result(job_id, ext_job_id):
+        return {"job_id": job_id, "skipped": "collected"}
+
+    data = doc.get("result") or {}
+    try:
+        s3_uri = _collect_output(data)
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(
+                exc=exc,
+                args=(job_id, ext_job_id),
+                kwargs={"claimed": True},
+                countdown=10 * (2 ** self.request.retries),
+            )
+        set_step_failed(job_id, "asr", f"Collecting external_ai output failed: {exc}")
+        raise
+
+    set_step_success(job_id, "asr")
+    payload = {
+        "video_s3_uri": meta.get("video_s3_uri"),
+        "output_s3_uri": s3_uri,
+        "english": data.get("english", ""),
+        "swahili": data.get("swahili", ""),
+        "english_segments": data.get("english_segments", []),
+        "swahili_segments": data.get("swahili_segments", []),
+        "pipeline_metrics": data.get("pipeline_metrics"),
+        "job_id": job_id,
+    }
+
+    from app.tasks.pipeline_chain import _finalize_job
+
+    _finalize_job.delay(payload, job_id)
+    return {"job_id": job_id, "status": "succeeded"}
+
+
+# ============================================================================
+# Chunked, resumable full-chain task (PIPELINE_MODE=chunked)
+# ============================================================================
+@shared_task(bind=True)
+@pipeline_step("asr")
+def task_full_chain_chunked(self, video_s3_uri: str, job_id: str):
+    """
+    Same contract as task_full_chain, but the video is dubbed in
+    silence-aligned chunks checkpointed to MinIO. A retry (pipeline_step
+    backoff, or a manual job retry) resumes at the first unfinished chunk.
+    """
+    store = MinioCheckpointStore(config.S3_BUCKET_CHECKPOINTS, job_id)
+    client = ExternalAIClient(EXTERNAL_AI_URL)
+    workdir = _chunk_workdir(job_id)
+
+    data = run_chunked(
+        video_s3_uri,
+        client,
+        store,
+        fetch_source=download_minio_uri,
+        workdir=str(workdir),
+        output_name=f"chunked_{job_id}",
+        reference_for=input_reference,
+    )
+
+    s3_uri = _collect_output(data)
+    _cleanup_chunks(store, client, data["source_id"], workdir)
+    return _chunked_payload(video_s3_uri, s3_uri, data)
+
+
+def _chunk_workdir(job_id: str) -> Path:
+    return Path(tempfile.gettempdir()) / "pipeline_chunks" / job_id
+
+
+def _chunk_runner(video_s3_uri: str, job_id: str, base_url: str = EXTERNAL_AI_URL) -> ChunkRunner:
+    return ChunkRunner(
+        video_s3_uri,
+        ExternalAIClient(base_url),
+        MinioCheckpointStore(config.S3_BUCKET_CHECKPOINTS, job_id),
+        fetch_source=download_minio_uri,
+        workdir=str(_chunk_workdir(job_id)),
+        reference_for=input_reference,
+    )
+
+
+def _cleanup_chunks(store, client, source_id: str, workdir: Path):
+    # Output is safe in MinIO; checkpoints and the staged source are no longer needed
+    try:
+        store.clear()
+        client.release_source(source_id)
+    except Exception as exc:
+        logger.warning("Could not clean up chunk checkpoints in %s: %s", workdir, exc)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _chunked_payload(video_s3_uri: str, s3_uri: str, data: dict) -> dict:
+    return {
+        "video_s3_uri": video_s3_uri,
+        "output_s3_uri": s3_uri,
+        "english": data.get("english", ""),
+        "swahili": data.get("swahili", ""),
+        "english_segments": data.get("english_segments", []),
+        "swahili_segments": data.get("swahili_segments", []),
+        "pipeline_metrics": data.get("pipeline_metrics"),
+    }
+
+
+# ============================================================================
+# Parallel range tasks (PIPELINE_MODE=parallel)
+#   pipeline_chain.task_parallel_dispatch plans the ranges and launches
+#   chord(group(task_dub_range...), task_stitch_ranges | _finalize_job)
+# ============================================================================
+@shared_task(bind=True, max_retries=3)
+def task_dub_range(self, video_s3_uri: str, chunk: dict, job_id: str):
+    """
+    Dub one time range of the source; returns its checkpoint record.
+
+    Not a pipeline_step: N of these run at once, so each only records its
+    range in the asr step's metrics. task_parallel_dispatch starts the step
+    and task_stitch_ranges ends it.
+    """
+    base_url = EXTERNAL_AI_URLS[chunk["index"] % len(EXTERNAL_AI_URLS)]
+    try:
+        runner = _chunk_runner(video_s3_uri, job_id, base_url)
+        plan = runner.load_plan()
+        record, _ = runner.run_chunk(chunk)
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=10 * (2 ** self.request.retries))
+        set_step_failed(job_id, "asr", f"Range {chunk['index']} failed: {exc}")
+        raise
+    set_range_done(job_id, "asr", chunk["index"], len(plan["chunks"]))
+    return record
+
+
+@shared_task(bind=True)
+@pipeline_step("replace_audio")
+def task_stitch_ranges(self, records: list, video_s3_uri: str, job_id: str):
+    """Chord callback: stitch range audio, shift segment times, mux once, upload."""
+    # The chord only calls back once every range task has succeeded
+    set_step_success(job_id, "asr")
+    runner = _chunk_runner(video_s3_uri, job_id)
+    plan = runner.load_plan()
+
+    data = runner.stitch(records, output_name=f"parallel_{job_id}")
+    data["pipeline_metrics"]["parallel"] = {
+        "ranges": len(plan["chunks"]),
+        "external_ai_instances": len(EXTERNAL_AI_URLS),
+    }
+
+    s3_uri = _collect_output(data)
+    _cleanup_chunks(runner.store, runner.client, data["source_id"], runner.workdir)
+    return _chunked_payload(video_s3_uri, s3_uri, data)
+
+
 # ============================================================================
 # LEGACY MULTI-STAGE TASKS (kept for compatibility / future use)
 #   NOTE: run_chain() no longer uses these; they remain here so nothing else
@@ -40,11 +40,24 @@ def _normalize_datetime(dt):
     return dt
 
 
-def set_step_success(job_id: str, step: str):
+def _from_epoch(ts: float):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).replace(tzinfo=None)
+
+
+def set_step_success(job_id: str, step: str, timing: dict | None = None):
+    """
+    Mark a step succeeded. `timing` is a measured stage profile from
+    external_ai (see pipeline_chain.stage_timings); without it the step
+    runs from set_step_running() until now.
+    """
     js = JobStep.query.filter_by(job_id=job_id, name=step).first()
     if js:
         js.state = "succeeded"
-        js.finished_at = _now()
+        if timing:
+            js.started_at = _from_epoch(timing["started_at"])
+            js.finished_at = _from_epoch(timing["finished_at"])
+        else:
+            js.finished_at = _now()
         
         # Calculate and store step duration in metrics
         if js.started_at and js.finished_at:
@@ -56,6 +69,13 @@ def set_step_success(job_id: str, step: str):
             metrics["duration_seconds"] = duration_seconds
             metrics["started_at"] = js.started_at.isoformat() if js.started_at else None
             metrics["finished_at"] = js.finished_at.isoformat() if js.finished_at else None
+            if timing:
+                # Time actually spent in the stage (a chunked run interleaves stages)
+                metrics["duration_seconds"] = timing["wall_seconds"]
+                metrics["cpu_seconds"] = timing["cpu_seconds"]
+                metrics["peak_rss_mb"] = timing["peak_rss_mb"]
+                metrics["items"] = timing["items"]
+                metrics["timing_source"] = "external_ai"
             js.metrics = metrics
         
         db.session.commit()
@@ -81,6 +101,31 @@ def set_step_failed(job_id: str, step: str, error_msg: str):
         db.session.commit()
 
 
+def set_range_done(job_id: str, step: str, index: int, total: int):
+    """
+    Record that range `index` of `total` parallel ranges finished, as
+    metrics["ranges_done"] on the step and as (forward-only) job progress.
+    The step's own state is left to whoever ends it once every range is in.
+    """
+    from app.services.job_progress import PROGRESS_CAP
+
+    # Locked: sibling range tasks finish concurrently on other workers
+    js = JobStep.query.filter_by(job_id=job_id, name=step).with_for_update().first()
+    if js:
+        metrics = dict(js.metrics or {})
+        done = sorted(set(metrics.get("ranges_done") or []) | {index})
+        metrics["ranges_done"] = done
+        metrics["ranges_total"] = total
+        metrics["progress"] = round(100.0 * len(done) / total, 1)
+        js.metrics = metrics
+
+        job = Job.query.get(job_id)
+        progress = min(metrics["progress"], PROGRESS_CAP)
+        if job and (job.progress is None or progress > job.progress):
+            job.progress = progress
+    db.session.commit()
+
+
 def set_step_retry(job_id: str, step: str, error_msg: str):
     js = JobStep.query.filter_by(job_id=job_id, name=step).first()
     if js:
@@ -104,6 +149,28 @@ def set_step_retry(job_id: str, step: str, error_msg: str):
 # ---------------------------------------------------------------------
 # NEW DECORATOR (Option A compatible)
 # ---------------------------------------------------------------------
+def resolve_job_id(task, args, kwargs):
+    """Job id of a pipeline task call: from its payload, kwargs or chain metadata."""
+    job_id = None
+
+    # From payload dict
+    if args and isinstance(args[0], dict):
+        job_id = args[0].get("job_id")
+
+    # Passed explicitly (chunked / parallel range tasks)
+    if not job_id:
+        job_id = kwargs.get("job_id")
+
+    # From chain metadata (Celery)
+    if not job_id:
+        try:
+            job_id = task.request.chain[0]["args"][0]
+        except Exception:
+            pass
+
+    return job_id
+
+
 def pipeline_step(step_name: str, max_retries: int = 3, backoff_seconds: int = 10):
     """
     Option A aware:
@@ -115,22 +182,7 @@ def pipeline_step(step_name: str, max_retries: int = 3, backoff_seconds: int = 1
         @wraps(func)
         def wrapper(self, *args, **kwargs):
 
-            # ---------------------------------------------------------
-            # JOB ID extraction (new logic)
-            # ---------------------------------------------------------
-            job_id = None
-
-            # From payload dict
-            if args and isinstance(args[0], dict):
-                job_id = args[0].get("job_id")
-
-            # From chain metadata (Celery)
-            if not job_id:
-                try:
-                    job_id = self.request.chain[0]["args"][0]
-                except Exception:
-                    pass
-
+            job_id = resolve_job_id(self, args, kwargs)
             if not job_id:
                 raise RuntimeError(
                     f"pipeline_step could not resolve job_id for step '{step_name}'"
@@ -0,0 +1,76 @@
+"""Per-job checkpoint objects in MinIO (JSON records + artifact files)."""
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+from app.utils.minio_client import ensure_bucket, get_minio_client
+
+logger = logging.getLogger(__name__)
+
+
+class MinioCheckpointStore:
+    """
+    Objects live under s3://<bucket>/<prefix>/<name>. A missing object reads as
+    None, so callers can treat "not there" as "not done yet".
+    """
+
+    def __init__(self, bucket: str, prefix: str):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}/{name}"
+
+    def get_json(self, name: str):
+        from minio.error import S3Error
+
+        client = get_minio_client()
+        try:
+            resp = client.get_object(self.bucket, self._key(name))
+        except S3Error as exc:
+            if exc.code in ("NoSuchKey", "NoSuchBucket", "NoSuchObject"):
+                return None
+            raise
+        try:
+            return json.loads(resp.read())
+        finally:
+            resp.close()
+            resp.release_conn()
+
+    def put_json(self, name: str, value) -> None:
+        data = json.dumps(value).encode("utf-8")
+        ensure_bucket(self.bucket).put_object(
+            self.bucket,
+            self._key(name),
+            io.BytesIO(data),
+            length=len(data),
+            content_type="application/json",
+        )
+
+    def put_file(self, name: str, local_path: str) -> None:
+        ensure_bucket(self.bucket).fput_object(self.bucket, self._key(name), local_path)
+
+    def get_file(self, name: str, local_path: str) -> str:
+        get_minio_client().fget_object(self.bucket, self._key(name), local_path)
+        return local_path
+
+    def exists(self, name: str) -> bool:
+        from minio.error import S3Error
+
+        try:
+            get_minio_client().stat_object(self.bucket, self._key(name))
+            return True
+        except S3Error as exc:
+            if exc.code in ("NoSuchKey", "NoSuchBucket", "NoSuchObject"):
+                return False
+            raise
+
+    def clear(self) -> None:
+        client = get_minio_client()
+        if not client.bucket_exists(self.bucket):
+            return
+        for obj in client.list_objects(self.bucket, prefix=f"{self.prefix}/", recursive=True):
+            client.remove_object(self.bucket, obj.object_name)
+        logger.info("Cleared checkpoints s3://%s/%s/", self.bucket, self.prefix)
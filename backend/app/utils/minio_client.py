@@ -1,4 +1,5 @@
 # backend/app/utils/minio_client.py
+import hashlib
 import logging
 import os
 from datetime import timedelta
@@ -8,6 +9,10 @@ from minio import Minio
 
 logger = logging.getLogger(__name__)
 
+# Part size for streamed multipart uploads. MinIO holds one part in memory at a
+# time, so this is the upper bound on per-upload buffering (S3 minimum is 5 MiB).
+UPLOAD_PART_SIZE = max(int(os.getenv("UPLOAD_PART_SIZE_MB", "16")), 5) * 1024 * 1024
+
 
 def get_minio_client() -> Minio:
     endpoint = os.getenv("S3_ENDPOINT")
@@ -52,6 +57,66 @@ def upload_file(bucket: str, object_name: str, file_path: str) -> str:
     return f"s3://{bucket}/{object_name}"
 
 
+class HashingReader:
+    """Read-through wrapper that hashes and counts bytes as they are consumed."""
+
+    def __init__(self, stream, algorithm: str = "sha256"):
+        self._stream = stream
+        self._hash = hashlib.new(algorithm)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        if chunk:
+            self._hash.update(chunk)
+            self.bytes_read += len(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def upload_stream(
+    bucket: str,
+    object_name: str,
+    stream,
+    content_type: str = "application/octet-stream",
+    part_size: int | None = None,
+) -> dict:
+    """
+    Pipe a file-like object of unknown length straight into a MinIO multipart
+    upload, computing its SHA-256 on the way through.
+
+    Returns {"uri", "sha256", "size"}.
+    """
+    client = ensure_bucket(bucket)
+    reader = HashingReader(stream)
+
+    logger.info(f"Streaming {object_name} to bucket {bucket} (ctype={content_type})")
+
+    client.put_object(
+        bucket,
+        object_name,
+        reader,
+        length=-1,
+        content_type=content_type,
+        part_size=part_size or UPLOAD_PART_SIZE,
+        num_parallel_uploads=1,
+    )
+
+    return {
+        "uri": f"s3://{bucket}/{object_name}",
+        "sha256": reader.hexdigest(),
+        "size": reader.bytes_read,
+    }
+
+
+def remove_object(bucket: str, object_name: str) -> None:
+    client = get_minio_client()
+    logger.info("Removing %s from bucket %s", object_name, bucket)
+    client.remove_object(bucket, object_name)
+
+
 def download_file(bucket: str, object_name: str, file_path: str) -> str:
     client = get_minio_client()
     logger.info("Downloading %s from bucket %s -> %s", object_name, bucket, file_path)
@@ -59,7 +124,8 @@ def download_file(bucket: str, object_name: str, file_path: str) -> str:
     return file_path
 
 
-def presign_url(bucket, object_name, expires_in=3600, extra_headers=None):
+def _public_client() -> Minio:
+    """Client signing against PUBLIC_MINIO_HOST when set, so browsers can use the URLs."""
     public_host = os.getenv("PUBLIC_MINIO_HOST")
     if public_host:
         parsed = urlparse(public_host)
@@ -67,9 +133,12 @@ def presign_url(bucket, object_name, expires_in=3600, extra_headers=None):
         secure = parsed.scheme == "https"
         access_key = os.getenv("S3_ACCESS_KEY")
         secret_key = os.getenv("S3_SECRET_KEY")
-        client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
-    else:
-        client = get_minio_client()
+        return Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+    return get_minio_client()
+
+
+def presign_url(bucket, object_name, expires_in=3600, extra_headers=None):
+    client = _public_client()
 
     return client.presigned_get_object(
         bucket,
@@ -79,3 +148,39 @@ def presign_url(bucket, object_name, expires_in=3600, extra_headers=None):
     )
 
 
+def presign_put_url(bucket: str, object_name: str, expires_in: int = 3600) -> str:
+    """Presigned PUT so clients can upload directly to MinIO (single PUT, up to 5 GiB)."""
+    ensure_bucket(bucket)
+    client = _public_client()
+    return client.presigned_put_object(
+        bucket,
+        object_name,
+        expires=timedelta(seconds=expires_in),
+    )
+
+
+def stat_object(bucket: str, object_name: str):
+    """HEAD an object. Returns the minio Object (size, etag, content_type) or None if missing."""
+    from minio.error import S3Error
+
+    client = get_minio_client()
+    try:
+        return client.stat_object(bucket, object_name)
+    except S3Error as exc:
+        if exc.code in ("NoSuchKey", "NoSuchBucket", "NoSuchObject"):
+            return None
+        raise
+
+
+def object_sha256(bucket: str, object_name: str) -> str:
+    """SHA-256 of a stored object, streamed through in UPLOAD_PART_SIZE chunks."""
+    client = get_minio_client()
+    digest = hashlib.sha256()
+    response = client.get_object(bucket, object_name)
+    try:
+        for chunk in response.stream(UPLOAD_PART_SIZE):
+            digest.update(chunk)
+    finally:
+        response.close()
+        response.release_conn()
+    return digest.hexdigest()
@@ -0,0 +1,188 @@
+"""
+Resumable, parallel HTTP downloads (used for external_ai /files).
+
+The file is split into byte ranges fetched concurrently with `Range` +
+`If-Range`, written in place, and verified against the server's
+`Digest: sha-256=` header. Progress is kept in a `<dest>.parts.json`
+sidecar, so a dropped connection resumes where it stopped, both within
+this call (retries with backoff) and in a later task retry that downloads
+to the same path.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_PARALLEL = int(os.getenv("DOWNLOAD_PARALLEL", "4"))
+DOWNLOAD_PART_SIZE = max(int(os.getenv("DOWNLOAD_PART_SIZE_MB", "64")), 1) * 1024 * 1024
+DOWNLOAD_RETRIES = int(os.getenv("DOWNLOAD_RETRIES", "5"))
+CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadError(Exception):
+    """The download could not be completed or failed verification."""
+
+
+def _probe(url: str, params, timeout: float) -> dict:
+    resp = requests.head(url, params=params, headers={"Want-Digest": "sha-256"}, timeout=timeout)
+    if resp.status_code != 200:
+        raise DownloadError(f"HEAD {url} → {resp.status_code}")
+    sha256 = None
+    for item in resp.headers.get("Digest", "").split(","):
+        algo, _, value = item.strip().partition("=")
+        if algo.lower() == "sha-256" and value:
+            sha256 = base64.b64decode(value).hex()
+    length = resp.headers.get("Content-Length")
+    return {
+        "size": int(length) if length is not None else None,
+        "etag": resp.headers.get("ETag"),
+        "ranges": resp.headers.get("Accept-Ranges", "").lower() == "bytes",
+        "sha256": sha256,
+    }
+
+
+def _plan_parts(size: int, part_size: int) -> list[dict]:
+    return [
+        {"start": start, "end": min(start + part_size, size) - 1, "done": 0}
+        for start in range(0, size, part_size)
+    ] or [{"start": 0, "end": -1, "done": 0}]
+
+
+class _Progress:
+    """Sidecar with per-part progress; written under a lock as parts advance."""
+
+    def __init__(self, path: Path, doc: dict):
+        self.path = path
+        self.doc = doc
+        self._lock = threading.Lock()
+
+    def save(self):
+        with self._lock:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.doc))
+            os.replace(tmp, self.path)
+
+
+def _fetch_part(url, params, dest: Path, part: dict, etag, progress: _Progress, retries: int, timeout: float):
+    for attempt in range(retries + 1):
+        begin = part["start"] + part["done"]
+        if begin > part["end"]:
+            return
+        headers = {"Range": f"bytes={begin}-{part['end']}"}
+        if etag:
+            headers["If-Range"] = etag
+        try:
+            with requests.get(url, params=params, headers=headers, stream=True, timeout=timeout) as resp:
+                if resp.status_code != 206:
+                    # If-Range failed (file replaced) or ranges unsupported
+                    raise DownloadError(f"Range request answered {resp.status_code}")
+                with open(dest, "r+b") as fh:
+                    fh.seek(begin)
+                    for i, chunk in enumerate(resp.iter_content(CHUNK_SIZE)):
+                        fh.write(chunk)
+                        part["done"] += len(chunk)
+                        if i % 8 == 7:
+                            fh.flush()
+                            progress.save()
+            if part["start"] + part["done"] > part["end"]:
+                return
+            raise requests.ConnectionError("Range response ended early")
+        except requests.RequestException as exc:
+            progress.save()
+            if attempt == retries:
+                raise DownloadError(f"bytes {begin}-{part['end']} failed after {attempt + 1} attempts: {exc}") from exc
+            wait = 2 ** attempt
+            logger.warning("Range %d-%d failed (%s); resuming in %ds", begin, part["end"], exc, wait)
+            time.sleep(wait)
+
+
+def _stream_whole(url, params, dest: Path, timeout: float):
+    with requests.get(url, params=params, stream=True, timeout=timeout) as resp:
+        if resp.status_code != 200:
+            raise DownloadError(f"GET {url} → {resp.status_code}: {resp.text}")
+        with open(dest, "wb") as fh:
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                if chunk:
+                    fh.write(chunk)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download_resumable(
+    url: str,
+    dest: str,
+    params: dict | None = None,
+    parallel: int | None = None,
+    part_size: int | None = None,
+    retries: int | None = None,
+    timeout: float = 60.0,
+) -> dict:
+    """
+    Download `url` to `dest`. Returns {"path", "size", "sha256", "resumed_bytes"}.
+
+    Raises DownloadError when retries run out or the result doesn't match
+    the server's digest (the partial file is discarded in that case).
+    """
+    parallel = parallel or DOWNLOAD_PARALLEL
+    part_size = part_size or DOWNLOAD_PART_SIZE
+    retries = DOWNLOAD_RETRIES if retries is None else retries
+
+    dest_path = Path(dest)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    sidecar = dest_path.with_name(dest_path.name + ".parts.json")
+
+    info = _probe(url, params, timeout)
+    resumed = 0
+    if info["ranges"] and info["size"] is not None:
+        doc = None
+        if sidecar.exists() and dest_path.exists():
+            saved = json.loads(sidecar.read_text())
+            # Only resume bytes of the very same file version
+            if saved.get("etag") == info["etag"] and saved.get("size") == info["size"] and info["etag"]:
+                doc = saved
+                resumed = sum(p["done"] for p in doc["parts"])
+        if doc is None:
+            doc = {"etag": info["etag"], "size": info["size"], "parts": _plan_parts(info["size"], part_size)}
+            with open(dest_path, "wb") as fh:
+                fh.truncate(info["size"])
+        progress = _Progress(sidecar, doc)
+        progress.save()
+
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+            futures = [
+                pool.submit(_fetch_part, url, params, dest_path, part, info["etag"], progress, retries, timeout)
+                for part in doc["parts"]
+            ]
+            for fut in futures:
+                fut.result()
+    else:
+        _stream_whole(url, params, dest_path, timeout)
+
+    size = dest_path.stat().st_size
+    sha256 = _sha256(dest_path)
+    if (info["size"] is not None and size != info["size"]) or (info["sha256"] and sha256 != info["sha256"]):
+        dest_path.unlink(missing_ok=True)
+        sidecar.unlink(missing_ok=True)
+        raise DownloadError(f"Downloaded {url} failed verification (size {size}, sha256 {sha256})")
+
+    sidecar.unlink(missing_ok=True)
+    if resumed:
+        logger.info("Resumed download of %s with %d bytes already on disk", dest, resumed)
+    return {"path": str(dest_path), "size": size, "sha256": sha256, "resumed_bytes": resumed}
@@ -0,0 +1,182 @@
+"""
+Benchmark: job list search over a seeded table of 500k jobs.
+
+Seeds app_user / asset / job in a scratch schema (bench_job_search) of the
+Postgres at SQLALCHEMY_DATABASE_URI / DATABASE_URL, then times one /admin
+search page (50 rows, newest first) for a few kinds of search term:
+  • old:          the previous filter, lower(cast(...)) LIKE '%term%' on job
+                  id, email and asset.meta->'original_name', OR'ed across
+                  the joins
+  • new, no idx:  _job_search_filter() without its indexes
+  • new:          _job_search_filter() with idx_job_id_text and the pg_trgm
+                  GIN indexes on asset.original_name / app_user.email
+The schema is dropped afterwards unless --keep is given.
+
+Usage (from backend/):
+    python benchmarks/bench_job_search.py
+    python benchmarks/bench_job_search.py --jobs 100000 --repeat 5 --keep
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+SCHEMA = "bench_job_search"
+SUBJECTS = ["biology", "chemistry", "physics", "history", "geography", "mathematics", "kiswahili", "literature"]
+NEW_INDEXES = ("idx_job_id_text", "idx_asset_original_name_trgm", "idx_app_user_email_trgm")
+
+
+def seed(db, jobs: int, users: int):
+    from sqlalchemy import text
+
+    subjects = "ARRAY[" + ",".join(f"'{s}'" for s in SUBJECTS) + "]"
+    db.session.execute(
+        text(
+            "INSERT INTO app_user (id, email, password_hash, role) "
+            "SELECT md5('user' || g)::uuid, 'user' || g || '@school' || (g % 37) || '.ac.ke', 'x', 'creator' "
+            "FROM generate_series(0, :users - 1) g"
+        ),
+        {"users": users},
+    )
+    db.session.execute(
+        text(
+            "INSERT INTO asset (id, owner_id, kind, uri, original_name, meta) "
+            "SELECT md5('asset' || g)::uuid, md5('user' || (g % :users))::uuid, 'video', 's3://uploads/' || name, "
+            "       name, json_build_object('original_name', name) "
+            f"FROM (SELECT g, 'lecture_' || g || '_' || ({subjects})[1 + g % {len(SUBJECTS)}] || '.mp4' AS name "
+            "      FROM generate_series(1, :jobs) g) s"
+        ),
+        {"jobs": jobs, "users": users},
+    )
+    db.session.execute(
+        text(
+            "INSERT INTO job (id, owner_id, input_asset_id, state, meta, retry_count, created_at) "
+            "SELECT gen_random_uuid(), md5('user' || (g % :users))::uuid, md5('asset' || g)::uuid, 'succeeded'::job_status, "
+            "       '{}'::jsonb, 0, now() - g * interval '1 minute' "
+            "FROM generate_series(1, :jobs) g"
+        ),
+        {"jobs": jobs, "users": users},
+    )
+    db.session.commit()
+
+
+def old_filter(search: str):
+    from app.database import db
+    from app.models.models import AppUser, Asset, Job
+
+    search_like = f"%{search.lower()}%"
+    return db.or_(
+        db.func.lower(db.func.cast(Job.id, db.Text)).like(search_like),
+        db.func.lower(AppUser.email).like(search_like),
+        db.func.lower(db.func.coalesce(db.func.cast(Asset.meta["original_name"], db.Text), "")).like(search_like),
+    )
+
+
+def time_page(db, make_filter, search: str, repeat: int) -> float:
+    from app.models.models import Job
+    from app.routes.job_routes import _job_brief_query
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        (
+            _job_brief_query()
+            .filter(make_filter(search))
+            .order_by(Job.created_at.desc(), Job.id.desc())
+            .limit(50)
+            .all()
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.rollback()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded schema")
+    args = parser.parse_args()
+
+    from sqlalchemy import text
+
+    from app import create_app
+    from app.database import db
+    from app.models.models import Job
+    from app.routes.job_routes import _job_search_filter
+
+    app = create_app(
+        {
+            "SQLALCHEMY_ENGINE_OPTIONS": {
+                "connect_args": {"options": f"-csearch_path={SCHEMA},public"},
+            },
+        }
+    )
+    if not app.config["SQLALCHEMY_DATABASE_URI"].startswith("postgresql"):
+        sys.exit("bench_job_search needs Postgres (SQLALCHEMY_DATABASE_URI / DATABASE_URL)")
+
+    with app.app_context():
+        db.session.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        db.session.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public"))
+        db.session.commit()
+        try:
+            db.create_all()
+            indexes = {ix.name: ix for table in db.metadata.tables.values() for ix in table.indexes}
+            for name in NEW_INDEXES:
+                db.session.execute(text(f"DROP INDEX {name}"))
+            db.session.commit()
+
+            start = time.perf_counter()
+            seed(db, args.jobs, args.users)
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+            print(f"Seeded {args.jobs:,} jobs / {args.users:,} users in {time.perf_counter() - start:.1f}s")
+
+            job_id = str(db.session.query(Job.id).order_by(Job.created_at.desc()).offset(args.jobs // 2).limit(1).scalar())
+            terms = {
+                "job id prefix": job_id[:8],
+                "common filename": "chemistry",
+                "rare filename": f"lecture_{args.jobs // 3}_",
+                "owner email": f"user{args.users // 2}@",
+                "no match": "no-such-lecture",
+            }
+            admin_filter = partial(_job_search_filter, owner_email=True)
+
+            results = {}
+            for label, term in terms.items():
+                results[label] = [
+                    time_page(db, old_filter, term, args.repeat),
+                    time_page(db, admin_filter, term, args.repeat),
+                ]
+
+            start = time.perf_counter()
+            for name in NEW_INDEXES:
+                indexes[name].create(db.session.connection())
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+            print(f"Built search indexes in {time.perf_counter() - start:.1f}s")
+
+            for label, term in terms.items():
+                results[label].append(time_page(db, admin_filter, term, args.repeat))
+
+            print(f"\nMedian ms per 50-row /admin search page ({args.repeat} runs)")
+            print(f"{'search':<18} {'term':<22} {'old':>10} {'new, no idx':>12} {'new':>10}")
+            for label, term in terms.items():
+                old, unindexed, indexed = results[label]
+                print(f"{label:<18} {term:<22} {old:>10.1f} {unindexed:>12.1f} {indexed:>10.1f}")
+        finally:
+            db.session.rollback()
+            if not args.keep:
+                db.session.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
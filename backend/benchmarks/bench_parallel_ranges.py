@@ -0,0 +1,189 @@
+"""
+Benchmark: parallel range dubbing — wall time vs number of workers.
+
+Runs the parallel-mode task bodies (ChunkRunner.load_plan → run_chunk per
+range → stitch) against fake external_ai instances served over real HTTP.
+Each fake instance owns one "GPU": /full holds a per-instance lock and sleeps
+`range seconds × --rtf`, so an instance dubs one range at a time like the
+real server. Ranges are dealt round-robin over the instances exactly as
+task_dub_range does with EXTERNAL_AI_URLS.
+
+Celery itself is not involved: N threads stand in for N workers pulling
+ranges off the chord header, which is what the broker would do.
+
+Usage (from backend/):
+    python benchmarks/bench_parallel_ranges.py --duration 5400 --workers 1,2,4,8
+    python benchmarks/bench_parallel_ranges.py --duration 3600 --range 300 --rtf 0.002
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.external_ai import ExternalAIClient  # noqa: E402
+from app.tasks.chunked_pipeline import ChunkRunner  # noqa: E402
+
+
+def make_fake_external_ai(duration: float, rtf: float, stitch_seconds: float) -> Flask:
+    app = Flask("fake_external_ai")
+    gpu = threading.Lock()
+    sources = set()
+
+    @app.post("/sources")
+    def sources_post():
+        source_id = hashlib.sha256(request.files["video"].read()).hexdigest()
+        sources.add(source_id)
+        return jsonify({"source_id": source_id, "duration": duration})
+
+    @app.delete("/sources/<source_id>")
+    def sources_delete(source_id):
+        sources.discard(source_id)
+        return jsonify({"status": "ok"})
+
+    @app.post("/chunks/plan")
+    def plan():
+        target = float(request.get_json()["target_seconds"])
+        bounds = [0.0]
+        while duration - bounds[-1] > target * 1.25:
+            bounds.append(bounds[-1] + target)
+        bounds.append(duration)
+        chunks = [
+            {"index": i, "start": bounds[i], "end": bounds[i + 1]} for i in range(len(bounds) - 1)
+        ]
+        return jsonify({"chunks": chunks})
+
+    @app.post("/full")
+    def full():
+        data = request.get_json()
+        if data["source_id"] not in sources:
+            return jsonify({"error": "unknown", "code": "source_missing"}), 404
+        with gpu:
+            time.sleep((data["end"] - data["start"]) * rtf)
+        i = int(data["start"])
+        return jsonify(
+            {
+                "status": "success",
+                "output": f"outputs/chunks/{i}.m4a",
+                "english": "text",
+                "swahili": "maandishi",
+                "english_segments": [{"text": "text", "start": 0.0, "end": 1.0}],
+                "swahili_segments": [{"text": "maandishi", "start": 0.0, "end": 1.0}],
+            }
+        )
+
+    @app.get("/files")
+    def files():
+        return b"\0" * 4096
+
+    @app.post("/stitch")
+    def stitch():
+        if request.form["source_id"] not in sources:
+            return jsonify({"error": "unknown", "code": "source_missing"}), 404
+        time.sleep(stitch_seconds)
+        return jsonify({"status": "success", "output": f"outputs/demo_videos/{request.form['output_name']}.mp4"})
+
+    return app
+
+
+class MemoryStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.json = {}
+        self.files = {}
+
+    def get_json(self, name):
+        with self.lock:
+            return self.json.get(name)
+
+    def put_json(self, name, value):
+        with self.lock:
+            self.json[name] = value
+
+    def put_file(self, name, local_path):
+        data = Path(local_path).read_bytes()
+        with self.lock:
+            self.files[name] = data
+
+    def get_file(self, name, local_path):
+        Path(local_path).write_bytes(self.files[name])
+        return local_path
+
+
+def serve(app: Flask) -> tuple[str, object]:
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def run_once(workers: int, args, tmp: Path) -> dict:
+    instances = [serve(make_fake_external_ai(args.duration, args.rtf, args.stitch)) for _ in range(workers)]
+    urls = [url for url, _ in instances]
+    store = MemoryStore()
+    source = tmp / "lecture.mp4"
+    source.write_bytes(b"lecture" * 1024)
+
+    def runner(url: str, name: str) -> ChunkRunner:
+        return ChunkRunner(
+            "s3://uploads/bench/lecture.mp4",
+            ExternalAIClient(url),
+            store,
+            fetch_source=lambda uri: str(source),
+            workdir=str(tmp / f"w{workers}" / name),
+        )
+
+    start = time.perf_counter()
+    plan = runner(urls[0], "dispatch").load_plan(args.range)
+
+    def dub(chunk):
+        # task_dub_range: its own runner, instance picked round-robin
+        r = runner(urls[chunk["index"] % len(urls)], f"range{chunk['index']}")
+        r.load_plan()
+        return r.run_chunk(chunk)[0]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        records = list(pool.map(dub, plan["chunks"]))
+
+    stitcher = runner(urls[0], "stitch")
+    stitcher.load_plan()
+    stitcher.stitch(records, "parallel_bench")
+    elapsed = time.perf_counter() - start
+
+    for _, server in instances:
+        server.shutdown()
+    return {"workers": workers, "ranges": len(plan["chunks"]), "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5400, help="lecture length in seconds")
+    parser.add_argument("--range", type=float, default=300, help="PARALLEL_RANGE_SECONDS")
+    parser.add_argument("--rtf", type=float, default=0.001, help="fake dubbing time per media second")
+    parser.add_argument("--stitch", type=float, default=0.2, help="fake stitch+mux seconds")
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in [int(w) for w in args.workers.split(",")]:
+            results.append(run_once(workers, args, Path(tmp)))
+
+    base = results[0]["seconds"]
+    print(f"{'workers':>8} {'ranges':>7} {'wall s':>8} {'speedup':>8}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['ranges']:>7} {r['seconds']:>8.2f} {base / r['seconds']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: /api/jobs/status/<id> payload for a finished 2-hour lecture.
+
+Builds the meta a chunked 2-hour job ends up with (English/Swahili text,
+timestamped segments for both, per-chunk pipeline_metrics). It then compares
+  • full:    what /status returned before fields= (all of job.meta)
+  • default: /status meta without transcripts and pipeline_metrics
+  • minimal: ?fields=state,progress,current_step,steps (what a progress
+             panel needs)
+and reports the JSON size and the serialise+dumps time per request.
+
+No database is needed. Usage (from backend/):
+    python benchmarks/bench_status_payload.py
+    python benchmarks/bench_status_payload.py --minutes 180 --repeat 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.routes.job_routes import _safe_serialize, _status_meta  # noqa: E402
+
+WORDS = "the lecture covers photosynthesis energy cells light water carbon plants students today".split()
+SWAHILI = "mhadhara unahusu usanisinuru nishati seli mwanga maji kaboni mimea wanafunzi leo".split()
+
+
+def lecture_meta(minutes: int, seconds_per_segment: float = 4.0, chunk_minutes: int = 5) -> dict:
+    rng = random.Random(0)
+    english_segments, swahili_segments = [], []
+    t = 0.0
+    while t < minutes * 60:
+        end = t + seconds_per_segment
+        english_segments.append({"text": " ".join(rng.choices(WORDS, k=11)), "start": round(t, 2), "end": round(end, 2)})
+        swahili_segments.append({"text": " ".join(rng.choices(SWAHILI, k=10)), "start": round(t, 2), "end": round(end, 2)})
+        t = end
+    stages = {
+        name: {"wall_seconds": 12.3, "cpu_seconds": 40.1, "peak_rss_mb": 2048.0, "items": 75, "calls": 1}
+        for name in ("asr", "punctuation", "mt", "tts", "separation", "mix", "mux")
+    }
+    return {
+        "pipeline": "local_dubbing",
+        "task_id": "3f9c2b1e-0000-0000-0000-000000000000",
+        "output_s3_uri": "s3://outputs/lecture_dubbed.mp4",
+        "english": " ".join(s["text"] for s in english_segments),
+        "swahili": " ".join(s["text"] for s in swahili_segments),
+        "english_segments": english_segments,
+        "swahili_segments": swahili_segments,
+        "pipeline_metrics": {
+            "chunks": [{"index": i, "metrics": {"stages": stages}} for i in range(minutes // chunk_minutes)],
+        },
+        "text_metrics": {"english_word_count": 11 * len(english_segments), "swahili_word_count": 10 * len(swahili_segments)},
+    }
+
+
+def steps() -> list[dict]:
+    return [
+        {"name": name, "state": "succeeded", "progress": 100.0, "started_at": None, "finished_at": None}
+        for name in ("asr", "punctuate", "translate", "tts", "separate_music", "mix", "replace_audio")
+    ]
+
+
+def measure(build, repeat: int) -> tuple[int, float]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = json.dumps(build())
+    return len(body.encode()), (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    job = SimpleNamespace(meta=lecture_meta(args.minutes), progress=100.0, current_step="completed")
+    base = {"id": "3f9c2b1e", "state": "completed", "steps": steps()}
+    modes = {
+        "full": lambda: {**base, "meta": _safe_serialize(dict(job.meta))},
+        "default": lambda: {**base, "meta": _status_meta(job)},
+        "minimal": lambda: {**base, "progress": job.progress, "current_step": job.current_step},
+    }
+
+    segments = len(job.meta["english_segments"])
+    print(f"{args.minutes}-minute lecture, {segments} segments per language, {args.repeat} runs per mode")
+    print(f"{'mode':<10} {'bytes':>12} {'ms/request':>12}")
+    for mode, build in modes.items():
+        size, ms = measure(build, args.repeat)
+        print(f"{mode:<10} {size:>12,} {ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
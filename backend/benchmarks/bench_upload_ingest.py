@@ -0,0 +1,127 @@
+"""
+Benchmark: job upload ingest — temp-file round trip vs streaming multipart.
+
+Compares the two paths used by /api/jobs/create:
+  • tempfile: request body → JOB_UPLOAD_TMP (file.save) → fput_object
+  • stream:   request body → upload_stream (put_object, length=-1) + SHA-256
+
+Each mode runs in a fresh child process so peak RSS (ru_maxrss) is measured
+per mode. By default a null MinIO client is used that consumes the bytes the
+same way the real client does (part-sized reads) and discards them; pass
+--minio to talk to the MinIO at S3_ENDPOINT instead.
+
+Usage (from backend/):
+    python benchmarks/bench_upload_ingest.py --size-mb 2048
+    python benchmarks/bench_upload_ingest.py --size-mb 512 --minio
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+CHUNK = 64 * 1024
+
+
+class SyntheticBody:
+    """File-like request body that yields `size` bytes without holding them."""
+
+    def __init__(self, size: int):
+        self.remaining = size
+        self._block = os.urandom(CHUNK)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0:
+            size = self.remaining
+        out = bytearray()
+        while len(out) < size and self.remaining > 0:
+            take = min(CHUNK, size - len(out), self.remaining)
+            out += self._block[:take]
+            self.remaining -= take
+        return bytes(out)
+
+
+class NullMinio:
+    """Consumes uploads part by part, like minio.Minio, and drops the bytes."""
+
+    def put_object(self, bucket, object_name, data, length, part_size=0, **kwargs):
+        part_size = part_size or 16 * 1024 * 1024
+        while True:
+            part = data.read(part_size)
+            if not part:
+                break
+
+    def fput_object(self, bucket, object_name, file_path, **kwargs):
+        with open(file_path, "rb") as fh:
+            self.put_object(bucket, object_name, fh, -1)
+
+
+def _run_mode(mode: str, size: int, use_minio: bool, queue):
+    from app.utils import minio_client
+
+    if not use_minio:
+        minio_client.ensure_bucket = lambda bucket: NullMinio()
+
+    bucket = os.getenv("S3_BUCKET_UPLOADS", "uploads")
+    object_name = f"bench/{uuid.uuid4()}_{mode}.bin"
+    body = SyntheticBody(size)
+
+    start = time.perf_counter()
+    if mode == "tempfile":
+        tmp_dir = Path(os.getenv("JOB_UPLOAD_TMP", tempfile.gettempdir()))
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = tmp_dir / f"{uuid.uuid4()}_bench.bin"
+        with open(temp_path, "wb") as fh:
+            while True:
+                chunk = body.read(CHUNK)
+                if not chunk:
+                    break
+                fh.write(chunk)
+        minio_client.upload_file(bucket, object_name, str(temp_path))
+        temp_path.unlink()
+    else:
+        minio_client.upload_stream(bucket, object_name, body)
+    elapsed = time.perf_counter() - start
+
+    if use_minio:
+        minio_client.remove_object(bucket, object_name)
+
+    # ru_maxrss is KiB on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((mode, elapsed, peak_rss_mb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--minio", action="store_true", help="upload to the real MinIO at S3_ENDPOINT")
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+
+    print(f"Ingesting {args.size_mb} MiB per mode ({'minio' if args.minio else 'null client'})")
+    print(f"{'mode':<10} {'wall_s':>10} {'MiB/s':>10} {'peak_rss_mb':>12}")
+    for mode in ("tempfile", "stream"):
+        proc = ctx.Process(target=_run_mode, args=(mode, size, args.minio, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            print(f"{mode:<10} failed (exit code {proc.exitcode})")
+            continue
+        name, elapsed, rss = queue.get()
+        print(f"{name:<10} {elapsed:>10.2f} {args.size_mb / elapsed:>10.1f} {rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config
+from sqlalchemy import pool
+from app.database import db  # Import your SQLAlchemy instance
+
+from app import create_app
+from alembic import context
+from app.models import models  # Import your models to ensure they are registered with SQLAlchemy
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+config_file = config.config_file_name
+if config_file and os.path.exists(config_file):
+    fileConfig(config_file)
+else:
+    alt = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "alembic.ini"))
+    if os.path.exists(alt):
+        fileConfig(alt)
+    # else: proceed without logging config
+
+# Interpret the config file for Python logging.
+# This line sets up loggers basically.
+# if config.config_file_name is not None:
+#     fileConfig(config.config_file_name)
+
+# Force Alembic to use the correct config file location
+# config_path = os.path.join(os.path.dirname(__file__), "..", "alembic.ini")
+# config_path = os.path.abspath(config_path)
+# if os.path.exists(config_path):
+#     fileConfig(config_path)
+# else:
+#     print(f"⚠️ Alembic config not found at {config_path}, skipping fileConfig()")
+
+# add your model's MetaData object here
+# for 'autogenerate' support
+# from myapp import mymodel
+# target_metadata = mymodel.Base.metadata
+app = create_app()
+with app.app_context():
+    target_metadata = db.metadata  # Assuming 'db' is imported from your app's database module
+
+# other values from the config, defined by the needs of env.py,
+# can be acquired:
+# my_important_option = config.get_main_option("my_important_option")
+# ... etc.
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode.
+
+    This configures the context with just a URL
+    and not an Engine, though an Engine is acceptable
+    here as well.  By skipping the Engine creation
+    we don't even need a DBAPI to be available.
+
+    Calls to context.execute() here emit the given string to the
+    script output.
+
+    """
+    url = config.get_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+
+    """
+
+    configuration = config.get_section(config.config_ini_section, {})
+    configuration["sqlalchemy.url"] = os.getenv("DATABASE_URL")
+    connectable = engine_from_config(
+        configuration,
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
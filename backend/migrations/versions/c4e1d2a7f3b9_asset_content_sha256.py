@@ -0,0 +1,30 @@
+"""Add asset.content_sha256 for upload dedup
+
+Revision ID: c4e1d2a7f3b9
+Revises: 5b96d18ea5bf
+Create Date: 2026-10-16 09:12:41.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1d2a7f3b9'
+down_revision: Union[str, Sequence[str], None] = '5b96d18ea5bf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('asset', sa.Column('content_sha256', sa.Text(), nullable=True))
+    op.create_index('idx_asset_content_sha256', 'asset', ['content_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_asset_content_sha256', table_name='asset')
+    op.drop_column('asset', 'content_sha256')
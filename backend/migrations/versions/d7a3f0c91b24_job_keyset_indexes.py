@@ -0,0 +1,32 @@
+"""Composite (created_at, id) indexes for keyset pagination of job lists
+
+Revision ID: d7a3f0c91b24
+Revises: c4e1d2a7f3b9
+Create Date: 2026-10-16 14:03:27.550912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f0c91b24'
+down_revision: Union[str, Sequence[str], None] = 'c4e1d2a7f3b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # idx_job_created_id covers everything idx_job_created did
+    op.create_index('idx_job_created_id', 'job', ['created_at', 'id'], unique=False)
+    op.create_index('idx_job_owner_created_id', 'job', ['owner_id', 'created_at', 'id'], unique=False)
+    op.drop_index('idx_job_created', table_name='job')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_job_created', 'job', ['created_at'], unique=False)
+    op.drop_index('idx_job_owner_created_id', table_name='job')
+    op.drop_index('idx_job_created_id', table_name='job')
@@ -0,0 +1,44 @@
+"""Indexed job search: asset.original_name, pg_trgm indexes, job id prefix index
+
+Revision ID: e5b8c2d4a6f1
+Revises: d7a3f0c91b24
+Create Date: 2026-10-16 15:21:08.104377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8c2d4a6f1'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f0c91b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('asset', sa.Column('original_name', sa.Text(), nullable=True))
+    op.execute("UPDATE asset SET original_name = meta->>'original_name' WHERE meta->>'original_name' IS NOT NULL")
+
+    op.create_index(
+        'idx_asset_original_name_trgm', 'asset', ['original_name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'original_name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_app_user_email_trgm', 'app_user', ['email'], unique=False,
+        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+    )
+    op.execute("CREATE INDEX idx_job_id_text ON job ((id::text) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_id_text', table_name='job')
+    op.drop_index('idx_app_user_email_trgm', table_name='app_user')
+    op.drop_index('idx_asset_original_name_trgm', table_name='asset')
+    op.drop_column('asset', 'original_name')
@@ -0,0 +1,135 @@
+"""Move job transcripts out of job.meta into transcript_segment
+
+Revision ID: f2c6d8e0b3a7
+Revises: e5b8c2d4a6f1
+Create Date: 2026-10-17 10:42:55.907311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8e0b3a7'
+down_revision: Union[str, Sequence[str], None] = 'e5b8c2d4a6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Jobs moved per statement during the backfill
+BATCH_SIZE = 200
+
+LEGACY_KEYS = "'{english,swahili,english_segments,swahili_segments}'::text[]"
+
+# Rows for a batch of jobs: each language's full text at seq -1, then its
+# *_segments array from seq 0
+SEGMENT_ROWS = """
+    SELECT j.id, l.lang, -1, NULL::float, NULL::float, j.meta->>l.prefix
+    FROM job j
+    CROSS JOIN (VALUES ('en', 'english'), ('sw', 'swahili')) AS l(lang, prefix)
+    WHERE j.id = ANY(:ids) AND coalesce(btrim(j.meta->>l.prefix), '') <> ''
+    UNION ALL
+    SELECT j.id, l.lang, s.ord - 1, (s.seg->>'start')::float, (s.seg->>'end')::float, btrim(s.seg->>'text')
+    FROM job j
+    CROSS JOIN (VALUES ('en', 'english'), ('sw', 'swahili')) AS l(lang, prefix)
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE
+            WHEN jsonb_typeof(j.meta->(l.prefix || '_segments')) = 'array'
+                THEN j.meta->(l.prefix || '_segments')
+            ELSE '[]'::jsonb
+        END
+    ) WITH ORDINALITY AS s(seg, ord)
+    WHERE j.id = ANY(:ids) AND jsonb_typeof(s.seg) = 'object' AND coalesce(btrim(s.seg->>'text'), '') <> ''
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'transcript_segment',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('job_id', sa.UUID(), nullable=False),
+        sa.Column('lang', sa.Text(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('start_sec', sa.Float(), nullable=True),
+        sa.Column('end_sec', sa.Float(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'lang', 'seq', name='uq_transcript_segment_job_lang_seq'),
+    )
+
+    # Backfill in batches of jobs, walking job ids in order, so no statement
+    # has to hold every transcript at once
+    conn = op.get_bind()
+    ids_param = sa.bindparam('ids', type_=postgresql.ARRAY(sa.UUID()))
+    after = None
+    while True:
+        ids = conn.execute(
+            sa.text(
+                "SELECT id FROM job WHERE meta ?| " + LEGACY_KEYS
+                + (" AND id > :after" if after else "") + " ORDER BY id LIMIT :limit"
+            ),
+            {"after": after, "limit": BATCH_SIZE} if after else {"limit": BATCH_SIZE},
+        ).scalars().all()
+        if not ids:
+            break
+        conn.execute(
+            sa.text(
+                "INSERT INTO transcript_segment (job_id, lang, seq, start_sec, end_sec, text) " + SEGMENT_ROWS
+            ).bindparams(ids_param),
+            {"ids": ids},
+        )
+        conn.execute(
+            sa.text(
+                """
+                UPDATE job j SET meta = (j.meta - """ + LEGACY_KEYS + """) || CASE WHEN c.total > 0 THEN
+                    jsonb_build_object('transcript', jsonb_build_object(
+                        'store', 'transcript_segment',
+                        'english_segments', c.en,
+                        'swahili_segments', c.sw))
+                    ELSE '{}'::jsonb END
+                FROM (
+                    SELECT j2.id,
+                           count(t.id) AS total,
+                           count(t.id) FILTER (WHERE t.lang = 'en' AND t.seq >= 0) AS en,
+                           count(t.id) FILTER (WHERE t.lang = 'sw' AND t.seq >= 0) AS sw
+                    FROM job j2 LEFT JOIN transcript_segment t ON t.job_id = j2.id
+                    WHERE j2.id = ANY(:ids)
+                    GROUP BY j2.id
+                ) c
+                WHERE j.id = c.id
+                """
+            ).bindparams(ids_param),
+            {"ids": ids},
+        )
+        after = ids[-1]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Put the transcripts back into job.meta (text = the seq -1 row, else the segments joined with spaces)
+    op.execute(
+        """
+        UPDATE job j SET meta = (j.meta - 'transcript') || t.moved
+        FROM (
+            SELECT job_id, jsonb_build_object(
+                'english', coalesce(max(text) FILTER (WHERE lang = 'en' AND seq = -1),
+                    string_agg(text, ' ' ORDER BY seq) FILTER (WHERE lang = 'en'), ''),
+                'swahili', coalesce(max(text) FILTER (WHERE lang = 'sw' AND seq = -1),
+                    string_agg(text, ' ' ORDER BY seq) FILTER (WHERE lang = 'sw'), ''),
+                'english_segments', coalesce(jsonb_agg(jsonb_build_object('text', text, 'start', start_sec, 'end', end_sec)
+                    ORDER BY seq) FILTER (WHERE lang = 'en' AND start_sec IS NOT NULL), '[]'::jsonb),
+                'swahili_segments', coalesce(jsonb_agg(jsonb_build_object('text', text, 'start', start_sec, 'end', end_sec)
+                    ORDER BY seq) FILTER (WHERE lang = 'sw' AND start_sec IS NOT NULL), '[]'::jsonb)
+            ) AS moved
+            FROM transcript_segment
+            GROUP BY job_id
+        ) t
+        WHERE j.id = t.job_id
+        """
+    )
+    op.execute("UPDATE job SET meta = meta - 'transcript' WHERE meta ? 'transcript'")
+    op.drop_table('transcript_segment')
@@ -0,0 +1,222 @@
+import shutil
+
+import pytest
+
+from app.services.external_ai import InputFetchFailed, SourceMissing
+from app.tasks.chunked_pipeline import ChunkRunner, merge_chunk_results, run_chunked
+
+
+CHUNKS = [
+    {"index": 0, "start": 0.0, "end": 10.0},
+    {"index": 1, "start": 10.0, "end": 25.5},
+    {"index": 2, "start": 25.5, "end": 40.0},
+]
+
+
+class MemoryCheckpointStore:
+    """In-memory stand-in for MinioCheckpointStore; survives across 'retries'."""
+
+    def __init__(self):
+        self.json = {}
+        self.files = {}
+
+    def get_json(self, name):
+        return self.json.get(name)
+
+    def put_json(self, name, value):
+        self.json[name] = value
+
+    def put_file(self, name, local_path):
+        with open(local_path, "rb") as fh:
+            self.files[name] = fh.read()
+
+    def get_file(self, name, local_path):
+        with open(local_path, "wb") as fh:
+            fh.write(self.files[name])
+        return local_path
+
+    def exists(self, name):
+        return name in self.files or name in self.json
+
+
+class FakePipelineClient:
+    """Fake external_ai: dubs chunks, optionally failing once on a given chunk."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.processed = []
+        self.staged = 0
+        self.stitched = None
+        self.sources = set()
+
+    fetch_fails = False
+
+    def stage_source(self, local_video=None, reference=None):
+        if reference and self.fetch_fails:
+            raise InputFetchFailed("presigned URL expired")
+        self.staged += 1
+        self.staged_by = "reference" if reference else "upload"
+        self.sources.add("src")
+        return {"source_id": "src", "duration": 40.0}
+
+    def release_source(self, source_id):
+        self.sources.discard(source_id)
+
+    def plan_chunks(self, source_id, target_seconds):
+        return [dict(c) for c in CHUNKS]
+
+    def process_chunk(self, source_id, chunk):
+        if source_id not in self.sources:
+            raise SourceMissing(source_id)
+        if chunk["index"] == self.fail_on:
+            self.fail_on = None
+            raise RuntimeError("CUDA out of memory")
+        self.processed.append(chunk["index"])
+        i = chunk["index"]
+        return {
+            "status": "success",
+            "output": f"outputs/chunks/{i}.m4a",
+            "english": f"english {i}",
+            "swahili": f"kiswahili {i}",
+            "english_segments": [{"text": f"english {i}", "start": 1.0, "end": 2.5}],
+            "swahili_segments": [{"text": f"kiswahili {i}", "start": 1.0, "end": 3.0}],
+        }
+
+    def download(self, remote_path, dest):
+        with open(dest, "wb") as fh:
+            fh.write(remote_path.encode())
+        return dest
+
+    def stitch(self, source_id, chunk_audios, output_name):
+        if source_id not in self.sources:
+            raise SourceMissing(source_id)
+        self.stitched = []
+        for path in chunk_audios:
+            with open(path, "rb") as fh:
+                self.stitched.append(fh.read().decode())
+        return {"status": "success", "output": f"outputs/demo_videos/{output_name}.mp4"}
+
+
+def _run(client, store, workdir, fetched):
+    return run_chunked(
+        "s3://uploads/u/1/lecture.mp4",
+        client,
+        store,
+        fetch_source=lambda uri: fetched.append(uri) or "/tmp/lecture.mp4",
+        workdir=str(workdir),
+        output_name="chunked_job1",
+        target_seconds=15,
+    )
+
+
+def test_chunked_run_resumes_at_first_unfinished_chunk(tmp_path):
+    store = MemoryCheckpointStore()
+    client = FakePipelineClient(fail_on=1)
+    fetched = []
+
+    with pytest.raises(RuntimeError):
+        _run(client, store, tmp_path / "attempt1", fetched)
+
+    assert client.processed == [0]
+    assert "chunk_0000.json" in store.json and "chunk_0000.m4a" in store.files
+    assert "chunk_0001.json" not in store.json
+
+    # Retry on a fresh worker: no local artifacts, checkpoints only in the store
+    result = _run(client, store, tmp_path / "attempt2", fetched)
+
+    assert client.processed == [0, 1, 2]
+    assert client.staged == 1
+    assert fetched == ["s3://uploads/u/1/lecture.mp4"]
+    assert client.stitched == [f"outputs/chunks/{i}.m4a" for i in range(3)]
+    assert result["output"] == "outputs/demo_videos/chunked_job1.mp4"
+    assert result["pipeline_metrics"]["chunked"]["chunks_reused"] == 1
+    assert result["pipeline_metrics"]["chunked"]["resumed_from"] == 1
+
+    # Segment times are shifted onto the source timeline
+    assert [s["start"] for s in result["english_segments"]] == [1.0, 11.0, 26.5]
+    assert result["swahili_segments"][2]["end"] == 28.5
+    assert result["english"] == "english 0 english 1 english 2"
+
+
+def test_chunked_run_restages_source_lost_by_external_ai(tmp_path):
+    store = MemoryCheckpointStore()
+    client = FakePipelineClient(fail_on=2)
+    fetched = []
+
+    with pytest.raises(RuntimeError):
+        _run(client, store, tmp_path / "attempt1", fetched)
+
+    # external_ai restarted and dropped the staged source
+    client.sources.clear()
+    shutil.rmtree(tmp_path / "attempt1")
+
+    result = _run(client, store, tmp_path / "attempt2", fetched)
+
+    assert client.processed == [0, 1, 2]
+    assert client.staged == 2
+    assert len(fetched) == 2
+    assert store.json["plan.json"]["source_id"] == "src"
+    assert result["pipeline_metrics"]["chunked"]["resumed_from"] == 2
+
+
+def test_parallel_ranges_share_plan_and_stitch_on_another_worker(tmp_path):
+    """Range tasks and the chord callback each build their own runner, possibly on other hosts."""
+    store = MemoryCheckpointStore()
+    client = FakePipelineClient()
+
+    def runner(name):
+        return ChunkRunner(
+            "s3://uploads/u/1/lecture.mp4",
+            client,
+            store,
+            fetch_source=lambda uri: "/tmp/lecture.mp4",
+            workdir=str(tmp_path / name),
+        )
+
+    plan = runner("dispatch").load_plan(15)
+    records = []
+    for chunk in reversed(plan["chunks"]):
+        r = runner(f"range{chunk['index']}")
+        r.load_plan()
+        records.append(r.run_chunk(chunk)[0])
+
+    stitcher = runner("callback")
+    stitcher.load_plan()
+    result = stitcher.stitch(records, "parallel_job1")
+
+    assert client.staged == 1
+    assert client.stitched == [f"outputs/chunks/{i}.m4a" for i in range(3)]
+    assert [s["start"] for s in result["english_segments"]] == [1.0, 11.0, 26.5]
+
+
+def test_merge_chunk_results_orders_by_index():
+    merged = merge_chunk_results(
+        [
+            {"index": 1, "start": 5.0, "end": 9.0, "english": "b", "english_segments": [{"start": 0, "end": 1}]},
+            {"index": 0, "start": 0.0, "end": 5.0, "english": "a", "english_segments": [{"start": 0, "end": 1}]},
+        ]
+    )
+    assert merged["english"] == "a b"
+    assert [s["start"] for s in merged["english_segments"]] == [0.0, 5.0]
+
+
+@pytest.mark.parametrize("fetch_fails, staged_by, downloads", [(False, "reference", 0), (True, "upload", 1)])
+def test_chunked_run_stages_source_by_reference(tmp_path, fetch_fails, staged_by, downloads):
+    client = FakePipelineClient()
+    client.fetch_fails = fetch_fails
+    fetched = []
+
+    run_chunked(
+        "s3://uploads/u/1/lecture.mp4",
+        client,
+        MemoryCheckpointStore(),
+        fetch_source=lambda uri: fetched.append(uri) or "/tmp/lecture.mp4",
+        workdir=str(tmp_path),
+        output_name="chunked_job1",
+        target_seconds=15,
+        reference_for=lambda uri: {"video_s3_uri": uri},
+    )
+
+    # The worker only touches the video bytes when external_ai can't fetch them
+    assert client.staged_by == staged_by
+    assert len(fetched) == downloads
@@ -0,0 +1,48 @@
+import pytest
+
+from app.services import external_ai
+from app.services.external_ai import ExternalAIClient, ExternalAINotReady
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def _serve(monkeypatch, responses):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    monkeypatch.setattr(external_ai.requests, "get", fake_get)
+    monkeypatch.setattr(external_ai.time, "sleep", lambda s: None)
+    return calls
+
+
+def test_wait_until_ready_polls_through_warmup(monkeypatch):
+    warming = FakeResponse(503, {"ready": False, "warmup": {"state": "loading", "loading": "mt"}})
+    ready = FakeResponse(200, {"ready": True, "warmup": {"state": "ready", "load_seconds": {"pipeline": 41.0}}})
+    calls = _serve(monkeypatch, [warming, warming, ready])
+
+    state = ExternalAIClient("http://ai:7001").wait_until_ready(max_wait=60, interval=1)
+
+    assert state["warmup"]["load_seconds"] == {"pipeline": 41.0}
+    assert calls == ["http://ai:7001/ready"] * 3
+
+
+def test_wait_until_ready_gives_up_after_max_wait(monkeypatch):
+    _serve(monkeypatch, [FakeResponse(503, {"ready": False, "warmup": {"state": "loading"}})])
+
+    with pytest.raises(ExternalAINotReady):
+        ExternalAIClient("http://ai:7001").wait_until_ready(max_wait=0, interval=1)
+
+
+def test_server_without_ready_endpoint_counts_as_ready(monkeypatch):
+    _serve(monkeypatch, [FakeResponse(404, {})])
+    assert ExternalAIClient("http://ai:7001").readiness()["ready"] is True
@@ -0,0 +1,52 @@
+import shutil
+from pathlib import Path
+
+from app.tasks import pipeline_tasks
+
+
+class LocalMinio:
+    """Stand-in for the outputs bucket: objects are files under a local directory."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def upload_file(self, bucket, object_name, file_path):
+        dest = self.root / bucket / object_name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(file_path, dest)
+        return f"s3://{bucket}/{object_name}"
+
+
+def test_sink_uploaded_output_skips_files_hop(tmp_path, monkeypatch):
+    minio = LocalMinio(tmp_path)
+
+    def no_download(*args, **kwargs):
+        raise AssertionError("/files must not be called when external_ai uploaded the output")
+
+    monkeypatch.setattr(pipeline_tasks, "download_resumable", no_download)
+    monkeypatch.setattr(pipeline_tasks, "upload_file", minio.upload_file)
+
+    uri = pipeline_tasks._collect_output(
+        {"output": "outputs/demo_videos/full_ab.mp4", "output_s3_uri": "s3://outputs/demo_videos/full_ab.mp4"}
+    )
+    assert uri == "s3://outputs/demo_videos/full_ab.mp4"
+    assert not any(tmp_path.iterdir())
+
+
+def test_missing_sink_uri_falls_back_to_files_download(tmp_path, monkeypatch):
+    minio = LocalMinio(tmp_path / "minio")
+    calls = []
+
+    def fake_download(url, dest, params=None):
+        calls.append((url, params))
+        Path(dest).write_bytes(b"dubbed video")
+        return {"path": dest, "size": 12}
+
+    monkeypatch.setattr(pipeline_tasks, "download_resumable", fake_download)
+    monkeypatch.setattr(pipeline_tasks, "upload_file", minio.upload_file)
+
+    uri = pipeline_tasks._collect_output({"output": "outputs/demo_videos/full_cd.mp4", "output_s3_uri": None})
+
+    assert uri == "s3://outputs/demo_videos/full_cd.mp4"
+    assert calls[0][1] == {"path": "outputs/demo_videos/full_cd.mp4"}
+    assert (tmp_path / "minio" / "outputs" / "demo_videos" / "full_cd.mp4").read_bytes() == b"dubbed video"
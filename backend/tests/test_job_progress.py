@@ -0,0 +1,50 @@
+from app.services.job_progress import ProgressCoalescer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def snap(seq, stages, progress):
+    return {"seq": seq, "stage": list(stages)[-1], "stages": stages, "progress": progress}
+
+
+def test_coalescer_throttles_and_keeps_the_newest_snapshot():
+    writes = []
+    clock = Clock()
+    coalescer = ProgressCoalescer(lambda job_id, s: writes.append((job_id, s["seq"])), 5, clock, autoflush=False)
+
+    running = {"asr": "succeeded", "mt": "running"}
+    assert coalescer.submit("j1", snap(1, running, 40)) == "written"
+    # Segment progress within the window is held back; only the newest survives
+    for seq in range(2, 40):
+        clock.now += 0.1
+        assert coalescer.submit("j1", snap(seq, running, 40 + seq * 0.1)) == "coalesced"
+    assert coalescer.submit("j1", snap(7, running, 41)) == "stale"
+    assert abs(coalescer.flush_due() - 1.2) < 1e-6
+    clock.now += 2
+    assert coalescer.flush_due() is None
+
+    # A stage transition is written at once
+    clock.now += 0.5
+    assert coalescer.submit("j1", snap(40, {"asr": "succeeded", "mt": "succeeded"}, 50)) == "written"
+    # Other jobs have their own window
+    assert coalescer.submit("j2", snap(1, running, 10)) == "written"
+
+    assert writes == [("j1", 1), ("j1", 39), ("j1", 40), ("j2", 1)]
+    assert coalescer.coalesced == 37
+
+
+def test_flusher_thread_writes_held_back_snapshot():
+    import threading
+
+    written = threading.Event()
+    coalescer = ProgressCoalescer(lambda job_id, s: s["seq"] == 2 and written.set(), min_interval=0.05)
+    stages = {"asr": "running"}
+    coalescer.submit("j1", snap(1, stages, 5))
+    assert coalescer.submit("j1", snap(2, stages, 9)) == "coalesced"
+    assert written.wait(2)
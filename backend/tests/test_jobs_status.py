@@ -1,10 +1,16 @@
+import hashlib
 import io
 import os
 from datetime import datetime, timezone
 from types import SimpleNamespace
 
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
 from app.database import db
-from app.models.models import AppUser, Job, Project, JobOutput, JobStep, Asset
+from app.models.models import AppUser, Job, Project, JobOutput, JobStep, Asset, TranscriptSegment
+from app.services.transcripts import load_transcripts
 
 
 def _create_user(email="progress@test.com"):
@@ -21,6 +27,20 @@ def _create_project(owner_id, name="Demo Project"):
     return project
 
 
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
 def test_job_progress_polling(app):
     client = app.test_client()
     user = _create_user()
@@ -42,6 +62,212 @@ def test_job_progress_polling(app):
     assert data["meta"]["current_step"] == "TTS"
 
 
+def test_job_status_omits_transcripts_and_supports_fields(app):
+    client = app.test_client()
+    user = _create_user("fields@test.com")
+    job = Job(
+        owner_id=user.id,
+        state="succeeded",
+        progress=100.0,
+        meta={
+            "output_s3_uri": "s3://outputs/dubbed.mp4",
+            "english": "hello world",
+            "english_segments": [{"text": "hello world", "start": 0.0, "end": 1.0}],
+            "pipeline_metrics": {"chunks": []},
+        },
+        created_at=datetime.now(timezone.utc),
+    )
+    db.session.add(job)
+    db.session.commit()
+    db.session.add(JobStep(job_id=job.id, name="asr", state="succeeded"))
+    db.session.commit()
+
+    data = client.get(f"/api/jobs/status/{job.id}").get_json()
+    assert data["output_s3_uri"] == "s3://outputs/dubbed.mp4"
+    assert data["meta"]["progress"] == 100.0
+    assert "english" not in data["meta"]
+    assert "english_segments" not in data["meta"]
+    assert "pipeline_metrics" not in data["meta"]
+
+    res = client.get(f"/api/jobs/status/{job.id}?fields=state,progress,steps")
+    assert res.status_code == 200
+    assert res.get_json() == {
+        "id": str(job.id),
+        "state": "completed",
+        "progress": 100.0,
+        "steps": [{"name": "asr", "state": "succeeded", "progress": None, "started_at": None, "finished_at": None}],
+    }
+
+    data = client.get(f"/api/jobs/status/{job.id}?fields=meta.pipeline_metrics").get_json()
+    assert data["meta"]["pipeline_metrics"] == {"chunks": []}
+
+    assert client.get(f"/api/jobs/status/{job.id}?fields=meta.english").status_code == 400
+    assert client.get(f"/api/jobs/status/{job.id}?fields=bogus").status_code == 400
+
+
+def test_job_status_batch_fixed_queries_and_etag(app):
+    client = app.test_client()
+    user = _create_user("batch@test.com")
+    jobs = []
+    for i in range(5):
+        job = Job(
+            owner_id=user.id,
+            state="succeeded" if i == 0 else "running",
+            progress=float(i * 10),
+            meta={"output_s3_uri": "s3://outputs/0.mp4"} if i == 0 else {},
+            created_at=datetime.now(timezone.utc),
+        )
+        db.session.add(job)
+        db.session.flush()
+        db.session.add(JobStep(job_id=job.id, name="asr", state="succeeded"))
+        db.session.add(JobStep(job_id=job.id, name="tts", state="running"))
+        jobs.append(job)
+    db.session.commit()
+    missing = "00000000-0000-0000-0000-000000000000"
+    ids = ",".join(str(j.id) for j in jobs) + "," + missing
+
+    with _count_queries() as statements:
+        res = client.get(f"/api/jobs/status:batch?ids={ids}")
+    assert res.status_code == 200
+    assert len(statements) == 2
+
+    data = res.get_json()
+    assert [j["id"] for j in data["jobs"]] == [str(j.id) for j in jobs]
+    assert data["missing"] == [missing]
+    first = data["jobs"][0]
+    assert first["state"] == "completed"
+    assert first["output_s3_uri"] == "s3://outputs/0.mp4"
+    assert first["steps"] == {"total": 2, "succeeded": 1, "running": 1}
+    assert data["jobs"][3]["progress"] == 30.0
+
+    etag = res.headers["ETag"]
+    res = client.get(f"/api/jobs/status:batch?ids={ids}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+    jobs[1].progress = 15.0
+    db.session.commit()
+    res = client.get(f"/api/jobs/status:batch?ids={ids}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+    assert client.get("/api/jobs/status:batch").status_code == 400
+    assert client.get("/api/jobs/status:batch?ids=not-a-uuid").status_code == 400
+
+
+def test_job_lists_do_not_query_per_row(app):
+    client = app.test_client()
+    admin = AppUser(email="lists-admin@test.com", password_hash="x", role="admin")
+    db.session.add(admin)
+    db.session.commit()
+    for i in range(6):
+        asset = Asset(owner_id=admin.id, kind="video", uri=f"s3://uploads/{i}.mp4",
+                      original_name=f"lecture{i}.mp4", meta={"original_name": f"lecture{i}.mp4"})
+        db.session.add(asset)
+        db.session.flush()
+        db.session.add(Job(owner_id=admin.id, input_asset_id=asset.id, state="running", meta={},
+                           created_at=datetime(2024, 1, 1, i, tzinfo=timezone.utc)))
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess["user_id"] = str(admin.id)
+
+    for url in ("/api/jobs/my?", "/api/jobs/admin?search=lists-admin&"):
+        counts = []
+        for page_size in (2, 6):
+            with _count_queries() as statements:
+                res = client.get(f"{url}page_size={page_size}")
+            assert res.status_code == 200
+            assert len(res.get_json()["jobs"]) == page_size
+            counts.append(len(statements))
+        # user lookup, count, one joined page query, however many rows
+        assert counts[0] == counts[1] <= 3
+
+    newest = client.get("/api/jobs/admin?search=lists-admin&page_size=1").get_json()["jobs"][0]
+    assert newest["video_name"] == "lecture5.mp4"
+    assert newest["input_s3_uri"] == "s3://uploads/5.mp4"
+    assert newest["owner_email"] == "lists-admin@test.com"
+
+
+def test_job_lists_keyset_pagination(app):
+    client = app.test_client()
+    admin = AppUser(email="cursor-admin@test.com", password_hash="x", role="admin")
+    db.session.add(admin)
+    db.session.commit()
+    # Two jobs share each created_at, so the id tie-break matters
+    for i in range(7):
+        db.session.add(Job(owner_id=admin.id, state="queued", meta={},
+                           created_at=datetime(2024, 1, 1, i // 2, tzinfo=timezone.utc)))
+    db.session.commit()
+    expected = [str(j.id) for j in Job.query.filter_by(owner_id=admin.id)
+                .order_by(Job.created_at.desc(), Job.id.desc())]
+    with client.session_transaction() as sess:
+        sess["user_id"] = str(admin.id)
+
+    for url in ("/api/jobs/my?", "/api/jobs/admin?search=cursor-admin&"):
+        seen, cursor, pages = [], "", 0
+        while cursor is not None:
+            res = client.get(f"{url}page_size=3&cursor={cursor}")
+            assert res.status_code == 200
+            data = res.get_json()
+            assert "total" not in data
+            seen += [j["id"] for j in data["jobs"]]
+            cursor = data["next_cursor"]
+            pages += 1
+        assert seen == expected
+        assert pages == 3
+
+    # The total covers the whole list, not just the rows after the cursor
+    first = client.get("/api/jobs/my?page_size=3&cursor=").get_json()
+    data = client.get(f"/api/jobs/my?page_size=3&cursor={first['next_cursor']}&total=exact").get_json()
+    assert data["total"] == 7
+    assert data["total_is_estimate"] is False
+    # Estimates come from the planner on Postgres, so only their shape is checked
+    data = client.get(f"/api/jobs/my?page_size=3&cursor={first['next_cursor']}&total=approx").get_json()
+    assert isinstance(data["total"], int) and data["total"] >= 0
+    assert data["total_is_estimate"] is True
+    # Offset paging is unchanged
+    data = client.get("/api/jobs/my?page=3&page_size=3").get_json()
+    assert [j["id"] for j in data["jobs"]] == expected[6:]
+    assert data["total_pages"] == 3
+
+    assert client.get("/api/jobs/admin?cursor=bogus").status_code == 400
+
+
+def test_job_lists_search(app):
+    client = app.test_client()
+    admin = AppUser(email="search-admin@test.com", password_hash="x", role="admin")
+    other = AppUser(email="someone.else@test.com", password_hash="x")
+    db.session.add_all([admin, other])
+    db.session.commit()
+    jobs = {}
+    for owner, name in ((admin, "Intro_Biology.mp4"), (admin, "chemistry 100%.mp4"), (admin, "lab 1000.mp4"),
+                        (other, "physics.mp4")):
+        asset = Asset(owner_id=owner.id, kind="video", uri=f"s3://uploads/{name}", original_name=name, meta={})
+        db.session.add(asset)
+        db.session.flush()
+        job = Job(owner_id=owner.id, input_asset_id=asset.id, state="queued", meta={},
+                  created_at=datetime.now(timezone.utc))
+        db.session.add(job)
+        jobs[name] = job
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess["user_id"] = str(admin.id)
+
+    def names(url):
+        return sorted(j["video_name"] for j in client.get(url).get_json()["jobs"])
+
+    assert names("/api/jobs/my?search=BIOLOGY") == ["Intro_Biology.mp4"]
+    # LIKE wildcards in the search term are matched literally
+    assert names("/api/jobs/my?search=100%25") == ["chemistry 100%.mp4"]
+    assert names("/api/jobs/my?search=o_b") == ["Intro_Biology.mp4"]
+    assert names("/api/jobs/my?search=b_") == []
+    job_id = str(jobs["chemistry 100%.mp4"].id)
+    assert names(f"/api/jobs/my?search={job_id[:8]}") == ["chemistry 100%.mp4"]
+    # Job ids match by prefix only
+    assert names(f"/api/jobs/my?search={job_id[9:13]}") == []
+    assert names("/api/jobs/admin?search=someone.else") == ["physics.mp4"]
+    assert names("/api/jobs/my?search=physics") == []
+
+
 def test_create_job_enqueues_pipeline(app, monkeypatch):
     client = app.test_client()
     user = _create_user("pipeline@test.com")
@@ -53,7 +279,8 @@ def test_create_job_enqueues_pipeline(app, monkeypatch):
     calls = {}
 
     def fake_upload(bucket, object_name, file_path):
-        assert os.path.exists(file_path)
+        with open(file_path, "rb") as fh:
+            assert fh.read() == b"fake video"
         calls["upload"] = (bucket, object_name)
         return f"s3://{bucket}/{object_name}"
 
@@ -86,10 +313,20 @@ def test_create_job_enqueues_pipeline(app, monkeypatch):
     asset = db.session.get(Asset, job.input_asset_id)
     assert asset is not None
     assert asset.uri.startswith(f"s3://{bucket_name}/")
+    # Hashed while spooling to the temp file
+    assert asset.content_sha256 == hashlib.sha256(b"fake video").hexdigest()
 
     steps = JobStep.query.filter_by(job_id=job_id).all()
-    assert len(steps) == 4
-    assert {s.name for s in steps} == {"asr", "translation", "tts", "lipsync"}
+    assert len(steps) == 7
+    assert {s.name for s in steps} == {
+        "asr",
+        "punctuate",
+        "translate",
+        "tts",
+        "separate_music",
+        "mix",
+        "replace_audio",
+    }
 
     outputs = JobOutput.query.filter_by(job_id=job_id).all()
     assert len(outputs) == 4
@@ -97,3 +334,495 @@ def test_create_job_enqueues_pipeline(app, monkeypatch):
     assert calls["upload"][0] == bucket_name
     assert calls["task"][0] == str(job.id)
     assert calls["task"][1].startswith(f"s3://{bucket_name}/")
+
+
+def test_create_job_streaming_upload(app, monkeypatch):
+    client = app.test_client()
+    user = _create_user("stream@test.com")
+    project = _create_project(user.id, "Stream Project")
+
+    from app.routes import job_routes
+
+    calls = {}
+
+    def fake_upload_stream(bucket, object_name, stream, content_type="application/octet-stream"):
+        body = stream.read()
+        calls["upload"] = (bucket, object_name, body, content_type)
+        return {"uri": f"s3://{bucket}/{object_name}", "sha256": "abc123", "size": len(body)}
+
+    class DummyTask:
+        id = "task-456"
+
+    def fake_queue(job_id, s3_uri):
+        calls["task"] = (job_id, s3_uri)
+        return DummyTask()
+
+    monkeypatch.setattr(job_routes, "upload_stream", fake_upload_stream)
+    monkeypatch.setattr(job_routes, "queue_dubbing_chain", fake_queue)
+
+    res = client.post(
+        f"/api/jobs/create?owner_id={user.id}&project_id={project.id}&filename=lecture.mp4",
+        data=b"raw video bytes",
+        content_type="application/octet-stream",
+    )
+    assert res.status_code == 201, res.data
+    job = db.session.get(Job, res.get_json()["job_id"])
+    asset = db.session.get(Asset, job.input_asset_id)
+
+    assert calls["upload"][2] == b"raw video bytes"
+    assert calls["upload"][3] == "video/mp4"
+    assert asset.meta["original_name"] == "lecture.mp4"
+    assert asset.content_sha256 == "abc123"
+    assert asset.meta["size_bytes"] == len(b"raw video bytes")
+    assert calls["task"] == (str(job.id), asset.uri)
+
+
+def test_create_job_streaming_requires_filename(app, monkeypatch):
+    client = app.test_client()
+
+    from app.routes import job_routes
+
+    monkeypatch.setattr(job_routes, "upload_stream", lambda *a, **k: None)
+    monkeypatch.setattr(job_routes, "queue_dubbing_chain", lambda *a, **k: None)
+
+    res = client.post("/api/jobs/create", data=b"bytes", content_type="application/octet-stream")
+    assert res.status_code == 400
+
+
+def test_create_job_rejects_other_content_types(app, monkeypatch):
+    client = app.test_client()
+    user = _create_user("content-type@test.com")
+
+    from app.routes import job_routes
+
+    calls = []
+    monkeypatch.setattr(job_routes, "upload_stream", lambda *a, **k: calls.append(a))
+    monkeypatch.setattr(job_routes, "queue_dubbing_chain", lambda *a, **k: None)
+
+    url = f"/api/jobs/create?owner_id={user.id}&filename=lecture.mp4"
+    assert client.post(url, json={"file": "lecture.mp4"}).status_code == 415
+    assert client.post(url, data={"owner_id": str(user.id)}).status_code == 415
+    assert client.post(url, data=b"raw video bytes").status_code == 415
+    assert calls == []
+
+
+def test_commit_upload_verifies_object_before_queueing(app, monkeypatch):
+    client = app.test_client()
+    user = _create_user("commit@test.com")
+    project = _create_project(user.id, "Commit Project")
+
+    from app.routes import job_routes
+
+    objects = {}
+    queued = []
+
+    class DummyTask:
+        id = "task-789"
+
+    monkeypatch.setattr(job_routes, "stat_object", lambda bucket, name: objects.get(name))
+    monkeypatch.setattr(job_routes, "object_sha256", lambda bucket, name: "f00d")
+    monkeypatch.setattr(job_routes, "queue_dubbing_chain", lambda job_id, uri: queued.append((job_id, uri)) or DummyTask())
+
+    object_name = f"{user.id}/upload_lecture.mp4"
+    body = {"object_name": object_name, "filename": "lecture.mp4", "owner_id": str(user.id), "project_id": str(project.id)}
+
+    # Nothing uploaded yet → no rows, nothing queued
+    res = client.post("/api/jobs/commit", json=body)
+    assert res.status_code == 404
+    assert queued == []
+
+    objects[object_name] = SimpleNamespace(size=1024, etag="etag-1")
+    res = client.post("/api/jobs/commit", json=body)
+    assert res.status_code == 201, res.data
+
+    job = db.session.get(Job, res.get_json()["job_id"])
+    asset = db.session.get(Asset, job.input_asset_id)
+    assert asset.meta["original_name"] == "lecture.mp4"
+    assert asset.meta["size_bytes"] == 1024
+    # Hashed server-side; the client never sends the bytes through the backend
+    assert asset.content_sha256 == "f00d"
+    assert queued == [(str(job.id), asset.uri)]
+
+    # Committing the same object twice is rejected
+    res = client.post("/api/jobs/commit", json=body)
+    assert res.status_code == 409
+
+
+def test_duplicate_upload_reuses_previous_outputs(app, monkeypatch):
+    client = app.test_client()
+    user = _create_user("dedup@test.com")
+    project = _create_project(user.id, "Dedup Project")
+
+    source_asset = Asset(owner_id=user.id, kind="video", uri="s3://uploads/orig.mp4", content_sha256="f00d", meta={})
+    db.session.add(source_asset)
+    db.session.flush()
+    source = Job(
+        owner_id=user.id,
+        input_asset_id=source_asset.id,
+        state="succeeded",
+        meta={
+            "output_s3_uri": "s3://outputs/dubbed.mp4",
+            "english": "hello class",
+            "swahili": "habari darasa",
+            "english_segments": [{"text": "hello class", "start": 0.0, "end": 1.5}],
+            "swahili_segments": [{"text": "habari darasa", "start": 0.0, "end": 1.5}],
+            "text_metrics": {"english_word_count": 2},
+            "pipeline_metrics": {"stages": {"asr": {"wall_seconds": 12.0}}},
+        },
+        created_at=datetime.now(timezone.utc),
+    )
+    db.session.add(source)
+    db.session.commit()
+
+    from app.routes import job_routes
+
+    class DummyTask:
+        id = "task-dedup"
+
+    def fake_upload_stream(bucket, object_name, stream, content_type="application/octet-stream"):
+        body = stream.read()
+        return {"uri": f"s3://{bucket}/{object_name}", "sha256": "f00d", "size": len(body)}
+
+    monkeypatch.setattr(job_routes, "upload_stream", fake_upload_stream)
+    monkeypatch.setattr(job_routes, "queue_dubbing_chain", lambda job_id, uri: DummyTask())
+
+    res = client.post(
+        f"/api/jobs/create?owner_id={user.id}&project_id={project.id}&filename=again.mp4",
+        data=b"same bytes",
+        content_type="application/octet-stream",
+    )
+    assert res.status_code == 201, res.data
+    job = db.session.get(Job, res.get_json()["job_id"])
+
+    # A fresh Asset row keeps unique_job_input satisfied
+    assert job.input_asset_id != source_asset.id
+    assert job.meta["dedup_of"] == str(source.id)
+
+    # Another user's identical upload is processed on its own
+    other = _create_user("dedup-other@test.com")
+    res = client.post(
+        f"/api/jobs/create?owner_id={other.id}&filename=again.mp4",
+        data=b"same bytes",
+        content_type="application/octet-stream",
+    )
+    assert res.status_code == 201, res.data
+    assert "dedup_of" not in db.session.get(Job, res.get_json()["job_id"]).meta
+
+    from app.tasks.pipeline_chain import _finalize_job
+
+    _finalize_job({"video_s3_uri": "s3://uploads/again.mp4", "dedup_of": str(source.id)}, str(job.id))
+    db.session.refresh(job)
+
+    assert job.state == "succeeded"
+    assert job.meta["output_s3_uri"] == "s3://outputs/dubbed.mp4"
+    assert "swahili_segments" not in job.meta
+    assert load_transcripts(job)["swahili_segments"] == source.meta["swahili_segments"]
+    assert job.meta["text_metrics"] == {"english_word_count": 2}
+    # Nothing ran for this job, so it has no run metrics of its own
+    assert "pipeline_metrics" not in job.meta
+
+
+def test_finalize_stores_transcript_segments(app):
+    client = app.test_client()
+    user = _create_user("segments@test.com")
+    jobs = []
+    for _ in range(2):
+        job = Job(owner_id=user.id, state="running", meta={}, created_at=datetime.now(timezone.utc))
+        db.session.add(job)
+        jobs.append(job)
+    db.session.commit()
+    source, again = jobs
+
+    from app.tasks.pipeline_chain import _finalize_job
+
+    _finalize_job(
+        {
+            "video_s3_uri": "s3://uploads/a.mp4",
+            "output_s3_uri": "s3://outputs/a.mp4",
+            "english": "Hello, class.\nToday!",
+            "swahili": "habari darasa leo",
+            "english_segments": [
+                {"text": "hello class", "start": 0.0, "end": 1.5},
+                {"text": "today", "start": 1.5, "end": 2.0},
+            ],
+            "swahili_segments": [],
+        },
+        str(source.id),
+    )
+    db.session.refresh(source)
+
+    # Only a pointer with counts stays in meta
+    assert source.meta["transcript"] == {
+        "store": "transcript_segment",
+        "english_segments": 2,
+        "swahili_segments": 0,
+    }
+    assert not any(key in source.meta for key in ("english", "swahili", "english_segments", "swahili_segments"))
+    # Two segments plus one full-text row per language
+    assert TranscriptSegment.query.filter_by(job_id=source.id).count() == 4
+
+    with client.session_transaction() as sess:
+        sess["user_id"] = str(user.id)
+    data = client.get(f"/api/jobs/{source.id}/transcripts").get_json()
+    # The full text is kept as sent, not rebuilt from the segments
+    assert data["english"] == "Hello, class.\nToday!"
+    assert data["english_segments"][1] == {"text": "today", "start": 1.5, "end": 2.0}
+    # Text without segments is kept, but isn't listed as a timed segment
+    assert data["swahili"] == "habari darasa leo"
+    assert data["swahili_segments"] == []
+
+    # A deduplicated job copies the stored rows
+    _finalize_job({"video_s3_uri": "s3://uploads/a.mp4", "dedup_of": str(source.id)}, str(again.id))
+    db.session.refresh(again)
+    assert again.meta["transcript"] == source.meta["transcript"]
+    assert load_transcripts(again) == load_transcripts(source)
+
+
+def test_external_ai_callback_triggers_status_check(app, monkeypatch):
+    client = app.test_client()
+    user = _create_user("callback@test.com")
+    job = Job(
+        owner_id=user.id,
+        state="running",
+        meta={"external_ai_job_id": "ext-123", "video_s3_uri": "s3://uploads/a.mp4"},
+        created_at=datetime.now(timezone.utc),
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    from app.routes import job_routes
+
+    sent = []
+
+    class FakeCelery:
+        def send_task(self, name, args=(), queue=None):
+            sent.append((name, args))
+
+    monkeypatch.setattr(job_routes, "celery_app", FakeCelery())
+    monkeypatch.setenv("EXTERNAL_AI_CALLBACK_TOKEN", "s3cret")
+
+    url = f"/api/jobs/{job.id}/external-ai-callback"
+    res = client.post(f"{url}?token=wrong", json={"job_id": "ext-123", "status": "succeeded"})
+    assert res.status_code == 403
+
+    res = client.post(f"{url}?token=s3cret", json={"job_id": "stale", "status": "succeeded"})
+    assert res.status_code == 200
+    assert res.get_json()["status"] == "ignored"
+    assert sent == []
+
+    res = client.post(f"{url}?token=s3cret", json={"job_id": "ext-123", "status": "succeeded"})
+    assert res.status_code == 202
+    assert sent == [("pipeline.poll_external_ai", (str(job.id), "ext-123"))]
+
+
+def test_finalize_writes_measured_stage_timings(app):
+    user = _create_user("timings@test.com")
+    job = Job(owner_id=user.id, state="running", meta={}, created_at=datetime.now(timezone.utc))
+    db.session.add(job)
+    db.session.commit()
+
+    from app.tasks.pipeline_chain import PIPELINE_STEPS, _finalize_job
+
+    for name in PIPELINE_STEPS:
+        db.session.add(JobStep(job_id=job.id, name=name, state="pending"))
+    db.session.commit()
+
+    t0 = 1_760_000_000.0
+
+    def stage(start, wall, items):
+        return {"started_at": t0 + start, "finished_at": t0 + start + wall, "wall_seconds": wall,
+                "cpu_seconds": wall * 2, "peak_rss_mb": 900.0 + items, "items": items}
+
+    # Two chunks: per-step timings are summed across them
+    metrics = {"chunks": [
+        {"index": 0, "metrics": {"stages": {"asr": stage(0, 30, 10), "mt": stage(30, 5, 10)}}},
+        {"index": 1, "metrics": {"stages": {"asr": stage(40, 20, 6), "mt": stage(60, 4, 6)}}},
+    ]}
+    _finalize_job({"video_s3_uri": "s3://uploads/a.mp4", "pipeline_metrics": metrics}, str(job.id))
+
+    steps = {s.name: s for s in JobStep.query.filter_by(job_id=job.id).all()}
+    asr, translate = steps["asr"], steps["translate"]
+    assert asr.metrics["duration_seconds"] == 50
+    assert asr.metrics["items"] == 16 and asr.metrics["peak_rss_mb"] == 910.0
+    assert (asr.finished_at - asr.started_at).total_seconds() == 60
+    assert translate.metrics["cpu_seconds"] == 18 and translate.metrics["timing_source"] == "external_ai"
+
+    # Stages external_ai didn't profile still succeed, just without measurements
+    assert steps["mix"].state == "succeeded"
+    assert "timing_source" not in steps["mix"].metrics
+
+
+def test_external_ai_progress_updates_job_and_steps(app, monkeypatch):
+    client = app.test_client()
+    user = _create_user("live@test.com")
+    job = Job(owner_id=user.id, state="running", progress=0.0, meta={}, created_at=datetime.now(timezone.utc))
+    db.session.add(job)
+    db.session.commit()
+    for name in ("asr", "punctuate", "translate", "tts"):
+        db.session.add(JobStep(job_id=job.id, name=name, state="running" if name == "asr" else "pending"))
+    db.session.commit()
+
+    from app.routes import job_routes
+
+    monkeypatch.setattr(job_routes, "_progress_coalescer", None)
+    monkeypatch.setenv("EXTERNAL_AI_CALLBACK_TOKEN", "s3cret")
+    url = f"/api/jobs/{job.id}/progress"
+    snapshot = {
+        "seq": 3,
+        "stage": "mt",
+        "stages": {"asr": "succeeded", "mt": "running"},
+        "stage_progress": {"asr": 100.0, "punctuation": 100.0, "mt": 50.0},
+        "items": {"asr": 40, "mt": 20},
+        "progress": 42.5,
+    }
+
+    assert client.post(f"{url}?token=wrong", json=snapshot).status_code == 403
+    res = client.post(f"{url}?token=s3cret", json=snapshot)
+    assert res.status_code == 202 and res.get_json()["status"] == "written"
+
+    db.session.refresh(job)
+    assert job.progress == 42.5 and job.current_step == "translate"
+    steps = {s.name: s for s in JobStep.query.filter_by(job_id=job.id).all()}
+    assert steps["asr"].state == "succeeded"
+    assert steps["punctuate"].state == "succeeded"
+    assert steps["translate"].state == "running" and steps["translate"].metrics["progress"] == 50.0
+    assert steps["tts"].state == "pending"
+
+    status = client.get(f"/api/jobs/status/{job.id}").get_json()
+    assert {s["name"]: s["progress"] for s in status["steps"]}["translate"] == 50.0
+
+    # An older snapshot arriving late is dropped
+    res = client.post(f"{url}?token=s3cret", json={**snapshot, "seq": 2, "progress": 10})
+    assert res.get_json()["status"] == "stale"
+
+
+class _FakeRedis:
+    """Just enough of redis-py for job_events: publish and a queue-backed pubsub."""
+
+    def __init__(self):
+        import queue
+
+        self.published = []
+        self.messages = queue.Queue()
+
+    def publish(self, channel, data):
+        self.published.append((channel, data))
+        self.messages.put(data)
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        import queue
+
+        redis = self
+
+        class PubSub:
+            def subscribe(self, channel):
+                pass
+
+            def get_message(self, timeout=None):
+                try:
+                    return {"data": redis.messages.get(timeout=0.05)}
+                except queue.Empty:
+                    return None
+
+            def close(self):
+                pass
+
+        return PubSub()
+
+
+def test_job_events_stream_sends_snapshot_then_deltas(app, monkeypatch):
+    import json
+
+    from app.services import job_events
+
+    fake = _FakeRedis()
+    monkeypatch.setattr(job_events, "_redis", fake)
+    monkeypatch.setattr(job_events, "_retry_at", 0.0)
+    job_events.install()
+
+    client = app.test_client()
+    user = _create_user("sse@test.com")
+    job = Job(owner_id=user.id, state="running", progress=10.0, meta={"english": "x" * 10_000},
+              created_at=datetime.now(timezone.utc))
+    db.session.add(job)
+    db.session.commit()
+    db.session.add(JobStep(job_id=job.id, name="asr", state="running"))
+    db.session.commit()
+    while not fake.messages.empty():
+        fake.messages.get()
+
+    # A commit publishes only what changed
+    job.progress = 55.0
+    job.state = "succeeded"
+    db.session.commit()
+    channel, data = fake.published[-1]
+    assert channel == f"job-events:{job.id}"
+    assert json.loads(data) == {"progress": 55.0, "state": "completed"}
+
+    res = client.get(f"/api/jobs/{job.id}/events")
+    assert res.mimetype == "text/event-stream"
+    events = []
+    for block in res.get_data(as_text=True).split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if ": " in line and not line.startswith(":"))
+        if "data" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    # The job is already finished: one snapshot, no transcripts, then the stream ends
+    assert [name for name, _ in events] == ["snapshot"]
+    assert events[0][1]["state"] == "completed"
+    assert events[0][1]["steps"] == [{"name": "asr", "state": "running", "progress": None}]
+    assert "meta" not in events[0][1]
+
+
+def test_job_events_stream_unavailable_without_redis(app, monkeypatch):
+    from app.services import job_events
+
+    def down():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(job_events, "redis_client", down)
+    monkeypatch.setattr(job_events, "_retry_at", 0.0)
+    user = _create_user("nosse@test.com")
+    job = Job(owner_id=user.id, state="running", meta={}, created_at=datetime.now(timezone.utc))
+    db.session.add(job)
+    db.session.commit()
+
+    res = app.test_client().get(f"/api/jobs/{job.id}/events")
+    assert res.status_code == 503
+
+
+def test_parallel_ranges_report_progress_on_one_asr_step(app, monkeypatch):
+    user = _create_user("ranges@test.com")
+    job = Job(owner_id=user.id, state="running", meta={}, created_at=datetime.now(timezone.utc))
+    db.session.add(job)
+    db.session.flush()
+    db.session.add(JobStep(job_id=job.id, name="asr", state="running"))
+    db.session.add(JobStep(job_id=job.id, name="replace_audio", state="pending"))
+    db.session.commit()
+    job_id = str(job.id)
+
+    from app.tasks import pipeline_tasks
+
+    chunks = [{"index": i} for i in range(3)]
+
+    class FakeRunner:
+        def load_plan(self):
+            return {"chunks": chunks}
+
+        def run_chunk(self, chunk):
+            return {"index": chunk["index"]}, False
+
+    monkeypatch.setattr(pipeline_tasks, "_chunk_runner", lambda *args: FakeRunner())
+
+    for chunk in chunks[:2]:
+        assert pipeline_tasks.task_dub_range(
+            "s3://uploads/a.mp4", chunk, job_id=job_id
+        ) == {"index": chunk["index"]}
+
+    step = JobStep.query.filter_by(job_id=job.id, name="asr").first()
+    db.session.refresh(step)
+    db.session.refresh(job)
+    # A finished range doesn't end the step while its siblings still run
+    assert step.state == "running"
+    assert step.metrics["ranges_done"] == [0, 1]
+    assert step.metrics["progress"] == 66.7
+    assert job.progress == 66.7
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+
+import pytest
+from flask import Flask, request, send_file
+from werkzeug.serving import make_server
+
+from app.utils import ranged_download
+from app.utils.ranged_download import DownloadError, download_resumable
+
+PAYLOAD = bytes(range(256)) * 4096 * 6  # 6 MiB
+
+
+class FilesServer:
+    """Serves one file like external_ai /files; selected ranges drop half-way."""
+
+    def __init__(self, path, digest=None):
+        self.path = path
+        self.digest = digest
+        self.ranges = []
+        self.drop = set()
+        app = Flask(__name__)
+
+        @app.get("/files")
+        def files():
+            resp = send_file(self.path, conditional=True, etag=True)
+            if "sha-256" in request.headers.get("Want-Digest", ""):
+                resp.headers["Digest"] = f"sha-256={self.digest}"
+            if request.method == "GET":
+                rng = request.headers.get("Range")
+                self.ranges.append(rng)
+                if rng in self.drop:
+                    self.drop.discard(rng)
+                    resp.response = _truncated(resp.response)
+            return resp
+
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/files"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+def _truncated(body, after=1536 * 1024):
+    sent = 0
+    for chunk in body:
+        if sent >= after:
+            raise ConnectionResetError("dropped")
+        sent += len(chunk)
+        yield chunk
+
+
+def _b64_sha256(data):
+    import base64
+
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "full_ab.mp4"
+    path.write_bytes(PAYLOAD)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ranged_download.time, "sleep", lambda s: None)
+
+
+def test_parallel_ranges_reassemble_and_verify(tmp_path, source):
+    dest = tmp_path / "out" / "full_ab.mp4"
+    with FilesServer(source, _b64_sha256(PAYLOAD)) as server:
+        server.drop.add("bytes=2097152-4194303")
+        result = download_resumable(server.url, str(dest), params={"path": "x"}, parallel=3, part_size=2 * 1024 * 1024)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert result["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+    assert not (tmp_path / "out" / "full_ab.mp4.parts.json").exists()
+    # The dropped part resumed mid-range instead of starting over
+    part_requests = [r for r in server.ranges if r.endswith("-4194303")]
+    assert part_requests == ["bytes=2097152-4194303", "bytes=3145728-4194303"]
+
+
+def test_later_call_resumes_from_sidecar(tmp_path, source):
+    dest = tmp_path / "full_ab.mp4.dl"
+    with FilesServer(source, _b64_sha256(PAYLOAD)) as server:
+        server.drop.add("bytes=0-6291455")
+        with pytest.raises(DownloadError):
+            download_resumable(server.url, str(dest), parallel=1, part_size=len(PAYLOAD), retries=0)
+        assert (tmp_path / "full_ab.mp4.dl.parts.json").exists()
+
+        result = download_resumable(server.url, str(dest), parallel=1, part_size=len(PAYLOAD), retries=0)
+
+    assert result["resumed_bytes"] > 0
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_digest_mismatch_discards_download(tmp_path, source):
+    dest = tmp_path / "out" / "full_ab.mp4"
+    with FilesServer(source, _b64_sha256(b"something else")) as server:
+        with pytest.raises(DownloadError):
+            download_resumable(server.url, str(dest))
+    assert not dest.exists()
@@ -0,0 +1,212 @@
+# external_ai/async_jobs.py
+"""
+In-process registry for asynchronous /jobs submissions.
+
+A submitted job runs on a bounded thread pool; callers poll
+GET /jobs/<id> for status and partial results, and may register a
+callback URL that receives the final job document by POST when it finishes.
+Finished jobs are kept for `ttl_seconds` and then forgotten, so a client
+polling after that (or after a server restart) gets 404 and should resubmit.
+
+With `state_dir`, job documents are also written to disk (on every state
+change and every `flush_seconds` while running), so any worker process of a
+pre-fork server can answer GET /jobs/<id>, whichever one runs the job.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger("async_jobs")
+
+TERMINAL_STATES = ("succeeded", "failed")
+
+
+class JobRecord:
+    def __init__(self, callback_url: str | None = None):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.callback_url = callback_url
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.partial = {}
+        self.result = None
+        self.error = None
+        self.error_code = None
+
+    def to_dict(self) -> dict:
+        doc = {
+            "job_id": self.id,
+            "pid": os.getpid(),
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "partial": dict(self.partial),
+        }
+        if self.result is not None:
+            doc["result"] = self.result
+        if self.error is not None:
+            doc["error"] = self.error
+        if self.error_code is not None:
+            doc["error_code"] = self.error_code
+        return doc
+
+
+class JobRegistry:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        ttl_seconds: float = 86400,
+        callback_retries: int = 3,
+        state_dir: str | None = None,
+        flush_seconds: float = 2.0,
+    ):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.ttl_seconds = ttl_seconds
+        self.callback_retries = callback_retries
+        self.state_dir = Path(state_dir) if state_dir else None
+        self.flush_seconds = flush_seconds
+        self._flusher = None
+        if self.state_dir:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def submit(self, run, callback_url: str | None = None) -> JobRecord:
+        """
+        Queue `run(record) -> (body, http_status)`. A 200 with
+        body["status"] == "success" counts as succeeded; anything else failed.
+        """
+        self._prune()
+        record = JobRecord(callback_url)
+        with self._lock:
+            self._jobs[record.id] = record
+            if self.state_dir and self._flusher is None:
+                # Started on first use, i.e. in the worker process after any fork
+                self._flusher = threading.Thread(target=self._flush_loop, name="job-flush", daemon=True)
+                self._flusher.start()
+        self._persist(record)
+        self._pool.submit(self._execute, record, run)
+        return record
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_doc(self, job_id: str) -> dict | None:
+        """Job document from this process, else from `state_dir` (another worker's job)."""
+        record = self.get(job_id)
+        if record is not None:
+            return record.to_dict()
+        if not self.state_dir or not all(c in "0123456789abcdef" for c in job_id):
+            return None
+        try:
+            doc = json.loads((self.state_dir / f"{job_id}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        if doc["status"] not in TERMINAL_STATES and not _pid_alive(doc.get("pid")):
+            # The worker running it died; report it lost so the client resubmits
+            return None
+        return doc
+
+    def counts(self) -> dict:
+        with self._lock:
+            out = {}
+            for rec in self._jobs.values():
+                out[rec.status] = out.get(rec.status, 0) + 1
+            return out
+
+    def _execute(self, record: JobRecord, run):
+        record.status = "running"
+        record.started_at = time.time()
+        self._persist(record)
+        try:
+            body, status = run(record)
+            if status == 200 and body.get("status") == "success":
+                record.result = body
+                record.status = "succeeded"
+            else:
+                record.error = body.get("error") or f"HTTP {status}"
+                record.error_code = body.get("code")
+                record.status = "failed"
+        except Exception as exc:
+            logger.exception("[JOBS] %s failed: %s", record.id, exc)
+            record.error = str(exc)
+            record.status = "failed"
+        record.finished_at = time.time()
+        logger.info("[JOBS] %s %s in %.1fs", record.id, record.status, record.finished_at - record.started_at)
+        self._persist(record)
+
+        if record.callback_url:
+            self._notify(record)
+
+    def _notify(self, record: JobRecord):
+        doc = record.to_dict()
+        for attempt in range(self.callback_retries):
+            try:
+                resp = requests.post(record.callback_url, json=doc, timeout=10)
+                if resp.status_code < 500:
+                    return
+            except requests.RequestException as exc:
+                logger.warning("[JOBS] Callback for %s failed (attempt %d): %s", record.id, attempt + 1, exc)
+            time.sleep(2 ** attempt)
+        # Clients still poll, so an undelivered callback only costs latency
+        logger.error("[JOBS] Giving up on callback for %s", record.id)
+
+    def _persist(self, record: JobRecord):
+        if not self.state_dir:
+            return
+        path = self.state_dir / f"{record.id}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(record.to_dict(), default=str))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("[JOBS] Could not persist %s: %s", record.id, exc)
+
+    def _flush_loop(self):
+        # Keeps partial progress visible to the other worker processes
+        while True:
+            time.sleep(self.flush_seconds)
+            with self._lock:
+                running = [r for r in self._jobs.values() if r.status == "running"]
+            for record in running:
+                self._persist(record)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            stale = [
+                jid for jid, rec in self._jobs.items()
+                if rec.status in TERMINAL_STATES and rec.finished_at and rec.finished_at < cutoff
+            ]
+            for jid in stale:
+                del self._jobs[jid]
+        if self.state_dir:
+            for path in self.state_dir.glob("*.json"):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
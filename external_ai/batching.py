@@ -0,0 +1,117 @@
+# external_ai/batching.py
+"""
+Cross-job micro-batching for the MT and TTS models.
+
+Every in-flight /full request submits its MT sentences (or TTS phrases) to a
+shared MicroBatcher instead of calling the model directly. A single
+scheduler thread per model drains the queue into batches of at most
+`max_batch_size` items, waiting up to `max_wait_ms` after the first item for
+more work to arrive, runs the model once per batch and hands each caller
+back exactly its own results, in order.
+
+A request larger than one batch is split across consecutive batches; small
+requests from several jobs share one.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger("batching")
+
+
+class _Request:
+    def __init__(self, n: int):
+        self.results = [None] * n
+        self.remaining = n
+        self.error = None
+        self.done = threading.Event()
+        self.submitted_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """Collects items from many callers and runs `fn(list) -> list` on micro-batches."""
+
+    def __init__(self, fn, max_batch_size: int = 32, max_wait_ms: float = 20.0, name: str = "batch"):
+        self.fn = fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._busy_seconds = 0.0
+        self._thread = threading.Thread(target=self._loop, name=f"{name}-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, items) -> list:
+        """Block until every item has been processed; returns results in input order."""
+        items = list(items)
+        if not items:
+            return []
+        req = _Request(len(items))
+        for i, item in enumerate(items):
+            self._queue.put((req, i, item))
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        return req.results
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            # Drop what is left of requests that already failed in an earlier batch
+            batch = [entry for entry in self._collect() if entry[0].error is None]
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                outputs = list(self.fn([item for _, _, item in batch]))
+                if len(outputs) != len(batch):
+                    raise RuntimeError(
+                        f"{self.name}: model returned {len(outputs)} results for {len(batch)} inputs"
+                    )
+                error = None
+            except Exception as exc:
+                logger.exception("[BATCH] %s batch of %d failed: %s", self.name, len(batch), exc)
+                outputs, error = [None] * len(batch), exc
+
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._busy_seconds += time.perf_counter() - start
+
+            for (req, i, _), out in zip(batch, outputs):
+                if error is not None:
+                    req.error = error
+                else:
+                    req.results[i] = out
+                req.remaining -= 1
+                if req.remaining == 0 or error is not None:
+                    req.done.set()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else None,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+            }
@@ -0,0 +1,170 @@
+"""
+Benchmark: external_ai throughput and memory, single process vs pre-fork pool.
+
+Serves a stub LocalDubbingPipeline through serve.py (the same pre-fork
+master/worker code the real server uses) and fires concurrent /full requests
+at it. The stub "loads" `--weights-mb` of float32 weights once, then every
+process() call reads through a slice of them and burns `--work-ms` of
+GIL-holding Python, which is what limits a single-process server.
+
+--workers 1 stands in for the old `app.run()` server (one request at a
+time); memory is reported as the sum of RSS and of PSS across workers, so
+copy-on-write sharing of the preloaded weights shows as PSS ≪ RSS.
+
+Usage (from external_ai/):
+    python benchmarks/bench_prefork.py --workers 1,2,4 --requests 32 --concurrency 8
+    python benchmarks/bench_prefork.py --weights-mb 512 --work-ms 500 --no-preload
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import requests
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import serve  # noqa: E402
+
+
+class LocalDubbingPipeline:
+    """Stub with the real pipeline's shape: heavy load once, then process()."""
+
+    def __init__(self, weights_mb: int, work_ms: float):
+        rng = np.random.default_rng(0)
+        self.weights = rng.standard_normal(weights_mb * 1024 * 1024 // 4, dtype=np.float32)
+        self.work_ms = work_ms
+
+    def process(self, video_path: str, output_name: str) -> dict:
+        # Read-only pass over part of the weights (doesn't break page sharing)
+        checksum = float(self.weights[:: 4096].sum())
+        deadline = time.perf_counter() + self.work_ms / 1000.0
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+        return {"status": "success", "output": f"outputs/demo_videos/{output_name}.mp4", "checksum": checksum, "spins": n}
+
+
+_state = {}
+
+
+def make_loader(weights_mb: int, work_ms: float):
+    def load():
+        if "app" in _state:
+            return _state["app"]
+        pipe = LocalDubbingPipeline(weights_mb, work_ms)
+        app = Flask("bench_external_ai")
+
+        @app.get("/health")
+        def health():
+            return jsonify({"status": "ok"})
+
+        @app.post("/full")
+        def full():
+            name = (request.get_json(silent=True) or {}).get("name", "bench")
+            return jsonify(pipe.process("input.mp4", name))
+
+        _state["app"] = app
+        return app
+
+    return load
+
+
+def _memory(pid: int) -> dict:
+    out = {}
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                out[key.lower()] = int(value.split()[0]) / 1024.0
+    except OSError:
+        pass
+    return out
+
+
+def _run_server(args, workers, port_q):
+    serve.serve(
+        make_loader(args.weights_mb, args.work_ms),
+        workers=workers,
+        host="127.0.0.1",
+        port=0,
+        preload=not args.no_preload,
+        ready=port_q.put,
+    )
+
+
+def run(args, workers: int) -> dict:
+    ctx = multiprocessing.get_context("fork")
+    port_q = ctx.Queue()
+    master = ctx.Process(target=_run_server, args=(args, workers, port_q), daemon=False)
+    master.start()
+    base = f"http://127.0.0.1:{port_q.get(timeout=300)}"
+
+    # Wait until every worker is up
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        try:
+            pool = requests.get(f"{base}/workers", timeout=5).json()
+            if all(w["pid"] for w in pool["workers"]):
+                break
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+
+    def one(i):
+        t0 = time.perf_counter()
+        resp = requests.post(f"{base}/full", json={"name": f"r{i}"}, timeout=600)
+        resp.raise_for_status()
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool_exec:
+        latencies = sorted(pool_exec.map(one, range(args.requests)))
+    wall = time.perf_counter() - t0
+
+    pool = requests.get(f"{base}/workers", timeout=5).json()
+    mem = [_memory(w["pid"]) for w in pool["workers"]]
+    master.terminate()
+    master.join(30)
+
+    return {
+        "workers": workers,
+        "wall_s": round(wall, 2),
+        "req_per_s": round(args.requests / wall, 2),
+        "p50_s": round(latencies[len(latencies) // 2], 3),
+        "p95_s": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "requests_per_worker": [w["requests"] for w in pool["workers"]],
+        "rss_mb_total": round(sum(m.get("rss", 0) for m in mem), 1),
+        "pss_mb_total": round(sum(m.get("pss", 0) for m in mem), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--weights-mb", type=int, default=256)
+    parser.add_argument("--work-ms", type=float, default=200.0)
+    parser.add_argument("--no-preload", action="store_true", help="Load weights in each worker instead")
+    args = parser.parse_args()
+
+    results = [run(args, int(n)) for n in args.workers.split(",")]
+    base = results[0]["req_per_s"]
+    print(f"{'workers':>8} {'req/s':>8} {'speedup':>8} {'p50 s':>8} {'p95 s':>8} {'RSS MB':>9} {'PSS MB':>9}  per-worker")
+    for r in results:
+        print(
+            f"{r['workers']:>8} {r['req_per_s']:>8} {r['req_per_s'] / base:>7.2f}x {r['p50_s']:>8} {r['p95_s']:>8} "
+            f"{r['rss_mb_total']:>9} {r['pss_mb_total']:>9}  {r['requests_per_worker']}"
+        )
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# external_ai/chunking.py
+"""
+Silence-aligned chunk planning and the FFmpeg helpers used by chunked runs.
+
+A long lecture is split near every `target_seconds` boundary, snapped to the
+midpoint of the closest detected silence so cuts never land mid-word. Each
+chunk is dubbed independently (audio only) and the chunk audios are then
+concatenated and muxed onto the untouched source video once.
+"""
+
+import json
+import logging
+import re
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger("chunking")
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+def probe_duration(path: str) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(json.loads(out)["format"]["duration"])
+
+
+def detect_silences(path: str, noise_db: float = -35.0, min_silence: float = 0.5) -> list[tuple[float, float]]:
+    """Return (start, end) of every silence FFmpeg's silencedetect finds in the audio track."""
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-nostats", "-i", path,
+            "-vn", "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+            "-f", "null", "-",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    silences = []
+    start = None
+    for line in proc.stderr.splitlines():
+        m = _SILENCE_START_RE.search(line)
+        if m:
+            start = max(float(m.group(1)), 0.0)
+            continue
+        m = _SILENCE_END_RE.search(line)
+        if m and start is not None:
+            silences.append((start, float(m.group(1))))
+            start = None
+    return silences
+
+
+def plan_chunks(duration: float, silences: list[tuple[float, float]], target_seconds: float) -> list[dict]:
+    """
+    Split [0, duration] into chunks of roughly `target_seconds`.
+
+    Each cut is moved to the midpoint of the silence nearest the ideal
+    boundary, within ±25% of the target length; with no silence in that
+    window the cut stays on the boundary.
+    """
+    if duration <= 0:
+        return []
+    if target_seconds <= 0 or duration <= target_seconds * 1.25:
+        return [{"index": 0, "start": 0.0, "end": round(duration, 3)}]
+
+    midpoints = sorted((s + e) / 2.0 for s, e in silences)
+    window = target_seconds * 0.25
+
+    cuts = []
+    last = 0.0
+    while duration - last > target_seconds * 1.25:
+        ideal = last + target_seconds
+        nearby = [m for m in midpoints if abs(m - ideal) <= window and m > last]
+        cut = min(nearby, key=lambda m: abs(m - ideal)) if nearby else ideal
+        cuts.append(cut)
+        last = cut
+
+    bounds = [0.0] + cuts + [duration]
+    return [
+        {"index": i, "start": round(bounds[i], 3), "end": round(bounds[i + 1], 3)}
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def cut_clip(src: str, start: float, end: float, dest: str) -> str:
+    """Re-encode [start, end) of `src` so the clip's audio starts exactly at `start`."""
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-i", src,
+            "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", dest,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return dest
+
+
+def extract_audio(src: str, dest: str, duration: float | None = None) -> str:
+    """Pull the (dubbed) audio track out as AAC, padded/trimmed to `duration` when given."""
+    cmd = ["ffmpeg", "-y", "-i", src, "-vn"]
+    if duration:
+        cmd += ["-af", "apad", "-t", f"{duration:.3f}"]
+    cmd += ["-c:a", "aac", "-b:a", "128k", dest]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return dest
+
+
+def stitch_audio_and_mux(video: str, chunk_audios: list[str], dest: str, workdir: str) -> str:
+    """Concatenate chunk audios in order and mux them onto the source video's picture."""
+    list_file = Path(workdir) / "concat.txt"
+    list_file.write_text(
+        "".join(f"file '{Path(p).resolve().as_posix()}'\n" for p in chunk_audios),
+        encoding="utf-8",
+    )
+    joined = Path(workdir) / "joined.m4a"
+    subprocess.run(
+        ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(list_file), "-c", "copy", str(joined)],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-i", video, "-i", str(joined),
+            "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", "aac", "-shortest", dest,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return dest
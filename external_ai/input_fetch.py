@@ -0,0 +1,112 @@
+# external_ai/input_fetch.py
+"""
+Fetch job inputs by reference instead of receiving them as uploads.
+
+/full, /jobs and /sources accept either a presigned GET URL (`video_url`)
+or an `s3://bucket/key` reference (`video_s3_uri`, read with this server's
+own MinIO credentials). The object is streamed to disk in fixed-size chunks
+and hashed on the way through. A dropped connection is retried with backoff,
+resuming from the last byte written when the server honours Range requests.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger("input_fetch")
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class InputFetchError(Exception):
+    """The referenced input could not be fetched (expired URL, missing object, unreachable store)."""
+
+
+def reference_from(params) -> dict | None:
+    """Pick the input reference out of request params, if any."""
+    if params.get("video_url"):
+        return {"video_url": params["video_url"]}
+    if params.get("video_s3_uri"):
+        return {"video_s3_uri": params["video_s3_uri"]}
+    return None
+
+
+def _stream_url(url: str, fh, state: dict, timeout: float) -> None:
+    offset = fh.tell()
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with requests.get(url, stream=True, headers=headers, timeout=timeout) as resp:
+        if offset and resp.status_code == 416:
+            # Everything was already written before the connection dropped
+            return
+        if resp.status_code in (401, 403, 404):
+            raise InputFetchError(f"GET {urlparse(url).path} → {resp.status_code}")
+        resp.raise_for_status()
+        if offset and resp.status_code != 206:
+            # Server ignored Range; start over
+            fh.seek(0)
+            fh.truncate()
+            state["digest"] = hashlib.sha256()
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            if chunk:
+                fh.write(chunk)
+                state["digest"].update(chunk)
+
+
+def _stream_s3(s3_uri: str, fh, state: dict, client) -> None:
+    from minio.error import S3Error
+
+    parsed = urlparse(s3_uri)
+    bucket, key = parsed.netloc, parsed.path.lstrip("/")
+    if parsed.scheme != "s3" or not bucket or not key:
+        raise InputFetchError(f"Invalid S3 URI: {s3_uri}")
+    if client is None:
+        raise InputFetchError("s3:// inputs need S3_ENDPOINT / S3_ACCESS_KEY / S3_SECRET_KEY")
+    try:
+        resp = client.get_object(bucket, key, offset=fh.tell())
+    except S3Error as exc:
+        raise InputFetchError(f"{s3_uri}: {exc.code}") from exc
+    try:
+        for chunk in resp.stream(CHUNK_SIZE):
+            fh.write(chunk)
+            state["digest"].update(chunk)
+    finally:
+        resp.close()
+        resp.release_conn()
+
+
+def fetch_input(reference: dict, dest: str, s3_client=None, retries: int | None = None, timeout: float = 60.0) -> dict:
+    """
+    Stream the referenced input to `dest`. Returns {"path", "size", "sha256"}.
+
+    Raises InputFetchError once retries are exhausted or on a permanent
+    failure (403/404, missing object).
+    """
+    retries = int(os.getenv("INPUT_FETCH_RETRIES", "4")) if retries is None else retries
+    # Each retry resumes at fh.tell(); the digest always covers exactly what's on disk
+    state = {"digest": hashlib.sha256()}
+    with open(dest, "wb") as fh:
+        for attempt in range(retries + 1):
+            try:
+                if "video_url" in reference:
+                    _stream_url(reference["video_url"], fh, state, timeout)
+                else:
+                    _stream_s3(reference["video_s3_uri"], fh, state, s3_client)
+                break
+            except InputFetchError:
+                raise
+            except Exception as exc:
+                if attempt == retries:
+                    raise InputFetchError(f"Input fetch failed after {attempt + 1} attempts: {exc}") from exc
+                wait = 2 ** attempt
+                logger.warning("[FETCH] Attempt %d failed at %d bytes (%s); retrying in %ds", attempt + 1, fh.tell(), exc, wait)
+                time.sleep(wait)
+        written = fh.tell()
+
+    if written == 0:
+        raise InputFetchError("Referenced input is empty")
+    logger.info("[FETCH] %d bytes → %s", written, dest)
+    return {"path": dest, "size": written, "sha256": state["digest"].hexdigest()}
@@ -1,14 +1,26 @@
 # external_ai/local_ai_server.py
 
+import base64
+import hashlib
+import hmac
+import inspect
 import logging
 import os
+import shutil
 import subprocess
 import tempfile
+import signal
+import threading
 import uuid
+from contextlib import ExitStack, closing
 from pathlib import Path
 
 from flask import Flask, jsonify, request, send_file
-import torch
+
+try:
+    import torch
+except ImportError:  # CPU-only test machines running PIPELINE_IMPL=stub
+    torch = None
 
 # -----------------------------------------------------------------------------
 # Lightweight .env loader
@@ -41,13 +53,247 @@ logger = logging.getLogger("local_ai_server")
 # -----------------------------------------------------------------------------
 # Device & model config
 # -----------------------------------------------------------------------------
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+DEVICE = "cuda" if torch is not None and torch.cuda.is_available() else "cpu"
 WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL_NAME", "small")
 
-from pipeline_core_loader import get_pipeline  # noqa: E402
+# Model identifiers that key the stage cache. A pipeline exposing its own
+# `model_versions` dict overrides these per stage.
+MODEL_VERSIONS = {
+    "asr": f"whisper-{WHISPER_MODEL_NAME}",
+    "punctuation": os.getenv("PUNCT_MODEL_VERSION", "deepmultilingualpunctuation"),
+    "mt": os.getenv("MT_MODEL_VERSION", "nllb-lora"),
+    "tts": os.getenv("TTS_MODEL_VERSION", "default"),
+    "separation": os.getenv("DEMUCS_MODEL_VERSION", "htdemucs"),
+}
+
+import chunking  # noqa: E402
+from async_jobs import JobRegistry  # noqa: E402
+from batching import MicroBatcher  # noqa: E402
+from input_fetch import InputFetchError, fetch_input, reference_from  # noqa: E402
+from output_sink import MinioOutputSink, minio_from_env, object_name_for  # noqa: E402
+from progress_events import ProgressReporter  # noqa: E402
+import pipeline_core_loader  # noqa: E402
+from pipeline_core_loader import get_pipeline, pipeline_lease  # noqa: E402
+from stage_cache import StageCache, fingerprint_file  # noqa: E402
+from stage_profiler import StageProfiler  # noqa: E402
+from translation_memory import MemoTranslator, TranslationMemory  # noqa: E402
+from tts_cache import CachedSynthesizer, TTSCache  # noqa: E402
+from warmup import Warmup  # noqa: E402
+
+# -----------------------------------------------------------------------------
+# Stage result cache (ASR segments, translations, TTS WAVs, music stem, ...)
+# -----------------------------------------------------------------------------
+STAGE_CACHE = None
+if os.getenv("STAGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"):
+    STAGE_CACHE = StageCache(
+        os.getenv("STAGE_CACHE_DIR", str(Path(tempfile.gettempdir()) / "local_ai_stage_cache")),
+        max_bytes=int(float(os.getenv("STAGE_CACHE_MAX_GB", "20")) * 1024**3),
+    )
+# Dubbed videos up to this size are also cached whole ("full" entry). Off by
+# default: it is a second multi-GB write per job and pushes the small stage
+# artefacts out of the cache, while those alone already let a retry resume.
+STAGE_CACHE_FULL_MAX_BYTES = int(float(os.getenv("STAGE_CACHE_FULL_MAX_MB", "0")) * 1024**2)
+
+# -----------------------------------------------------------------------------
+# Translation memory (checked before the NLLB+LoRA model)
+# -----------------------------------------------------------------------------
+TRANSLATION_MEMORY = None
+if os.getenv("TM_ENABLED", "true").lower() in ("1", "true", "yes"):
+    tm_path = Path(os.getenv("TM_PATH", str(Path(__file__).parent / "data" / "translation_memory.sqlite3")))
+    tm_path.parent.mkdir(parents=True, exist_ok=True)
+    TRANSLATION_MEMORY = TranslationMemory(str(tm_path))
+
+# -----------------------------------------------------------------------------
+# TTS phrase cache (synthesised Swahili segments, FLAC)
+# -----------------------------------------------------------------------------
+TTS_CACHE = None
+if os.getenv("TTS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"):
+    TTS_CACHE = TTSCache(
+        os.getenv("TTS_CACHE_DIR", str(Path(__file__).parent / "data" / "tts_cache")),
+        max_bytes=int(float(os.getenv("TTS_CACHE_MAX_GB", "5")) * 1024**3),
+    )
+TTS_VOICE = os.getenv("TTS_VOICE", "default")
+TTS_SAMPLE_RATE = int(os.getenv("TTS_SAMPLE_RATE", "22050"))
+
+# -----------------------------------------------------------------------------
+# Chunked mode: staged sources (content-addressed) and per-chunk outputs
+# -----------------------------------------------------------------------------
+SOURCES_DIR = Path(os.getenv("CHUNK_SOURCES_DIR", str(Path(tempfile.gettempdir()) / "local_ai_sources")))
+SOURCES_DIR.mkdir(parents=True, exist_ok=True)
+CHUNK_OUTPUT_DIR = Path("outputs") / "chunks"
+DEMO_OUTPUT_DIR = Path("outputs") / "demo_videos"
+
+# -----------------------------------------------------------------------------
+# Cross-job micro-batching of MT sentences and TTS phrases
+# -----------------------------------------------------------------------------
+BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "true").lower() in ("1", "true", "yes")
+MT_BATCH_MAX_SIZE = int(os.getenv("MT_BATCH_MAX_SIZE", "32"))
+MT_BATCH_MAX_WAIT_MS = float(os.getenv("MT_BATCH_MAX_WAIT_MS", "20"))
+TTS_BATCH_MAX_SIZE = int(os.getenv("TTS_BATCH_MAX_SIZE", "8"))
+TTS_BATCH_MAX_WAIT_MS = float(os.getenv("TTS_BATCH_MAX_WAIT_MS", "10"))
+# Whole-pipeline runs allowed at once; MT/TTS work from all of them is batched
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "4"))
+
+_job_slots = threading.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+
+# Asynchronous /jobs submissions (poll GET /jobs/<id> or receive a callback)
+def _job_registry() -> JobRegistry:
+    return JobRegistry(
+        max_workers=MAX_CONCURRENT_JOBS,
+        ttl_seconds=float(os.getenv("ASYNC_JOB_TTL_SECONDS", "86400")),
+        # Shared by all workers under serve.py, so any of them can answer /jobs/<id>
+        state_dir=os.getenv("ASYNC_JOB_STATE_DIR") or None,
+    )
+
+
+JOBS = _job_registry()
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+# -----------------------------------------------------------------------------
+# Output sink: dubbed videos go straight to the MinIO outputs bucket
+# -----------------------------------------------------------------------------
+OUTPUT_SINK = MinioOutputSink.from_env()
+# Also used to read s3:// input references
+S3_CLIENT = minio_from_env()
+OUTPUT_SINK_KEEP_LOCAL = os.getenv("OUTPUT_SINK_KEEP_LOCAL", "false").lower() in ("1", "true", "yes")
+
+# Models load in the background at startup; /ready reports when they're in
+WARMUP = Warmup(get_pipeline)
 
 app = Flask(__name__)
 
+
+def post_fork():
+    """
+    Called by serve.py in each worker right after fork(): recreate the
+    per-process state that can't be inherited (SQLite handles, thread pools,
+    locks possibly held by a parent thread).
+    """
+    global JOBS, _job_slots, _batchers_lock, _digest_lock
+    if TRANSLATION_MEMORY is not None:
+        TRANSLATION_MEMORY.reopen()
+    JOBS = _job_registry()
+    _job_slots = threading.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+    _batchers.clear()
+    _batchers_lock = threading.Lock()
+    _digest_lock = threading.Lock()
+
+
+def background_busy() -> bool:
+    """True while async /jobs work is queued or running (serve.py waits before retiring a worker)."""
+    counts = JOBS.counts()
+    return bool(counts.get("queued") or counts.get("running"))
+
+
+def pipeline_model_versions(pipe) -> dict:
+    versions = dict(MODEL_VERSIONS)
+    versions.update(getattr(pipe, "model_versions", None) or {})
+    return versions
+
+
+def current_mt_version() -> str:
+    """MT model version of the loaded pipeline, or the configured one before it loads."""
+    if pipeline_core_loader.status()["loaded"]:
+        return pipeline_model_versions(get_pipeline())["mt"]
+    return MODEL_VERSIONS["mt"]
+
+
+def run_pipeline(pipe, video_path: str, output_name: str, **hooks) -> dict:
+    """
+    Call pipe.process(), passing only the optional hooks its signature accepts.
+
+    Hooks are extension points for LocalDubbingPipeline (e.g. `stage_cache`);
+    pipelines that predate a hook simply don't receive it.
+    """
+    params = inspect.signature(pipe.process).parameters
+    accepts_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+    accepted = {k: v for k, v in hooks.items() if v is not None and (accepts_any or k in params)}
+    return pipe.process(video_path, output_name=output_name, **accepted)
+
+
+def get_batchers(pipe) -> dict:
+    """
+    Shared MT/TTS batchers for the pipeline singleton, created on first use.
+
+    MT batches go through pipe.translate_batch; TTS uses pipe.synthesize_batch
+    when the pipeline has one, otherwise phrases are synthesised one by one
+    on the batcher thread (which still serialises access to the TTS model).
+    """
+    if not BATCHING_ENABLED:
+        return {}
+    global _batchers
+    with _batchers_lock:
+        if _batchers.get("pipe") is pipe:
+            return _batchers
+        # A new dict per pipeline instance: requests still running on a
+        # replaced pipeline (see /pipeline/reload) keep their own batchers
+        batchers = {"pipe": pipe}
+        if hasattr(pipe, "translate_batch"):
+            batchers["mt"] = MicroBatcher(
+                pipe.translate_batch, MT_BATCH_MAX_SIZE, MT_BATCH_MAX_WAIT_MS, name="mt"
+            )
+        if hasattr(pipe, "synthesize_batch"):
+            tts_fn = pipe.synthesize_batch
+        elif hasattr(pipe, "synthesize"):
+            tts_fn = lambda texts: [pipe.synthesize(t) for t in texts]  # noqa: E731
+        else:
+            tts_fn = None
+        if tts_fn is not None:
+            batchers["tts"] = MicroBatcher(tts_fn, TTS_BATCH_MAX_SIZE, TTS_BATCH_MAX_WAIT_MS, name="tts")
+        _batchers = batchers
+        return _batchers
+
+
+def sink_output(local_path: str, rel_path: str) -> str | None:
+    """
+    Upload a finished video through the output sink. Returns its s3:// URI,
+    or None when the sink is off or the upload failed — the worker then
+    falls back to fetching `rel_path` via /files, so the local copy is kept.
+    """
+    if OUTPUT_SINK is None:
+        return None
+    try:
+        uploaded = OUTPUT_SINK.put(local_path, object_name_for(rel_path))
+    except Exception as exc:
+        logger.warning("[SINK] Upload of %s failed, leaving it for /files: %s", rel_path, exc)
+        return None
+    if not OUTPUT_SINK_KEEP_LOCAL:
+        Path(local_path).unlink(missing_ok=True)
+    return uploaded["uri"]
+
+
+def _restore_cached_full(entry: dict, output_name: str) -> dict | None:
+    """Copy a cached dubbed video back next to the pipeline outputs and return its result."""
+    result = dict(entry["value"])
+    cached_video = entry["files"].get("output.mp4")
+    if not cached_video:
+        return None
+    out_path = Path(result["output"]).with_name(f"{output_name}.mp4")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(cached_video, out_path)
+    result["output"] = str(out_path)
+    return result
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _source_path(source_id: str) -> Path | None:
+    # source ids are SHA-256 hex digests; anything else can't name a staged file
+    if not source_id or len(source_id) != 64 or any(c not in "0123456789abcdef" for c in source_id):
+        return None
+    path = SOURCES_DIR / f"{source_id}.mp4"
+    return path if path.exists() else None
+
+
+def _source_missing(source_id: str):
+    return jsonify({"error": f"Unknown source_id: {source_id}", "code": "source_missing"}), 404
+
 # -----------------------------------------------------------------------------
 # FFmpeg helper (rarely used; pipeline handles extraction itself)
 # -----------------------------------------------------------------------------
@@ -78,13 +324,90 @@ def extract_audio_ffmpeg(input_path: str, output_path: str) -> str:
 def health():
     return jsonify(
         {
-            "status": "ok",
+            "status": "ok" if WARMUP.ready else "warming_up",
+            "ready": WARMUP.ready,
+            "warmup": WARMUP.snapshot(),
             "device": DEVICE,
             "whisper_model": WHISPER_MODEL_NAME,
+            "batching": {k: b.stats() for k, b in _batchers.items() if k != "pipe"},
+            "jobs": JOBS.counts(),
         }
     ), 200
 
 
+@app.get("/live")
+def live():
+    """Liveness: the process is up and serving (models may still be loading)."""
+    return jsonify({"status": "alive"}), 200
+
+
+@app.get("/ready")
+def ready():
+    """Readiness: 200 once every model is loaded, 503 while warming up or after a failed load."""
+    if WARMUP.state == "failed":
+        # Let a later probe retry the load instead of staying unready forever
+        WARMUP.start()
+    loader = pipeline_core_loader.status()
+    # A drain-mode reload holds new requests until the new pipeline is in
+    is_ready = WARMUP.ready and loader["admitting"]
+    body = {"ready": is_ready, "warmup": WARMUP.snapshot(), "pipeline": loader}
+    return jsonify(body), 200 if is_ready else 503
+
+
+@app.get("/pipeline")
+def pipeline_status():
+    """Which pipeline implementation/generation is loaded and how many requests use it."""
+    return jsonify(pipeline_core_loader.status()), 200
+
+
+def _reload_allowed() -> bool:
+    """The shared PIPELINE_RELOAD_TOKEN in the query string, or localhost when no token is set."""
+    expected = os.getenv("PIPELINE_RELOAD_TOKEN", "")
+    if expected:
+        return hmac.compare_digest(request.args.get("token", ""), expected)
+    return request.remote_addr in ("127.0.0.1", "::1")
+
+
+@app.post("/pipeline/reload")
+def pipeline_reload():
+    """
+    Hot-swap the pipeline (e.g. after updating model weights) without a restart.
+
+    Accepts:
+        JSON { mode?: "overlap" | "drain", drain_timeout?: seconds }
+
+    Authenticated by ?token=PIPELINE_RELOAD_TOKEN; without one set, only
+    callers on localhost may reload.
+
+    Runs in the background and returns 202; follow it via GET /pipeline.
+    Under serve.py this triggers a rolling restart of all workers instead.
+    """
+    if not _reload_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+
+    params = request.get_json(silent=True) or {}
+    mode = params.get("mode") or pipeline_core_loader.PIPELINE_RELOAD_MODE
+    if mode not in ("overlap", "drain"):
+        return jsonify({"error": f"Unknown mode: {mode}"}), 400
+
+    master_pid = os.getenv("EXTERNAL_AI_MASTER_PID")
+    if master_pid:
+        os.kill(int(master_pid), signal.SIGHUP)
+        return jsonify({"status": "accepted", "rolling_restart": True}), 202
+
+    if pipeline_core_loader.status()["reloading"]:
+        return jsonify({"error": "A reload is already running"}), 409
+
+    def reload():
+        try:
+            pipeline_core_loader.reload_pipeline(mode=mode, drain_timeout=params.get("drain_timeout"))
+        except Exception as exc:
+            logger.exception("[LOADER] Reload failed: %s", exc)
+
+    threading.Thread(target=reload, name="pipeline-reload", daemon=True).start()
+    return jsonify({"status": "accepted", "mode": mode}), 202
+
+
 # -----------------------------------------------------------------------------
 # (ASR, punctuation, MT, TTS, mix, mux unchanged)
 # Entire sections preserved exactly as you shared
@@ -100,72 +423,292 @@ def full_chain():
     """
     Accepts:
         multipart/form-data { video: file }
+      or the input by reference, fetched by this server (no upload):
+        form / JSON { video_url: presigned GET URL } | { video_s3_uri: "s3://bucket/key" }
+      or, for chunked runs against a source staged via /sources,
+        form / JSON { source_id, start?, end?, audio_only? }
+
+    An input reference that can't be fetched answers 502 with
+    code "input_fetch_failed", so the caller can fall back to uploading.
+
+    With `progress_url`, stage and segment progress snapshots are POSTed
+    there while the pipeline runs (see progress_events.py).
+
+    With start/end only that time range of the source is dubbed. With
+    audio_only the response's "output" is the dubbed range's audio track
+    (AAC, exactly end - start seconds long) rather than a video.
 
     Returns:
         {
             "status": "success",
             "english": "...",
             "swahili": "...",
-            "output": "outputs/demo_videos/dubbed_abc123.mp4"
+            "output": "outputs/demo_videos/dubbed_abc123.mp4",
+            "output_s3_uri": "s3://outputs/demo_videos/dubbed_abc123.mp4"  # or null
         }
     """
+    spec, error = _accept_full_request()
+    if error is not None:
+        return error
+    body, status = _run_full(spec)
+    return jsonify(body), status
 
-    if "video" not in request.files:
-        return jsonify({"error": "Missing 'video'"}), 400
 
-    video_file = request.files["video"]
-    if video_file.filename == "":
-        return jsonify({"error": "Empty filename"}), 400
+def _accept_full_request():
+    """
+    Validate a /full (or /jobs) request and save any uploaded video, so the
+    run itself can happen after the request has ended.
+
+    Returns (spec, None) or (None, error_response).
+    """
+    params = request.form if request.form else (request.get_json(silent=True) or {})
+    source_id = params.get("source_id")
+    spec = {
+        "source_id": source_id,
+        "source_path": None,
+        "clip_range": None,
+        "audio_only": str(params.get("audio_only", "")).lower() in ("1", "true", "yes"),
+        "callback_url": params.get("callback_url"),
+        "progress_url": params.get("progress_url"),
+        "input_ref": None,
+    }
+
+    if source_id:
+        spec["source_path"] = _source_path(source_id)
+        if spec["source_path"] is None:
+            return None, _source_missing(source_id)
+        if params.get("start") is not None and params.get("end") is not None:
+            try:
+                clip_range = (float(params["start"]), float(params["end"]))
+            except (TypeError, ValueError):
+                return None, (jsonify({"error": "'start' and 'end' must be numbers"}), 400)
+            if clip_range[1] <= clip_range[0]:
+                return None, (jsonify({"error": "'end' must be after 'start'"}), 400)
+            spec["clip_range"] = clip_range
+    elif reference_from(params):
+        # Pass-by-reference: fetched (streamed, with retries) when the run starts
+        spec["input_ref"] = reference_from(params)
+    else:
+        if "video" not in request.files:
+            return None, (jsonify({"error": "Missing 'video'"}), 400)
+
+        video_file = request.files["video"]
+        if video_file.filename == "":
+            return None, (jsonify({"error": "Empty filename"}), 400)
 
     tmp_dir = Path(tempfile.gettempdir()) / "local_ai_full"
     tmp_dir.mkdir(parents=True, exist_ok=True)
 
-    tmp_id = uuid.uuid4().hex
-    tmp_path = tmp_dir / f"{tmp_id}.mp4"
+    spec["tmp_id"] = uuid.uuid4().hex
+    spec["tmp_path"] = tmp_dir / f"{spec['tmp_id']}.mp4"
 
-    try:
+    if not source_id and not spec["input_ref"]:
         # Save temp upload
-        video_file.save(tmp_path)
-        logger.info(f"[FULL] Running full pipeline → {tmp_path}")
+        video_file.save(spec["tmp_path"])
+    return spec, None
+
+
+class _Counting:
+    """Wraps a hook callable and counts processed items into a job's partial results."""
+
+    def __init__(self, fn, partial: dict, key: str, batch: bool):
+        self.fn = fn
+        self.partial = partial
+        self.key = key
+        self.batch = batch
+
+    def __call__(self, arg):
+        out = self.fn(arg)
+        self.partial[self.key] = self.partial.get(self.key, 0) + (len(arg) if self.batch else 1)
+        return out
+
+
+def _run_full(spec: dict, job=None):
+    """
+    Run the pipeline for an accepted /full request. Returns (body, http_status).
+
+    `job` is the async JobRecord when called from /jobs; its `partial` dict is
+    updated as stages complete and sentences/phrases are produced.
+    """
+    tmp_id = spec["tmp_id"]
+    tmp_path = spec["tmp_path"]
+    source_id = spec["source_id"]
+    clip_range = spec["clip_range"]
+    audio_only = spec["audio_only"]
+    input_path = tmp_path
+    partial = job.partial if job is not None else {}
+    held = ExitStack()  # pipeline lease, profiler
 
-        pipe = get_pipeline()
-        result = pipe.process(str(tmp_path), output_name=f"full_{tmp_id}")
+    try:
+        if source_id:
+            if clip_range:
+                chunking.cut_clip(str(spec["source_path"]), clip_range[0], clip_range[1], str(tmp_path))
+                # Re-encoded clips aren't byte-stable, so key the cache on the range instead
+                input_fingerprint = hashlib.sha256(
+                    f"{source_id}:{clip_range[0]:.3f}:{clip_range[1]:.3f}".encode("utf-8")
+                ).hexdigest()
+            else:
+                input_path = spec["source_path"]
+                input_fingerprint = source_id
+        elif spec["input_ref"]:
+            partial["phase"] = "fetching_input"
+            try:
+                fetched = fetch_input(spec["input_ref"], str(tmp_path), s3_client=S3_CLIENT)
+            except InputFetchError as exc:
+                logger.warning("[FULL] Could not fetch input: %s", exc)
+                return {"status": "error", "error": str(exc), "code": "input_fetch_failed"}, 502
+            # Hashed while streaming, so the stage cache needn't re-read the file
+            input_fingerprint = fetched["sha256"]
+        else:
+            input_fingerprint = None
+        logger.info(f"[FULL] Running full pipeline → {input_path}")
+
+        # Held until the response is built, so a hot reload frees this
+        # pipeline instance only after we're done with it
+        pipe = held.enter_context(pipeline_lease())
+
+        # Stage cache: a retried job (same input bytes + same models) reuses the
+        # finished result outright (if STAGE_CACHE_FULL_MAX_MB allowed caching
+        # it), or resumes from its last completed stage when the pipeline
+        # accepts the `stage_cache` hook.
+        stage_view = None
+        profiler = None
+        result = None
+        if STAGE_CACHE is not None:
+            stage_view = STAGE_CACHE.for_input(
+                input_fingerprint or fingerprint_file(str(input_path)), pipeline_model_versions(pipe)
+            )
+            cached = stage_view.get("full")
+            if cached:
+                result = _restore_cached_full(cached, f"full_{tmp_id}")
+                if result:
+                    logger.info("[FULL] Stage cache hit for %s", stage_view.fingerprint[:12])
+
+        # MT/TTS model calls from concurrent jobs are merged into micro-batches
+        batchers = get_batchers(pipe)
+        translate_fn = batchers["mt"].submit if "mt" in batchers else getattr(pipe, "translate_batch", None)
+        if "tts" in batchers:
+            synthesize_fn = lambda text: batchers["tts"].submit([text])[0]  # noqa: E731
+        else:
+            synthesize_fn = getattr(pipe, "synthesize", None)
+
+        # Translation memory wraps the (batched) translator as the `translate` hook
+        translator = None
+        if TRANSLATION_MEMORY is not None and translate_fn is not None:
+            translator = MemoTranslator(
+                TRANSLATION_MEMORY, translate_fn, pipeline_model_versions(pipe)["mt"]
+            )
+        elif "mt" in batchers:
+            translator = translate_fn
+
+        # TTS phrase cache wraps the (batched) synthesize(text) as the `synthesize` hook
+        synthesizer = None
+        if TTS_CACHE is not None and synthesize_fn is not None:
+            synthesizer = CachedSynthesizer(
+                TTS_CACHE,
+                synthesize_fn,
+                voice=getattr(pipe, "tts_voice", TTS_VOICE),
+                model_version=pipeline_model_versions(pipe)["tts"],
+                sample_rate=getattr(pipe, "tts_sample_rate", TTS_SAMPLE_RATE),
+            )
+        elif "tts" in batchers:
+            synthesizer = synthesize_fn
+
+        if result is None:
+            translate_hook, synthesize_hook = translator, synthesizer
+            # Per-stage wall/CPU/RSS timings; the hooks are timed here too in
+            # case the pipeline doesn't profile MT and TTS itself
+            # Live stage/segment progress for the caller, when it asked for it
+            reporter = None
+            if spec.get("progress_url"):
+                reporter = held.enter_context(closing(ProgressReporter(spec["progress_url"])))
+            profiler = held.enter_context(closing(StageProfiler(on_event=reporter)))
+            if translate_hook is not None:
+                translate_hook = profiler.observe("mt", translate_hook, batch=True)
+            if synthesize_hook is not None:
+                synthesize_hook = profiler.observe("tts", synthesize_hook, batch=False)
+            if job is not None:
+                if translate_hook is not None:
+                    translate_hook = _Counting(translate_hook, partial, "translated_sentences", batch=True)
+                if synthesize_hook is not None:
+                    synthesize_hook = _Counting(synthesize_hook, partial, "synthesized_phrases", batch=False)
+                if stage_view is not None:
+                    partial["stages_completed"] = stage_view.completed
+            partial["phase"] = "pipeline"
+            with _job_slots:
+                result = run_pipeline(
+                    pipe,
+                    str(input_path),
+                    f"full_{tmp_id}",
+                    stage_cache=stage_view,
+                    translate=translate_hook,
+                    synthesize=synthesize_hook,
+                    profiler=profiler,
+                )
+            partial["phase"] = "finishing"
 
         if not isinstance(result, dict):
-            return jsonify({"status": "error", "error": "Pipeline returned non-dict"}), 500
+            return {"status": "error", "error": "Pipeline returned non-dict"}, 500
+
+        succeeded = result.get("status", "success") == "success" and result.get("output")
+        if (
+            stage_view is not None
+            and succeeded
+            and "full" not in stage_view.hits
+            and 0 < _file_size(result["output"]) <= STAGE_CACHE_FULL_MAX_BYTES
+        ):
+            try:
+                cache_value = {k: v for k, v in result.items() if k != "pipeline_metrics"}
+                stage_view.put("full", cache_value, files={"output.mp4": result["output"]})
+            except Exception as exc:
+                logger.warning("[FULL] Could not cache result: %s", exc)
+
+        metrics = dict(result.get("pipeline_metrics") or {})
+        if profiler is not None and profiler.stages():
+            metrics["stages"] = {**profiler.stages(), **(metrics.get("stages") or {})}
+        if stage_view is not None:
+            metrics["stage_cache"] = stage_view.stats()
+        if isinstance(translator, MemoTranslator):
+            metrics["translation_memory"] = translator.stats()
+        if isinstance(synthesizer, CachedSynthesizer):
+            metrics["tts_cache"] = synthesizer.stats()
+        if batchers:
+            metrics["batching"] = {k: b.stats() for k, b in batchers.items() if k != "pipe"}
+        result["pipeline_metrics"] = metrics or None
 
         # ------------------------------------------------------------------
         # Normalize output path
         # ------------------------------------------------------------------
         out_path = result.get("output")
         if not out_path:
-            return jsonify({"status": "error", "error": "Pipeline returned no output file"}), 500
+            return {"status": "error", "error": "Pipeline returned no output file"}, 500
 
         # Convert backslashes → forward slashes
         out_path = out_path.replace("\\", "/")
         # Remove accidental leading slash
         out_path = out_path.lstrip("/")
 
+        if audio_only:
+            audio_path = CHUNK_OUTPUT_DIR / f"full_{tmp_id}.m4a"
+            audio_path.parent.mkdir(parents=True, exist_ok=True)
+            duration = clip_range[1] - clip_range[0] if clip_range else None
+            chunking.extract_audio(result["output"], str(audio_path), duration=duration)
+            Path(result["output"]).unlink(missing_ok=True)
+            out_path = audio_path.as_posix()
+
+        output_s3_uri = None
+        if not audio_only:
+            output_s3_uri = sink_output(result["output"], out_path)
+
         # ------------------------------------------------------------------
         # Extract timestamped segments from pipeline response
-        # The pipeline now returns english_segments and swahili_segments directly
+        # The pipeline now returns english_segments and swahili_segments directly.
+        # Never read them back off `pipe`: concurrent runs share the instance.
         # ------------------------------------------------------------------
         english_segments = result.get("english_segments", [])
         swahili_segments = result.get("swahili_segments", [])
-        
-        # Fallback: If segments not present (backward compatibility), try extracting from _block_timeline
-        if not english_segments and hasattr(pipe, '_block_timeline') and pipe._block_timeline:
-            blocks = pipe._block_timeline
-            for block in blocks:
-                en_text = block.get("text", "").strip()
-                if en_text:
-                    english_segments.append({
-                        "text": en_text,
-                        "start": float(block.get("start", 0.0)),
-                        "end": float(block.get("end", 0.0))
-                    })
-        
-        return jsonify(
+
+        return (
             {
                 "status": "success",
                 "english": result.get("english", ""),
@@ -173,15 +716,18 @@ def full_chain():
                 "english_segments": english_segments,  # List of {text, start, end}
                 "swahili_segments": swahili_segments,  # List of {text, start, end}
                 "output": out_path,  # backend expects this
+                "output_s3_uri": output_s3_uri,  # set when the output sink uploaded it
                 "pipeline_metrics": result.get("pipeline_metrics"),  # Optional: ASR confidence, model versions, etc.
-            }
+            },
+            200,
         )
 
     except Exception as exc:
         logger.exception("[FULL] Error: %s", exc)
-        return jsonify({"status": "error", "error": str(exc)}), 500
+        return {"status": "error", "error": str(exc)}, 500
 
     finally:
+        held.close()
         try:
             if tmp_path.exists():
                 tmp_path.unlink()
@@ -189,11 +735,242 @@ def full_chain():
             pass
 
 
+# -----------------------------------------------------------------------------
+# 8b) Asynchronous FULL pipeline: submit, then poll or receive a callback
+# -----------------------------------------------------------------------------
+@app.post("/jobs")
+def submit_job():
+    """
+    Accepts the same inputs as /full, plus an optional `callback_url` that
+    receives the final job document (as returned by GET /jobs/<id>) by POST.
+
+    Returns 202:
+        { "job_id": "...", "status": "queued", "status_url": "/jobs/<job_id>" }
+    """
+    spec, error = _accept_full_request()
+    if error is not None:
+        return error
+
+    record = JOBS.submit(lambda job: _run_full(spec, job), callback_url=spec["callback_url"])
+    logger.info("[JOBS] Accepted %s", record.id)
+    return jsonify({"job_id": record.id, "status": record.status, "status_url": f"/jobs/{record.id}"}), 202
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id):
+    """
+    Returns:
+        {
+            "job_id", "status": "queued" | "running" | "succeeded" | "failed",
+            "created_at", "started_at", "finished_at",
+            "partial": { "phase", "stages_completed", "translated_sentences", ... },
+            "result": { ...same body as /full... },   # once succeeded
+            "error": "..."                              # once failed
+        }
+    """
+    doc = JOBS.get_doc(job_id)
+    if doc is None:
+        return jsonify({"error": f"Unknown job: {job_id}", "code": "job_missing"}), 404
+    return jsonify(doc), 200
+
+
+# -----------------------------------------------------------------------------
+# 9) Chunked mode: stage a source, plan silence-aligned chunks, stitch results
+# -----------------------------------------------------------------------------
+@app.post("/sources")
+def stage_source():
+    """
+    Store a source video for chunked processing.
+
+    Accepts:
+        multipart/form-data { video: file }
+      or JSON { video_url } | { video_s3_uri } (fetched by this server)
+
+    Returns:
+        { "source_id": "<sha256>", "duration": 5400.0 }
+
+    Sources are content-addressed, so staging the same bytes twice is a no-op.
+    """
+    reference = reference_from(request.get_json(silent=True) or request.form)
+    if not reference and "video" not in request.files:
+        return jsonify({"error": "Missing 'video'"}), 400
+
+    staging = SOURCES_DIR / f".{uuid.uuid4().hex}.part"
+    try:
+        if reference:
+            try:
+                source_id = fetch_input(reference, str(staging), s3_client=S3_CLIENT)["sha256"]
+            except InputFetchError as exc:
+                return jsonify({"error": str(exc), "code": "input_fetch_failed"}), 502
+        else:
+            request.files["video"].save(staging)
+            source_id = fingerprint_file(str(staging))
+        dest = SOURCES_DIR / f"{source_id}.mp4"
+        if dest.exists():
+            staging.unlink(missing_ok=True)
+        else:
+            os.replace(staging, dest)
+        return jsonify({"source_id": source_id, "duration": chunking.probe_duration(str(dest))}), 200
+    except Exception as exc:
+        logger.exception("[SOURCES] %s", exc)
+        return jsonify({"error": str(exc)}), 500
+    finally:
+        staging.unlink(missing_ok=True)
+
+
+@app.delete("/sources/<source_id>")
+def release_source(source_id):
+    path = _source_path(source_id)
+    if path is not None:
+        path.unlink(missing_ok=True)
+    return jsonify({"status": "ok"}), 200
+
+
+@app.post("/chunks/plan")
+def plan_chunks():
+    """
+    Accepts:
+        application/json { source_id, target_seconds?, noise_db?, min_silence? }
+
+    Returns:
+        { "source_id", "duration", "chunks": [{ "index", "start", "end" }, ...] }
+    """
+    data = request.get_json(silent=True) or {}
+    source_id = data.get("source_id")
+    source_path = _source_path(source_id)
+    if source_path is None:
+        return _source_missing(source_id)
+
+    try:
+        target = float(data.get("target_seconds", os.getenv("CHUNK_TARGET_SECONDS", "600")))
+        duration = chunking.probe_duration(str(source_path))
+        silences = chunking.detect_silences(
+            str(source_path),
+            noise_db=float(data.get("noise_db", -35.0)),
+            min_silence=float(data.get("min_silence", 0.5)),
+        )
+    except Exception as exc:
+        logger.exception("[CHUNKS] %s", exc)
+        return jsonify({"error": str(exc)}), 500
+
+    chunks = chunking.plan_chunks(duration, silences, target)
+    logger.info("[CHUNKS] %s → %d chunks (%.1fs)", source_id[:12], len(chunks), duration)
+    return jsonify({"source_id": source_id, "duration": duration, "chunks": chunks}), 200
+
+
+@app.post("/stitch")
+def stitch():
+    """
+    Concatenate dubbed chunk audios and mux them onto the staged source once.
+
+    Accepts:
+        multipart/form-data { source_id, output_name?, chunk_0000: file, chunk_0001: file, ... }
+
+    Returns:
+        { "status": "success", "output": "outputs/demo_videos/<output_name>.mp4", "output_s3_uri": ... }
+    """
+    source_id = request.form.get("source_id")
+    source_path = _source_path(source_id)
+    if source_path is None:
+        return _source_missing(source_id)
+
+    names = sorted(k for k in request.files if k.startswith("chunk_"))
+    if not names:
+        return jsonify({"error": "No chunk audio provided"}), 400
+
+    output_name = request.form.get("output_name") or f"chunked_{uuid.uuid4().hex}"
+    dest = DEMO_OUTPUT_DIR / f"{Path(output_name).name}.mp4"
+
+    with tempfile.TemporaryDirectory(prefix="local_ai_stitch_") as workdir:
+        try:
+            audios = []
+            for name in names:
+                path = Path(workdir) / f"{name}.m4a"
+                request.files[name].save(path)
+                audios.append(str(path))
+            chunking.stitch_audio_and_mux(str(source_path), audios, str(dest), workdir)
+        except Exception as exc:
+            logger.exception("[STITCH] %s", exc)
+            return jsonify({"status": "error", "error": str(exc)}), 500
+
+    return jsonify(
+        {"status": "success", "output": dest.as_posix(), "output_s3_uri": sink_output(str(dest), dest.as_posix())}
+    ), 200
+
+
+# -----------------------------------------------------------------------------
+# Translation memory management
+# -----------------------------------------------------------------------------
+@app.post("/tm/import")
+def tm_import():
+    """
+    Warm the translation memory.
+
+    Accepts:
+        application/json { "pairs": [["english", "swahili"], ...], "source": "backend",
+                           "model_version": "nllb-lora" }
+
+    Pairs are recorded for `model_version`, by default the current MT model,
+    so lookups serve them until the MT model changes.
+    """
+    if TRANSLATION_MEMORY is None:
+        return jsonify({"error": "Translation memory disabled"}), 503
+
+    data = request.get_json(silent=True) or {}
+    pairs = data.get("pairs") or []
+    if not isinstance(pairs, list):
+        return jsonify({"error": "'pairs' must be a list"}), 400
+
+    clean = [
+        (str(p[0]), str(p[1]))
+        for p in pairs
+        if isinstance(p, (list, tuple)) and len(p) == 2 and p[0] and p[1]
+    ]
+    model_version = data.get("model_version") or current_mt_version()
+    written = TRANSLATION_MEMORY.store(clean, model_version=model_version)
+    logger.info("[TM] Imported %d pairs from %s as %s", written, data.get("source", "import"), model_version)
+    return jsonify({"status": "ok", "received": len(pairs), "stored": written}), 200
+
+
+@app.get("/tm/stats")
+def tm_stats():
+    if TRANSLATION_MEMORY is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **TRANSLATION_MEMORY.stats()}), 200
+
+
 # -----------------------------------------------------------------------------
 # File download
 # -----------------------------------------------------------------------------
+_digest_cache = {}
+_digest_lock = threading.Lock()
+
+
+def _file_digest(path: Path) -> str:
+    """Base64 SHA-256 of a file, cached per (path, size, mtime)."""
+    st = path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    with _digest_lock:
+        if key in _digest_cache:
+            return _digest_cache[key]
+    digest = base64.b64encode(bytes.fromhex(fingerprint_file(str(path)))).decode()
+    with _digest_lock:
+        if len(_digest_cache) > 256:
+            _digest_cache.clear()
+        _digest_cache[key] = digest
+    return digest
+
+
 @app.get("/files")
 def download_file():
+    """
+    Serve a file produced by the pipeline.
+
+    Range / If-Range and ETag / If-None-Match are honoured (HEAD too), so
+    clients can resume a dropped download or fetch byte ranges in parallel.
+    Send `Want-Digest: sha-256` to get a `Digest: sha-256=<base64>` header
+    to verify the reassembled file against.
+    """
     rel_path = request.args.get("path")
     if not rel_path:
         return jsonify({"error": "Missing 'path'"}), 400
@@ -207,7 +984,10 @@ def download_file():
         return jsonify({"error": f"File not found: {file_path}"}), 404
 
     try:
-        return send_file(file_path, as_attachment=True)
+        resp = send_file(file_path, as_attachment=True, conditional=True, etag=True)
+        if "sha-256" in request.headers.get("Want-Digest", "").lower():
+            resp.headers["Digest"] = f"sha-256={_file_digest(file_path)}"
+        return resp
     except Exception as exc:
         logger.exception("[FILES] %s", exc)
         return jsonify({"error": str(exc)}), 500
@@ -219,4 +999,6 @@ def download_file():
 if __name__ == "__main__":
     port = int(os.getenv("EXTERNAL_AI_PORT", "7001"))
     logger.info(f"Starting Local AI Server on 0.0.0.0:{port}")
-    app.run(host="0.0.0.0", port=port)
+    WARMUP.start()
+    # Threaded so concurrent jobs can share MT/TTS micro-batches
+    app.run(host="0.0.0.0", port=port, threaded=True)
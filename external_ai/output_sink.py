@@ -0,0 +1,80 @@
+# external_ai/output_sink.py
+"""
+Output sink: upload finished dubbed videos straight to the MinIO outputs
+bucket, so the Celery worker gets an s3:// URI back instead of pulling the
+file through GET /files and re-uploading it.
+
+Object names follow the worker's convention (path relative to "outputs/"),
+so a video lands at the same key whichever side uploads it.
+"""
+
+import logging
+import os
+from mimetypes import guess_type
+from pathlib import Path
+
+logger = logging.getLogger("output_sink")
+
+
+def minio_from_env():
+    """MinIO client from the same S3_* settings the backend uses, or None if unset."""
+    endpoint = os.getenv("S3_ENDPOINT")
+    access_key = os.getenv("S3_ACCESS_KEY")
+    secret_key = os.getenv("S3_SECRET_KEY")
+    if not all([endpoint, access_key, secret_key]):
+        return None
+
+    from minio import Minio
+
+    return Minio(
+        endpoint.replace("http://", "").replace("https://", "").strip("/"),
+        access_key=access_key,
+        secret_key=secret_key,
+        secure=os.getenv("S3_SECURE", "False").lower() == "true",
+    )
+
+
+def object_name_for(local_path: str) -> str:
+    clean = str(local_path).replace("\\", "/").lstrip("/")
+    if clean.startswith("outputs/"):
+        clean = clean[len("outputs/"):]
+    return clean.lstrip("/")
+
+
+class MinioOutputSink:
+    def __init__(self, client, bucket: str, part_size: int = 16 * 1024 * 1024):
+        self.client = client
+        self.bucket = bucket
+        self.part_size = part_size
+        self._bucket_checked = False
+
+    @classmethod
+    def from_env(cls):
+        """Build a sink from S3_* settings, or None when disabled / not configured."""
+        if os.getenv("OUTPUT_SINK_ENABLED", "true").lower() not in ("1", "true", "yes"):
+            return None
+        client = minio_from_env()
+        if client is None:
+            return None
+        part_size = max(int(os.getenv("UPLOAD_PART_SIZE_MB", "16")), 5) * 1024 * 1024
+        return cls(client, os.getenv("S3_BUCKET_OUTPUTS", "outputs"), part_size)
+
+    def put(self, local_path: str, object_name: str | None = None) -> dict:
+        """Stream a local file into the outputs bucket. Returns {"uri", "object_name", "size"}."""
+        if not self._bucket_checked:
+            if not self.client.bucket_exists(self.bucket):
+                self.client.make_bucket(self.bucket)
+            self._bucket_checked = True
+
+        object_name = object_name or object_name_for(local_path)
+        content_type = guess_type(str(local_path))[0] or "application/octet-stream"
+        self.client.fput_object(
+            self.bucket,
+            object_name,
+            str(local_path),
+            content_type=content_type,
+            part_size=self.part_size,
+        )
+        size = Path(local_path).stat().st_size
+        logger.info("[SINK] Uploaded %s → s3://%s/%s (%d bytes)", local_path, self.bucket, object_name, size)
+        return {"uri": f"s3://{self.bucket}/{object_name}", "object_name": object_name, "size": size}
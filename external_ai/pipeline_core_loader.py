@@ -1,51 +1,243 @@
 # external_ai/pipeline_core_loader.py
+"""
+Lazy, configurable, hot-swappable loader for the dubbing pipeline.
 
+Which pipeline to load comes from the environment:
+
+    PIPELINE_IMPL   "module:Class" (default: the LocalDubbingPipeline of the
+                    training repo) or "stub" for the built-in CPU stub
+    PIPELINE_ROOT   checkout of the training repo, added to sys.path before
+                    importing PIPELINE_IMPL. Required unless PIPELINE_IMPL=stub;
+                    loading fails with a configuration error without it
+
+Nothing heavy is imported until the first get_pipeline() / pipeline_lease().
+
+reload_pipeline() swaps in a fresh instance (new weights, or a different
+PIPELINE_IMPL) without restarting the server:
+
+    overlap (default)  load the new instance next to the old one, route new
+                       requests to it at once, and free the old one when
+                       the requests still using it have finished
+    drain              stop admitting requests, wait for in-flight ones,
+                       free the old instance, then load the new one (for
+                       GPUs that can't hold two copies)
+
+Requests hold the instance through pipeline_lease(), which is what the
+reload waits on.
+"""
+
+import gc
+import importlib
 import logging
+import os
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 logger = logging.getLogger("pipeline_loader")
 
-# -----------------------------------------------------------------------------
-# Fixed absolute pipeline root
-# -----------------------------------------------------------------------------
-PIPELINE_ROOT = Path(
-    r"C:\Users\hp omen 16\Projects\4.2\CSII\educational_dubbing_pipeline_tr"
-).resolve()
-
-if not PIPELINE_ROOT.exists():
-    raise RuntimeError(f"Pipeline root does not exist: {PIPELINE_ROOT}")
-
-# Add root to module import path
-if str(PIPELINE_ROOT) not in sys.path:
-    sys.path.insert(0, str(PIPELINE_ROOT))
-
-logger.info(f"📁 Using pipeline root: {PIPELINE_ROOT}")
-
-# -----------------------------------------------------------------------------
-# Import LocalDubbingPipeline
-# -----------------------------------------------------------------------------
-try:
-    from src.inference.local_pipeline.core import LocalDubbingPipeline # pyright: ignore[reportMissingImports]
-except Exception as e:
-    logger.error("❌ Failed to import LocalDubbingPipeline: %s", e)
-    raise
-
-# -----------------------------------------------------------------------------
-# Singleton loader
-# -----------------------------------------------------------------------------
-_PIPELINE = None
-
-def get_pipeline() -> "LocalDubbingPipeline":
+DEFAULT_IMPL = "src.inference.local_pipeline.core:LocalDubbingPipeline"
+
+PIPELINE_IMPL = os.getenv("PIPELINE_IMPL", DEFAULT_IMPL)
+PIPELINE_ROOT = Path(os.environ["PIPELINE_ROOT"]).resolve() if os.getenv("PIPELINE_ROOT") else None
+PIPELINE_RELOAD_MODE = os.getenv("PIPELINE_RELOAD_MODE", "overlap")
+
+
+class _Slot:
+    def __init__(self, instance, impl: str, generation: int, load_seconds: float):
+        self.instance = instance
+        self.impl = impl
+        self.generation = generation
+        self.load_seconds = load_seconds
+        self.in_flight = 0
+
+
+_current = None
+_generation = 0
+_admitting = True
+_last_reload = None
+_reloading = False
+_cond = threading.Condition()
+# Serialises loads: the first lazy load and every reload
+_load_lock = threading.Lock()
+
+
+def resolve_impl(impl: str):
+    """Import and return the pipeline class named by `impl`."""
+    if impl == "stub":
+        from stub_pipeline import StubDubbingPipeline
+
+        return StubDubbingPipeline
+
+    module_name, _, attr = impl.partition(":")
+    if not attr:
+        raise ValueError(f"PIPELINE_IMPL must look like 'module:Class', got {impl!r}")
+    if PIPELINE_ROOT is None:
+        raise RuntimeError(
+            f"PIPELINE_ROOT is not set, so {impl} cannot be loaded. "
+            "Set PIPELINE_ROOT to the training repo checkout, or PIPELINE_IMPL=stub on test machines."
+        )
+    if not PIPELINE_ROOT.is_dir():
+        raise RuntimeError(
+            f"PIPELINE_ROOT={PIPELINE_ROOT} does not exist. "
+            "Set PIPELINE_ROOT to the training repo checkout, or PIPELINE_IMPL=stub on test machines."
+        )
+    if str(PIPELINE_ROOT) not in sys.path:
+        sys.path.insert(0, str(PIPELINE_ROOT))
+        logger.info(f"📁 Using pipeline root: {PIPELINE_ROOT}")
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as exc:
+        raise RuntimeError(
+            f"Cannot import {module_name} from PIPELINE_ROOT={PIPELINE_ROOT}. "
+            "Set PIPELINE_ROOT to the training repo checkout, or PIPELINE_IMPL=stub on test machines."
+        ) from exc
+    return getattr(module, attr)
+
+
+def _build(impl: str) -> _Slot:
+    global _generation
+    t0 = time.perf_counter()
+    logger.info("🔥 Initializing %s", impl)
+    instance = resolve_impl(impl)()
+    load_seconds = time.perf_counter() - t0
+    _generation += 1
+    logger.info("✅ %s initialized in %.1fs (generation %d)", impl, load_seconds, _generation)
+    return _Slot(instance, impl, _generation, load_seconds)
+
+
+def _free(slot: _Slot):
+    close = getattr(slot.instance, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as exc:
+            logger.warning("Closing pipeline generation %d failed: %s", slot.generation, exc)
+    slot.instance = None
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def _ensure_loaded() -> _Slot:
+    global _current
+    if _current is None:
+        with _load_lock:
+            if _current is None:
+                slot = _build(PIPELINE_IMPL)
+                with _cond:
+                    _current = slot
+                    _cond.notify_all()
+    return _current
+
+
+def get_pipeline():
     """
-    Instantiate only once.
-    Heavy models (Whisper, MT, TTS) load a single time.
+    Current pipeline instance, loaded on first use.
+    Heavy models (Whisper, MT, TTS) load a single time; a request arriving
+    while the background warmup is loading them waits for it.
     """
-    global _PIPELINE
+    return _ensure_loaded().instance
+
+
+@contextmanager
+def pipeline_lease():
+    """Use the current pipeline for one request; a reload frees it only after release."""
+    while True:
+        _ensure_loaded()
+        with _cond:
+            while not _admitting:
+                _cond.wait()
+            slot = _current
+            if slot is not None:
+                slot.in_flight += 1
+                break
+    try:
+        yield slot.instance
+    finally:
+        with _cond:
+            slot.in_flight -= 1
+            _cond.notify_all()
+
+
+def _wait_drained(slot: _Slot, timeout: float | None) -> float:
+    t0 = time.perf_counter()
+    with _cond:
+        if not _cond.wait_for(lambda: slot.in_flight == 0, timeout=timeout):
+            raise TimeoutError(f"{slot.in_flight} request(s) still using generation {slot.generation}")
+    return time.perf_counter() - t0
+
+
+def reload_pipeline(impl: str | None = None, mode: str | None = None, drain_timeout: float | None = None) -> dict:
+    """Swap in a freshly loaded pipeline (see module docstring). Returns a summary."""
+    global _current, _admitting, _last_reload, _reloading, PIPELINE_IMPL
+    impl = impl or PIPELINE_IMPL
+    mode = mode or PIPELINE_RELOAD_MODE
+    with _load_lock:
+        with _cond:
+            _reloading = True
+        try:
+            old = _current
+            drained = 0.0
+            if mode == "drain":
+                with _cond:
+                    _admitting = False
+                new = None
+                try:
+                    if old is not None:
+                        drained = _wait_drained(old, drain_timeout)
+                        with _cond:
+                            _current = None
+                        _free(old)
+                    new = _build(impl)
+                finally:
+                    # Also after a failed load: admitted requests then lazily retry it
+                    with _cond:
+                        if new is not None:
+                            _current = new
+                        _admitting = True
+                        _cond.notify_all()
+            else:
+                new = _build(impl)
+                with _cond:
+                    _current = new
+                    _cond.notify_all()
+                if old is not None:
+                    try:
+                        drained = _wait_drained(old, drain_timeout)
+                        _free(old)
+                    except TimeoutError as exc:
+                        # Still safe: the old instance is garbage once its last lease ends
+                        logger.warning("[LOADER] Not closing old pipeline: %s", exc)
+                        drained = None
+            PIPELINE_IMPL = impl
+            _last_reload = {
+                "generation": new.generation,
+                "impl": impl,
+                "mode": mode,
+                "load_seconds": round(new.load_seconds, 3),
+                "drain_seconds": round(drained, 3) if drained is not None else None,
+                "finished_at": time.time(),
+            }
+            logger.info("[LOADER] Reloaded pipeline: %s", _last_reload)
+            return dict(_last_reload)
+        finally:
+            with _cond:
+                _reloading = False
 
-    if _PIPELINE is None:
-        logger.info("🔥 Initializing LocalDubbingPipeline")
-        _PIPELINE = LocalDubbingPipeline()
-        logger.info("✅ LocalDubbingPipeline initialized")
 
-    return _PIPELINE
+def status() -> dict:
+    with _cond:
+        slot = _current
+        return {
+            "impl": slot.impl if slot else PIPELINE_IMPL,
+            "loaded": slot is not None,
+            "generation": slot.generation if slot else None,
+            "in_flight": slot.in_flight if slot else 0,
+            "admitting": _admitting,
+            "reloading": _reloading,
+            "last_reload": _last_reload,
+        }
@@ -0,0 +1,139 @@
+# external_ai/progress_events.py
+"""
+Live progress for a pipeline run, POSTed to a `progress_url`.
+
+A ProgressReporter is the StageProfiler's `on_event` listener. It keeps a
+snapshot of the run (stage states, per-stage item counts, an overall
+percentage) and POSTs it from a background thread at most every
+PROGRESS_MIN_INTERVAL_SECONDS (default 2). Every POST carries the whole
+snapshot with an increasing `seq`, so a newer one supersedes anything older.
+Events that arrive in between are coalesced, and a lost POST is repaired by
+the next one.
+
+Overall progress weights the stages by their typical share of a run.
+Within MT and TTS, it counts segments against the number ASR produced.
+When a later stage starts, earlier stages the pipeline never reported are
+counted as done.
+
+Delivery is best effort, since the final result doesn't depend on it.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from stage_profiler import STAGES
+
+logger = logging.getLogger("progress_events")
+
+PROGRESS_MIN_INTERVAL_SECONDS = float(os.getenv("PROGRESS_MIN_INTERVAL_SECONDS", "2"))
+
+# Rough share of a run's wall time per stage (sums to 100)
+STAGE_WEIGHTS = {
+    "asr": 30,
+    "punctuation": 5,
+    "mt": 15,
+    "tts": 25,
+    "separation": 15,
+    "mix": 5,
+    "mux": 5,
+}
+
+# Stages whose items are segments that ASR produced
+PER_SEGMENT = ("punctuation", "mt", "tts")
+
+
+class ProgressReporter:
+    def __init__(self, url: str, min_interval: float = PROGRESS_MIN_INTERVAL_SECONDS, timeout: float = 5.0):
+        self.url = url
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.seq = 0
+        self.current = None
+        self.states = {}
+        self.items = {}
+        self.sent = 0
+        self._dirty = False
+        self._closed = False
+        self._failed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def __call__(self, kind: str, stage: str, items: int):
+        """StageProfiler on_event listener."""
+        with self._cond:
+            if kind == "end":
+                self.states[stage] = "succeeded"
+            elif self.states.get(stage) != "running":
+                self.states[stage] = "running"
+                self.current = stage
+            self.items[stage] = items
+            self._dirty = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="progress", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return self._snapshot()
+
+    def _snapshot(self) -> dict:
+        stage_progress = {}
+        latest = max((STAGES.index(s) for s in self.states if s in STAGES), default=-1)
+        segments = self.items.get("asr") if self.states.get("asr") == "succeeded" else None
+        for i, stage in enumerate(STAGES):
+            state = self.states.get(stage)
+            if state == "succeeded" or (state is None and i < latest):
+                stage_progress[stage] = 100.0
+            elif state == "running":
+                done = self.items.get(stage, 0)
+                if stage in PER_SEGMENT and segments:
+                    stage_progress[stage] = round(min(done / segments, 0.99) * 100, 1)
+                else:
+                    stage_progress[stage] = 0.0
+        overall = sum(STAGE_WEIGHTS[s] * p / 100 for s, p in stage_progress.items())
+        return {
+            "seq": self.seq,
+            "stage": self.current,
+            "stages": dict(self.states),
+            "stage_progress": stage_progress,
+            "items": dict(self.items),
+            "progress": round(overall, 1),
+            "sent_at": time.time(),
+        }
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty or self._closed)
+                if not self._dirty:
+                    return
+                self.seq += 1
+                snap = self._snapshot()
+                self._dirty = False
+            self._send(snap)
+            with self._cond:
+                # Throttle: later events pile up into the next snapshot
+                self._cond.wait_for(lambda: self._closed, timeout=self.min_interval)
+
+    def _send(self, snap: dict):
+        try:
+            requests.post(self.url, json=snap, timeout=self.timeout)
+            self.sent += 1
+        except requests.RequestException as exc:
+            if not self._failed:
+                logger.warning("[PROGRESS] Could not post progress to %s: %s", self.url, exc)
+                self._failed = True
+
+    def close(self):
+        """Send whatever is pending, then stop."""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(self.timeout + 1)
@@ -0,0 +1,427 @@
+# external_ai/serve.py
+"""
+Pre-fork production server for external_ai.
+
+    python serve.py --workers 4 --port 7001
+
+The master process imports the app and loads the pipeline once, freezes
+the GC so those objects stay on shared pages, then forks N inference
+workers. Model weights loaded before the fork are shared copy-on-write
+instead of being loaded N times.
+
+All workers accept from one listening socket and, by default, serve one
+request at a time, so the socket's accept queue (`--backlog`) is the request
+queue: the next request goes to whichever worker is idle. Requests that
+spawn background work (/jobs) still return at once.
+
+Trade-off: local_ai_server merges MT/TTS calls into micro-batches only
+within one process. With one request per worker, concurrent /full requests
+land in different workers and are never batched together; only /jobs runs
+started in the same worker are. `--threads N` lets each worker serve up to N
+requests at once (it stops accepting while all N are busy), so concurrent
+/full requests share a worker's batchers, at the cost of N pipeline runs
+competing for that worker's CPU/GPU.
+
+The master restarts workers that exit, or whose heartbeat stops, or that
+have been stuck on one request for longer than `--request-timeout`. Any
+worker answers GET /workers with the state of the whole pool.
+
+SIGHUP to the master (or POST /pipeline/reload to any worker) rolls out new
+models without downtime: the master reloads the pipeline, forks fresh
+workers from it, and retires the old ones gracefully: they stop accepting,
+finish their current request and background jobs, then exit.
+
+CUDA contexts don't survive fork(), so on a GPU host each worker loads its
+own models after the fork (`--preload auto`, the default, only preloads on
+CPU).
+"""
+
+import argparse
+import gc
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+from werkzeug.wrappers import Response
+
+logger = logging.getLogger("serve")
+
+FIELDS = ("pid", "started_at", "heartbeat", "requests", "busy_since")
+
+
+class WorkerTable:
+    """
+    Per-worker counters in shared memory, readable from every process.
+
+    Lock-free on purpose: each row is only written by its own worker (and by
+    the master while that worker is down), and a worker SIGKILLed while
+    holding a shared lock would wedge the whole pool.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._arr = multiprocessing.RawArray("d", size * len(FIELDS))
+
+    def _base(self, index: int) -> int:
+        return index * len(FIELDS)
+
+    def set(self, index: int, **values):
+        for name, value in values.items():
+            self._arr[self._base(index) + FIELDS.index(name)] = value
+
+    def incr(self, index: int, name: str):
+        self._arr[self._base(index) + FIELDS.index(name)] += 1
+
+    def row(self, index: int) -> dict:
+        values = self._arr[self._base(index):self._base(index) + len(FIELDS)]
+        return dict(zip(FIELDS, values))
+
+    def snapshot(self) -> list[dict]:
+        now = time.time()
+        rows = []
+        for i in range(self.size):
+            row = self.row(i)
+            rows.append(
+                {
+                    "index": i,
+                    "pid": int(row["pid"]),
+                    "uptime_seconds": round(now - row["started_at"], 1) if row["started_at"] else None,
+                    "heartbeat_age_seconds": round(now - row["heartbeat"], 1) if row["heartbeat"] else None,
+                    "requests": int(row["requests"]),
+                    "busy_seconds": round(now - row["busy_since"], 1) if row["busy_since"] else None,
+                }
+            )
+        return rows
+
+
+class _PoolMiddleware:
+    """Counts requests, marks the worker busy, and serves GET /workers."""
+
+    def __init__(self, app, table: WorkerTable, index: int, retiring: threading.Event):
+        self.app = app
+        self.table = table
+        self.index = index
+        self.retiring = retiring
+        # Start times of the requests in flight (several with --threads)
+        self._lock = threading.Lock()
+        self._started = {}
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._started)
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") == "/workers":
+            import json
+
+            rows = self.table.snapshot()
+            body = {
+                "workers": rows,
+                "idle": sum(1 for r in rows if r["pid"] and r["busy_seconds"] is None),
+                "served_by": os.getpid(),
+            }
+            return Response(json.dumps(body), mimetype="application/json")(environ, start_response)
+
+        token = object()
+        with self._lock:
+            self._started[token] = time.time()
+            self.table.set(self.index, busy_since=min(self._started.values()))
+        try:
+            return self.app(environ, start_response)
+        finally:
+            with self._lock:
+                del self._started[token]
+                # Once retiring, this row belongs to the replacement worker
+                if not self.retiring.is_set():
+                    # busy_since is the oldest request still running, so
+                    # --request-timeout still means "stuck on one request"
+                    self.table.set(self.index, busy_since=min(self._started.values(), default=0))
+                    self.table.incr(self.index, "requests")
+
+
+class _Retire(Exception):
+    pass
+
+
+def _heartbeat(table: WorkerTable, index: int, interval: float, retiring: threading.Event):
+    while not retiring.is_set():
+        table.set(index, heartbeat=time.time())
+        time.sleep(interval)
+
+
+def _limit_threads(server, threads: int):
+    """Make a threaded werkzeug server accept only while fewer than `threads` requests run."""
+    slots = threading.BoundedSemaphore(threads)
+    get_request = server.get_request
+    process_request_thread = server.process_request_thread
+
+    def bounded_get_request():
+        # Waiting before accept() leaves the connection to an idle worker
+        slots.acquire()
+        try:
+            return get_request()
+        except BaseException:
+            slots.release()
+            raise
+
+    def bounded_process_request_thread(request, client_address):
+        try:
+            process_request_thread(request, client_address)
+        finally:
+            slots.release()
+
+    server.get_request = bounded_get_request
+    server.process_request_thread = bounded_process_request_thread
+
+
+def _run_worker(index, sock, app_loader, post_fork, table, heartbeat_interval, background_busy, threads=1):
+    retiring = threading.Event()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGQUIT, lambda signum, frame: retiring.set())
+    now = time.time()
+    table.set(index, pid=os.getpid(), started_at=now, heartbeat=now, requests=0, busy_since=0)
+    if post_fork is not None:
+        post_fork()
+    app = app_loader()
+    threading.Thread(target=_heartbeat, args=(table, index, heartbeat_interval, retiring), daemon=True).start()
+
+    host, port = sock.getsockname()[:2]
+    middleware = _PoolMiddleware(app, table, index, retiring)
+    server = make_server(host, port, middleware, threaded=threads > 1, fd=sock.fileno())
+    if threads > 1:
+        _limit_threads(server, threads)
+
+    def service_actions():
+        # Runs between requests, so a retiring worker never drops one
+        if retiring.is_set():
+            raise _Retire
+
+    server.service_actions = service_actions
+    logger.info("[SERVE] Worker %d (pid %d) ready", index, os.getpid())
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except _Retire:
+        pass
+    # Let requests still running on other threads and background work
+    # (async /jobs) finish before exiting
+    while middleware.in_flight() or (background_busy is not None and background_busy()):
+        time.sleep(1)
+    logger.info("[SERVE] Worker %d (pid %d) retired", index, os.getpid())
+
+
+def serve(
+    app_loader,
+    workers: int = 2,
+    host: str = "0.0.0.0",
+    port: int = 7001,
+    preload: bool = True,
+    post_fork=None,
+    backlog: int = 128,
+    heartbeat_interval: float = 2.0,
+    heartbeat_timeout: float = 30.0,
+    request_timeout: float = 0.0,
+    threads: int = 1,
+    ready=None,
+    on_reload=None,
+    background_busy=None,
+):
+    """
+    Fork `workers` processes serving `app_loader()` from one socket; returns on SIGTERM/SIGINT.
+
+    With `preload`, `app_loader()` runs once in the master before forking so
+    whatever it loads is shared; each worker then calls `post_fork()` and
+    `app_loader()` again (expected to return the already-built app).
+    Each worker serves up to `threads` requests at once.
+    `ready(port)` is called once the socket is listening. On SIGHUP the
+    master calls `on_reload()` (with `preload`) and replaces every worker;
+    a retiring worker exits once `background_busy()` is false.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+
+    if preload:
+        t0 = time.perf_counter()
+        app_loader()
+        logger.info("[SERVE] Preloaded app in %.1fs", time.perf_counter() - t0)
+        gc.collect()
+        # Keep refcount/GC writes from touching (and copying) the preloaded pages
+        gc.freeze()
+
+    table = WorkerTable(workers)
+    children = {}
+    retiring = set()
+    stopping = False
+    reload_requested = False
+    # Lets a worker's POST /pipeline/reload ask the master for a rolling restart
+    os.environ["EXTERNAL_AI_MASTER_PID"] = str(os.getpid())
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(index, sock, app_loader, post_fork, table, heartbeat_interval, background_busy, threads)
+            except Exception:
+                logger.exception("[SERVE] Worker %d crashed", index)
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = index
+        logger.info("[SERVE] Forked worker %d as pid %d", index, pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    def hup(signum, frame):
+        nonlocal reload_requested
+        reload_requested = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, hup)
+
+    for i in range(workers):
+        spawn(i)
+    if ready is not None:
+        ready(sock.getsockname()[1])
+
+    while not stopping:
+        time.sleep(0.5)
+        if reload_requested:
+            reload_requested = False
+            if preload and on_reload is not None:
+                gc.unfreeze()
+                t0 = time.perf_counter()
+                try:
+                    on_reload()
+                except Exception:
+                    logger.exception("[SERVE] Reload failed; keeping the current workers")
+                    gc.freeze()
+                    continue
+                gc.collect()
+                gc.freeze()
+                logger.info("[SERVE] Reloaded in %.1fs", time.perf_counter() - t0)
+            for pid, index in list(children.items()):
+                os.kill(pid, signal.SIGQUIT)
+                del children[pid]
+                retiring.add(pid)
+                spawn(index)
+            logger.info("[SERVE] Rolling restart: retiring %d worker(s)", len(retiring))
+
+        while children or retiring:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            if pid in retiring:
+                retiring.discard(pid)
+                continue
+            index = children.pop(pid, None)
+            if index is not None and not stopping:
+                logger.warning("[SERVE] Worker %d (pid %d) exited with %s; restarting", index, pid, status)
+                table.set(index, pid=0, busy_since=0)
+                spawn(index)
+
+        now = time.time()
+        for pid, index in list(children.items()):
+            row = table.row(index)
+            if int(row["pid"]) != pid:
+                continue  # still starting up
+            hung = row["heartbeat"] and now - row["heartbeat"] > heartbeat_timeout
+            stuck = request_timeout and row["busy_since"] and now - row["busy_since"] > request_timeout
+            if hung or stuck:
+                logger.error("[SERVE] Worker %d (pid %d) %s; killing", index, pid, "hung" if hung else "stuck")
+                os.kill(pid, signal.SIGKILL)
+
+    for pid in [*children, *retiring]:
+        os.kill(pid, signal.SIGTERM)
+    for pid in [*children, *retiring]:
+        os.waitpid(pid, 0)
+    sock.close()
+    logger.info("[SERVE] Stopped")
+
+
+def _local_ai_server_loader(preload_pipeline: bool):
+    def load():
+        server = importlib.import_module("local_ai_server")
+        if preload_pipeline:
+            # In the master: load fully before forking (no-op once ready)
+            server.WARMUP.run()
+        else:
+            # In each worker: load in the background; /ready reports progress
+            server.WARMUP.start()
+        return server.app
+
+    return load
+
+
+def _background_busy() -> bool:
+    server = sys.modules.get("local_ai_server")
+    return server is not None and server.background_busy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EXTERNAL_AI_WORKERS", "2")))
+    parser.add_argument("--host", default=os.getenv("EXTERNAL_AI_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("EXTERNAL_AI_PORT", "7001")))
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("EXTERNAL_AI_BACKLOG", "128")))
+    parser.add_argument("--preload", choices=("auto", "yes", "no"), default=os.getenv("EXTERNAL_AI_PRELOAD", "auto"))
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=float(os.getenv("EXTERNAL_AI_REQUEST_TIMEOUT", "0")),
+        help="Kill a worker stuck on one request this long (0 = never)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.getenv("EXTERNAL_AI_THREADS", "1")),
+        help="Requests each worker serves at once; >1 lets concurrent /full requests share MT/TTS batches",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # Any worker must be able to answer /jobs/<id> for a job another one runs
+    os.environ.setdefault("ASYNC_JOB_STATE_DIR", os.path.join(tempfile.gettempdir(), "local_ai_jobs"))
+
+    preload = args.preload == "yes"
+    if args.preload == "auto":
+        try:
+            import torch
+        except ImportError:
+            torch = None
+        preload = torch is None or not torch.cuda.is_available()
+
+    server = importlib.import_module("local_ai_server") if preload else None
+    serve(
+        _local_ai_server_loader(preload),
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        preload=preload,
+        post_fork=server.post_fork if server else None,
+        backlog=args.backlog,
+        request_timeout=args.request_timeout,
+        threads=max(1, args.threads),
+        on_reload=server.pipeline_core_loader.reload_pipeline if server else None,
+        background_busy=_background_busy,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# external_ai/stage_cache.py
+"""
+On-disk cache for pipeline stage outputs.
+
+Entries are directories under the cache root holding a `value.json` and any
+artifact files (ASR segments, translations, TTS WAVs, the separated music
+stem, ...). Recency is tracked through the entry directory's mtime, which is
+bumped on every hit, and the least recently used entries are evicted once
+the cache grows past its size cap.
+
+The cache keeps a running byte total, updated by put() and evict(), so a put
+costs only the size of its own entry. The directory is scanned only when that
+total crosses the cap, or when the last scan is older than `rescan_seconds`
+(other processes may share the cache directory, e.g. serve.py workers).
+
+Stage keys combine the input fingerprint with the model identifiers of the
+stage *and every stage it depends on*, so swapping e.g. the ASR model also
+invalidates cached translations and TTS for that input.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger("stage_cache")
+
+# Which model identifiers feed into each stage's output
+STAGE_DEPENDENCIES = {
+    "asr": ["asr"],
+    "punctuation": ["asr", "punctuation"],
+    "mt": ["asr", "punctuation", "mt"],
+    "tts": ["asr", "punctuation", "mt", "tts"],
+    "separation": ["separation"],
+    "mix": ["asr", "punctuation", "mt", "tts", "separation"],
+    "full": ["asr", "punctuation", "mt", "tts", "separation"],
+}
+
+
+def fingerprint_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskLRU:
+    """Size-bounded directory-per-entry store with LRU eviction."""
+
+    VALUE_FILE = "value.json"
+
+    def __init__(self, root: str, max_bytes: int, rescan_seconds: float = 60.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.rescan_seconds = rescan_seconds
+        self._lock = threading.Lock()
+        # Bytes on disk as of the last scan plus puts since; None until the first scan
+        self._total = None
+        self._scanned_at = 0.0
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        try:
+            return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+        except OSError:
+            return 0
+
+    def get(self, key: str) -> dict | None:
+        """Return {"value": ..., "files": {name: path}} or None, refreshing recency on hit."""
+        entry = self._entry_dir(key)
+        value_path = entry / self.VALUE_FILE
+        if not value_path.exists():
+            return None
+        try:
+            value = json.loads(value_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            # Evicted between the check and the read
+            return None
+        except (OSError, ValueError):
+            logger.warning("[CACHE] Dropping unreadable entry %s", key)
+            with self._lock:
+                size = self._dir_size(entry)
+                shutil.rmtree(entry, ignore_errors=True)
+                if self._total is not None:
+                    self._total -= size
+            return None
+
+        now = time.time()
+        try:
+            os.utime(entry, (now, now))
+        except OSError:
+            pass
+
+        try:
+            files = {p.name: str(p) for p in entry.iterdir() if p.name != self.VALUE_FILE}
+        except OSError:
+            # Evicted or replaced since the read above: a miss
+            return None
+        return {"value": value, "files": files}
+
+    def put(self, key: str, value, files: dict | None = None) -> dict:
+        """
+        Store `value` (JSON-serialisable) plus artifact files copied from
+        {name: source_path}. The entry is assembled in a staging directory
+        and renamed into place so readers never see a partial entry.
+        """
+        entry = self._entry_dir(key)
+        staging = self.root / ".staging" / f"{key}.{uuid.uuid4().hex}"
+        staging.mkdir(parents=True, exist_ok=True)
+        try:
+            for name, src in (files or {}).items():
+                shutil.copyfile(src, staging / name)
+            (staging / self.VALUE_FILE).write_text(json.dumps(value), encoding="utf-8")
+            size = self._dir_size(staging)
+
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                replaced = 0
+                if entry.exists():
+                    replaced = self._dir_size(entry)
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.replace(staging, entry)
+                if self._total is not None:
+                    self._total += size - replaced
+                needs_scan = (
+                    self._total is None
+                    or self._total > self.max_bytes
+                    or time.monotonic() - self._scanned_at > self.rescan_seconds
+                )
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        if needs_scan:
+            self.evict()
+        return self.get(key)
+
+    def _entries(self):
+        for shard in self.root.iterdir():
+            if not shard.is_dir() or shard.name.startswith("."):
+                continue
+            for entry in shard.iterdir():
+                try:
+                    yield entry, entry.stat().st_mtime, self._dir_size(entry)
+                except OSError:
+                    # Removed concurrently
+                    continue
+
+    def size_bytes(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> int:
+        """
+        Scan the cache and delete least recently used entries until under
+        max_bytes; resets the running total. Returns entries removed.
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[1])
+            total = sum(size for _, _, size in entries)
+            removed = 0
+            for entry, _, size in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                removed += 1
+            self._total = total
+            self._scanned_at = time.monotonic()
+        if removed:
+            logger.info("[CACHE] Evicted %d entries from %s", removed, self.root)
+        return removed
+
+
+class StageCache(DiskLRU):
+    """Stage-output cache keyed by input fingerprint + model identifiers."""
+
+    @staticmethod
+    def stage_key(fingerprint: str, stage: str, model_versions: dict) -> str:
+        deps = STAGE_DEPENDENCIES.get(stage, [stage])
+        parts = [fingerprint, stage] + [f"{d}={model_versions.get(d, '')}" for d in deps]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def for_input(self, fingerprint: str, model_versions: dict) -> "JobStageCache":
+        return JobStageCache(self, fingerprint, model_versions)
+
+
+class JobStageCache:
+    """
+    Per-request view handed to the pipeline as the `stage_cache` hook.
+
+    A pipeline that accepts it checks `get(stage)` before running a stage and
+    calls `put(stage, value, files)` after finishing one, so a retried job
+    resumes from the last completed stage.
+    """
+
+    def __init__(self, cache: StageCache, fingerprint: str, model_versions: dict):
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.model_versions = dict(model_versions)
+        self.hits = []
+        self.misses = []
+        self.completed = []
+
+    def _key(self, stage: str) -> str:
+        return self.cache.stage_key(self.fingerprint, stage, self.model_versions)
+
+    def get(self, stage: str) -> dict | None:
+        entry = self.cache.get(self._key(stage))
+        (self.hits if entry else self.misses).append(stage)
+        return entry
+
+    def put(self, stage: str, value, files: dict | None = None) -> dict:
+        entry = self.cache.put(self._key(stage), value, files)
+        self.completed.append(stage)
+        return entry
+
+    def stats(self) -> dict:
+        return {"fingerprint": self.fingerprint, "hits": list(self.hits), "misses": list(self.misses)}
@@ -0,0 +1,194 @@
+# external_ai/stage_profiler.py
+"""
+Per-stage profiling for a pipeline run.
+
+/full hands a StageProfiler to the pipeline as the `profiler` hook. The
+pipeline wraps each stage:
+
+    with profiler.stage("asr") as s:
+        segments = self.transcribe(audio)
+        s.items = len(segments)
+
+Each stage records wall time, CPU time, peak RSS and an item count, plus
+epoch start/finish times so the backend can write them into JobStep rows.
+Entering a stage more than once (per chunk, per batch) accumulates into
+the same entry. Calling `s.advance()` per segment instead of setting
+`s.items` also reports progress as it happens (see progress_events).
+
+The server also times the `translate` and `synthesize` hooks itself
+(observe()), which fills in "mt"/"tts" for pipelines that don't profile
+those stages.
+
+CPU time and RSS are per process, so jobs running at the same time
+(MAX_CONCURRENT_JOBS > 1) share them.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+STAGES = ("asr", "punctuation", "mt", "tts", "separation", "mix", "mux")
+
+RSS_SAMPLE_SECONDS = float(os.getenv("PROFILE_RSS_SAMPLE_MS", "100")) / 1000.0
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size of this process, or None where unsupported."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+class _Stage:
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = None
+        self.finished_at = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss = None
+        self.items = 0
+        self.calls = 0
+
+    def sample(self, rss: int | None):
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "peak_rss_mb": round(self.peak_rss / 2**20, 1) if self.peak_rss is not None else None,
+            "items": self.items,
+            "calls": self.calls,
+        }
+
+
+class _Span:
+    """
+    Handle yielded by stage(). Set or add to `items` while the stage runs, or
+    call advance() per segment so progress listeners see it as it happens.
+    """
+
+    def __init__(self, items: int = 0, on_advance=None):
+        self.items = items
+        self._on_advance = on_advance
+
+    def advance(self, n: int = 1):
+        self.items += n
+        if self._on_advance is not None:
+            self._on_advance(self.items)
+
+
+class StageProfiler:
+    def __init__(self, sample_seconds: float = RSS_SAMPLE_SECONDS, on_event=None):
+        """
+        `on_event(kind, stage, items)` is called when a stage starts ("start"),
+        advances or finishes an observed hook call ("progress") and finishes
+        ("end"); `items` is the stage's running total.
+        """
+        self.sample_seconds = sample_seconds
+        self.on_event = on_event
+        self._stages = {}
+        self._observed = {}
+        self._open = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        """Time one pass through `name` (see module docstring)."""
+        with self._enter(self._stages, name, items) as span:
+            yield span
+
+    def observe(self, name: str, fn, batch: bool):
+        """Wrap a hook so its calls are timed as `name` (items = batch length or 1)."""
+
+        def observed(arg):
+            with self._enter(self._observed, name, len(arg) if batch else 1):
+                return fn(arg)
+
+        return observed
+
+    @contextmanager
+    def _enter(self, table: dict, name: str, items: int):
+        observed = table is self._observed
+        with self._lock:
+            rec = table.get(name)
+            if rec is None:
+                rec = table[name] = _Stage(name)
+            if rec.started_at is None:
+                rec.started_at = time.time()
+            self._open.append(rec)
+            self._ensure_sampler()
+            done = rec.items
+        span = _Span(items, lambda n: self._emit("progress", name, done + n))
+        if not observed:
+            self._emit("start", name, done + items)
+        rec.sample(rss_bytes())
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        finally:
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            rec.sample(rss_bytes())
+            with self._lock:
+                self._open.remove(rec)
+                rec.finished_at = time.time()
+                rec.wall_seconds += wall
+                rec.cpu_seconds += cpu
+                rec.items += span.items
+                rec.calls += 1
+                total = rec.items
+            self._emit("progress" if observed else "end", name, total)
+
+    def _emit(self, kind: str, name: str, items: int):
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(kind, name, items)
+        except Exception:
+            # Progress reporting must never break the run it reports on
+            pass
+
+    def _ensure_sampler(self):
+        # Short stages are covered by the samples taken on entry and exit
+        if self._sampler is None and self.sample_seconds > 0 and rss_bytes() is not None:
+            self._sampler = threading.Thread(target=self._sample_loop, name="rss-sampler", daemon=True)
+            self._sampler.start()
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_seconds):
+            with self._lock:
+                open_stages = list(self._open)
+            if open_stages:
+                rss = rss_bytes()
+                for rec in open_stages:
+                    rec.sample(rss)
+
+    def close(self):
+        self._stop.set()
+
+    def stages(self) -> dict:
+        """Finished stages by name; pipeline-reported ones win over observed hooks."""
+        with self._lock:
+            merged = {name: rec.to_dict() for name, rec in self._observed.items() if rec.calls}
+            merged.update({name: rec.to_dict() for name, rec in self._stages.items() if rec.calls})
+        return merged
@@ -0,0 +1,20 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+# external_ai modules are imported top-level (as local_ai_server does)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    """local_ai_server with the stub pipeline and its own caches/TM switched off."""
+    monkeypatch.setenv("PIPELINE_IMPL", "stub")
+    for flag in ("STAGE_CACHE_ENABLED", "TM_ENABLED", "TTS_CACHE_ENABLED"):
+        monkeypatch.setenv(flag, "false")
+    monkeypatch.setenv("CHUNK_SOURCES_DIR", str(tmp_path / "sources"))
+    import local_ai_server
+
+    return importlib.reload(local_ai_server)
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import async_jobs
+from async_jobs import JobRegistry
+
+
+def _wait(registry, job_id, timeout=5):
+    record = registry.get(job_id)
+    for _ in range(int(timeout / 0.01)):
+        if record.status in async_jobs.TERMINAL_STATES:
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"job still {record.status}")
+
+
+def test_submit_returns_immediately_and_exposes_partial_results():
+    release = threading.Event()
+
+    def run(job):
+        job.partial["phase"] = "pipeline"
+        release.wait(5)
+        return {"status": "success", "output": "outputs/demo_videos/x.mp4"}, 200
+
+    registry = JobRegistry(max_workers=2)
+    record = registry.submit(run)
+    assert record.status in ("queued", "running")
+
+    for _ in range(500):
+        if record.partial.get("phase"):
+            break
+        time.sleep(0.01)
+    assert registry.get(record.id).to_dict()["partial"] == {"phase": "pipeline"}
+
+    release.set()
+    done = _wait(registry, record.id)
+    assert done.status == "succeeded"
+    assert done.to_dict()["result"]["output"] == "outputs/demo_videos/x.mp4"
+
+
+def test_failed_run_posts_callback(monkeypatch):
+    posted = []
+
+    class Resp:
+        status_code = 200
+
+    monkeypatch.setattr(async_jobs.requests, "post", lambda url, json, timeout: posted.append((url, json)) or Resp())
+
+    registry = JobRegistry(max_workers=1)
+    record = registry.submit(lambda job: ({"status": "error", "error": "boom"}, 500), callback_url="http://backend/cb")
+    _wait(registry, record.id)
+
+    for _ in range(500):
+        if posted:
+            break
+        time.sleep(0.01)
+    assert posted[0][0] == "http://backend/cb"
+    assert posted[0][1]["status"] == "failed"
+    assert posted[0][1]["error"] == "boom"
+
+
+def test_unknown_job_is_none():
+    assert JobRegistry().get("nope") is None
+
+
+def test_state_dir_lets_another_worker_answer_for_a_job(tmp_path):
+    release = threading.Event()
+
+    def run(job):
+        job.partial["phase"] = "pipeline"
+        release.wait(5)
+        return {"status": "success", "output": "outputs/demo_videos/y.mp4"}, 200
+
+    owner = JobRegistry(max_workers=1, state_dir=str(tmp_path), flush_seconds=0.01)
+    other = JobRegistry(max_workers=1, state_dir=str(tmp_path))
+    record = owner.submit(run)
+
+    for _ in range(500):
+        doc = other.get_doc(record.id)
+        if doc and doc["partial"].get("phase"):
+            break
+        time.sleep(0.01)
+    assert doc["status"] == "running" and doc["partial"] == {"phase": "pipeline"}
+
+    release.set()
+    _wait(owner, record.id)
+    assert other.get_doc(record.id)["result"]["output"] == "outputs/demo_videos/y.mp4"
+    assert other.get_doc("0" * 32) is None
+
+
+def test_running_job_of_a_dead_worker_reads_as_missing(tmp_path):
+    import json
+
+    (tmp_path / "abc123.json").write_text(json.dumps({"job_id": "abc123", "status": "running", "pid": 2**22 + 1}))
+    assert JobRegistry(state_dir=str(tmp_path)).get_doc("abc123") is None
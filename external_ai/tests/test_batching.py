@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from batching import MicroBatcher
+
+
+def test_concurrent_jobs_share_batches_and_get_their_own_results():
+    seen = []
+
+    def translate_batch(sentences):
+        seen.append(len(sentences))
+        time.sleep(0.01)
+        return [s.upper() for s in sentences]
+
+    batcher = MicroBatcher(translate_batch, max_batch_size=8, max_wait_ms=50, name="mt")
+    results = {}
+
+    def job(n):
+        results[n] = batcher.submit([f"job{n} sentence {i}" for i in range(3)])
+
+    threads = [threading.Thread(target=job, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for n in range(4):
+        assert results[n] == [f"JOB{n} SENTENCE {i}" for i in range(3)]
+    assert max(seen) <= 8
+    assert sum(seen) == 12
+    assert len(seen) < 12
+    assert batcher.stats()["items"] == 12
+
+
+def test_request_larger_than_batch_is_split_in_order():
+    seen = []
+
+    def fn(items):
+        seen.append(list(items))
+        return [i * 2 for i in items]
+
+    batcher = MicroBatcher(fn, max_batch_size=4, max_wait_ms=0, name="mt")
+    assert batcher.submit(range(10)) == [i * 2 for i in range(10)]
+    assert all(len(b) <= 4 for b in seen)
+
+
+def test_model_error_is_raised_to_each_caller():
+    def fn(items):
+        raise RuntimeError("CUDA out of memory")
+
+    batcher = MicroBatcher(fn, max_batch_size=4, max_wait_ms=0, name="tts")
+    with pytest.raises(RuntimeError, match="out of memory"):
+        batcher.submit(["habari"])
+
+
+def test_rest_of_a_failed_request_is_not_run():
+    seen = []
+
+    def fn(items):
+        seen.append(list(items))
+        if "bad" in items:
+            raise RuntimeError("CUDA out of memory")
+        return list(items)
+
+    batcher = MicroBatcher(fn, max_batch_size=2, max_wait_ms=0, name="tts")
+    with pytest.raises(RuntimeError, match="out of memory"):
+        batcher.submit(["bad", "a", "b", "c"])
+    assert batcher.submit(["d"]) == ["d"]
+
+    # Only the failing batch ran; the request's later items were dropped
+    assert seen[0][0] == "bad"
+    assert seen[1:] == [["d"]]
@@ -0,0 +1,125 @@
+import hashlib
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+from werkzeug.wrappers import Request, Response
+
+import input_fetch
+from input_fetch import InputFetchError, fetch_input, reference_from
+
+PAYLOAD = bytes(range(256)) * 4096 * 4  # 4 MiB, several fetch chunks
+
+
+class FlakyServer:
+    """Serves PAYLOAD with Range support; the first response dies half-way through."""
+
+    def __init__(self, honour_range=True):
+        self.honour_range = honour_range
+        self.requests = []
+        self.server = make_server("127.0.0.1", 0, self.app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/uploads/lecture.mp4?X-Amz-Signature=x"
+
+    def app(self, environ, start_response):
+        request = Request(environ)
+        if request.path != "/uploads/lecture.mp4":
+            return Response(status=403)(environ, start_response)
+        self.requests.append(request.headers.get("Range"))
+        start = 0
+        if self.honour_range and request.range:
+            start = request.range.ranges[0][0]
+        body = PAYLOAD[start:]
+
+        def stream():
+            yield body[: len(body) // 2]
+            if len(self.requests) == 1:
+                raise ConnectionResetError("dropped")
+            yield body[len(body) // 2:]
+
+        status = 206 if start else 200
+        headers = {"Content-Length": str(len(body))}
+        if start:
+            headers["Content-Range"] = f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}"
+        return Response(stream(), status=status, headers=headers)(environ, start_response)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(input_fetch.time, "sleep", lambda s: None)
+
+
+def test_reference_from_prefers_url():
+    assert reference_from({"video_url": "http://x", "video_s3_uri": "s3://b/k"}) == {"video_url": "http://x"}
+    assert reference_from({"video_s3_uri": "s3://b/k"}) == {"video_s3_uri": "s3://b/k"}
+    assert reference_from({}) is None
+
+
+@pytest.mark.parametrize("honour_range", [True, False])
+def test_dropped_download_is_retried_and_verified(tmp_path, honour_range):
+    dest = tmp_path / "input.mp4"
+    with FlakyServer(honour_range) as server:
+        fetched = fetch_input({"video_url": server.url}, str(dest), retries=2)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert fetched["size"] == len(PAYLOAD)
+    assert fetched["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+    # The retry asks for the rest only; servers ignoring Range just resend everything
+    assert server.requests[0] is None
+    assert server.requests[1].startswith("bytes=")
+
+
+def test_expired_url_fails_without_retrying(tmp_path):
+    with FlakyServer() as server:
+        with pytest.raises(InputFetchError):
+            fetch_input({"video_url": server.url.replace("lecture", "other")}, str(tmp_path / "x"), retries=3)
+    assert server.requests == []
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+        self.offsets = []
+
+    def get_object(self, bucket, key, offset=0):
+        from minio.error import S3Error
+
+        data = self.objects.get((bucket, key))
+        if data is None:
+            raise S3Error("NoSuchKey", "missing", key, "req", "host", None)
+        self.offsets.append(offset)
+        return _FakeObject(data[offset:])
+
+
+class _FakeObject:
+    def __init__(self, data):
+        self.data = data
+
+    def stream(self, size):
+        for i in range(0, len(self.data), size):
+            yield self.data[i:i + size]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+def test_s3_reference_streams_object(tmp_path):
+    s3 = FakeS3({("uploads", "u/1/lecture.mp4"): PAYLOAD})
+    fetched = fetch_input({"video_s3_uri": "s3://uploads/u/1/lecture.mp4"}, str(tmp_path / "in.mp4"), s3_client=s3)
+    assert fetched["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+
+    with pytest.raises(InputFetchError):
+        fetch_input({"video_s3_uri": "s3://uploads/missing.mp4"}, str(tmp_path / "x"), s3_client=s3)
@@ -0,0 +1,58 @@
+import shutil
+from pathlib import Path
+
+from output_sink import MinioOutputSink, object_name_for
+
+
+class LocalMinio:
+    """Stand-in for minio.Minio that stores objects under a local directory."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.uploads = []
+
+    def bucket_exists(self, bucket):
+        return (self.root / bucket).is_dir()
+
+    def make_bucket(self, bucket):
+        (self.root / bucket).mkdir(parents=True)
+
+    def fput_object(self, bucket, object_name, file_path, content_type=None, part_size=0):
+        dest = self.root / bucket / object_name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(file_path, dest)
+        self.uploads.append((bucket, object_name, content_type))
+
+
+def test_object_name_matches_worker_convention():
+    assert object_name_for("outputs/demo_videos/full_ab.mp4") == "demo_videos/full_ab.mp4"
+    assert object_name_for("\\outputs\\demo_videos\\full_ab.mp4") == "demo_videos/full_ab.mp4"
+    assert object_name_for("/elsewhere/x.mp4") == "elsewhere/x.mp4"
+
+
+def test_put_streams_file_into_outputs_bucket(tmp_path):
+    video = tmp_path / "outputs" / "demo_videos" / "full_ab.mp4"
+    video.parent.mkdir(parents=True)
+    video.write_bytes(b"dubbed video")
+
+    store = LocalMinio(tmp_path / "minio")
+    sink = MinioOutputSink(store, "outputs")
+    uploaded = sink.put(str(video), object_name_for("outputs/demo_videos/full_ab.mp4"))
+
+    assert uploaded == {
+        "uri": "s3://outputs/demo_videos/full_ab.mp4",
+        "object_name": "demo_videos/full_ab.mp4",
+        "size": 12,
+    }
+    assert (tmp_path / "minio" / "outputs" / "demo_videos" / "full_ab.mp4").read_bytes() == b"dubbed video"
+    assert store.uploads[0][2] == "video/mp4"
+
+
+def test_from_env_is_disabled_without_credentials(monkeypatch):
+    monkeypatch.delenv("S3_ENDPOINT", raising=False)
+    assert MinioOutputSink.from_env() is None
+    monkeypatch.setenv("S3_ENDPOINT", "http://minio:9000")
+    monkeypatch.setenv("S3_ACCESS_KEY", "a")
+    monkeypatch.setenv("S3_SECRET_KEY", "b")
+    monkeypatch.setenv("OUTPUT_SINK_ENABLED", "false")
+    assert MinioOutputSink.from_env() is None
@@ -0,0 +1,172 @@
+import importlib
+import sys
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    monkeypatch.setenv("PIPELINE_IMPL", "stub")
+    import pipeline_core_loader
+
+    module = importlib.reload(pipeline_core_loader)
+    yield module
+    importlib.reload(module)
+
+
+def test_nothing_loads_until_first_use(loader):
+    assert loader.status()["loaded"] is False
+    pipe = loader.get_pipeline()
+    assert type(pipe).__name__ == "StubDubbingPipeline"
+    assert loader.get_pipeline() is pipe
+    assert loader.status()["generation"] == 1
+
+
+def test_first_load_is_not_reported_as_a_reload(loader, monkeypatch):
+    building = threading.Event()
+    release = threading.Event()
+    build = loader._build
+
+    def slow_build(impl):
+        building.set()
+        release.wait(5)
+        return build(impl)
+
+    monkeypatch.setattr(loader, "_build", slow_build)
+    first = threading.Thread(target=loader.get_pipeline)
+    first.start()
+    building.wait(5)
+    assert loader.status()["reloading"] is False
+
+    release.set()
+    first.join(5)
+    building.clear()
+    release.clear()
+    reload = threading.Thread(target=loader.reload_pipeline)
+    reload.start()
+    building.wait(5)
+    assert loader.status()["reloading"] is True
+
+    release.set()
+    reload.join(5)
+    assert loader.status()["reloading"] is False
+
+
+def test_unknown_impl_names_the_fix(loader, monkeypatch, tmp_path):
+    monkeypatch.setattr(loader, "PIPELINE_ROOT", tmp_path / "missing")
+    with pytest.raises(RuntimeError, match="PIPELINE_IMPL=stub"):
+        loader.resolve_impl("no_such_package.core:LocalDubbingPipeline")
+
+
+def test_real_pipeline_needs_pipeline_root(loader, monkeypatch, tmp_path):
+    monkeypatch.setattr(loader, "PIPELINE_ROOT", None)
+    with pytest.raises(RuntimeError, match="PIPELINE_ROOT is not set"):
+        loader.resolve_impl(loader.DEFAULT_IMPL)
+
+    monkeypatch.setattr(loader, "PIPELINE_ROOT", tmp_path)
+    with pytest.raises(RuntimeError, match="Cannot import no_such_package.core"):
+        loader.resolve_impl("no_such_package.core:LocalDubbingPipeline")
+
+
+def test_overlap_reload_serves_new_requests_while_old_ones_finish(loader):
+    closed = []
+    release = threading.Event()
+    holding = threading.Event()
+    old = loader.get_pipeline()
+    old.close = lambda: closed.append("old")
+
+    def long_request():
+        with loader.pipeline_lease() as pipe:
+            assert pipe is old
+            holding.set()
+            release.wait(5)
+
+    t = threading.Thread(target=long_request)
+    t.start()
+    holding.wait(5)
+
+    reload = threading.Thread(target=loader.reload_pipeline, kwargs={"mode": "overlap"})
+    reload.start()
+    for _ in range(500):
+        if loader.status()["generation"] == 2:
+            break
+        time.sleep(0.01)
+
+    # New requests get the new instance right away; the old one stays open
+    with loader.pipeline_lease() as pipe:
+        assert pipe is not old
+    assert closed == []
+
+    release.set()
+    t.join(5)
+    reload.join(5)
+    assert closed == ["old"]
+    assert loader.status()["last_reload"]["generation"] == 2
+
+
+def test_drain_reload_holds_new_requests_until_swapped(loader):
+    loader.get_pipeline()
+    release = threading.Event()
+    holding = threading.Event()
+    seen = []
+
+    def long_request():
+        with loader.pipeline_lease():
+            holding.set()
+            release.wait(5)
+
+    def new_request():
+        with loader.pipeline_lease():
+            seen.append(loader.status()["generation"])
+
+    t = threading.Thread(target=long_request)
+    t.start()
+    holding.wait(5)
+    reload = threading.Thread(target=loader.reload_pipeline, kwargs={"mode": "drain"})
+    reload.start()
+    for _ in range(500):
+        if not loader.status()["admitting"]:
+            break
+        time.sleep(0.01)
+
+    waiting = threading.Thread(target=new_request)
+    waiting.start()
+    time.sleep(0.1)
+    assert seen == []
+
+    release.set()
+    for th in (t, reload, waiting):
+        th.join(5)
+    assert seen == [2]
+    assert "stub_pipeline" in sys.modules
+
+
+@pytest.fixture
+def reloads(server, monkeypatch):
+    calls = []
+    monkeypatch.delenv("EXTERNAL_AI_MASTER_PID", raising=False)
+    monkeypatch.setattr(server.pipeline_core_loader, "reload_pipeline", lambda **kw: calls.append(kw))
+    return calls
+
+
+def _reload(server, url="/pipeline/reload", addr="127.0.0.1"):
+    client = server.app.test_client()
+    res = client.post(url, json={"mode": "overlap"}, environ_base={"REMOTE_ADDR": addr})
+    return res.status_code
+
+
+def test_without_a_token_only_localhost_may_reload(server, reloads, monkeypatch):
+    monkeypatch.delenv("PIPELINE_RELOAD_TOKEN", raising=False)
+
+    assert _reload(server, addr="10.0.0.7") == 403
+    assert _reload(server) == 202
+
+
+def test_token_is_required_when_set(server, reloads, monkeypatch):
+    monkeypatch.setenv("PIPELINE_RELOAD_TOKEN", "s3cret")
+
+    assert _reload(server) == 403
+    assert _reload(server, "/pipeline/reload?token=wrong", addr="10.0.0.7") == 403
+    assert _reload(server, "/pipeline/reload?token=s3cret", addr="10.0.0.7") == 202
@@ -0,0 +1,64 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from progress_events import ProgressReporter
+from stage_profiler import StageProfiler
+
+
+@pytest.fixture
+def sink():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append(json.loads(body))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/progress", received
+    server.shutdown()
+
+
+def test_events_are_coalesced_into_throttled_snapshots(sink):
+    url, received = sink
+    reporter = ProgressReporter(url, min_interval=60)
+    profiler = StageProfiler(sample_seconds=0, on_event=reporter)
+
+    with profiler.stage("asr", items=40):
+        pass
+    with profiler.stage("mt") as s:
+        for _ in range(10):
+            s.advance()
+    reporter.close()
+
+    # 13 events: at most one snapshot before the throttle, plus the final one
+    assert 1 <= len(received) <= 2
+    assert [r["seq"] for r in received] == list(range(1, len(received) + 1))
+    last = received[-1]
+    assert last["stages"] == {"asr": "succeeded", "mt": "succeeded"}
+    assert last["items"] == {"asr": 40, "mt": 10}
+    # asr + punctuation (never reported, so counted done) + mt
+    assert last["progress"] == 50.0
+
+
+def test_segment_progress_and_unreported_stages():
+    reporter = ProgressReporter("http://unused", min_interval=60)
+    reporter._thread = object()  # snapshots only, nothing is sent
+    reporter("start", "asr", 0)
+    reporter("end", "asr", 20)
+    # A pipeline that only reports through the TTS hook: punctuation and MT count as done
+    reporter("progress", "tts", 5)
+
+    snap = reporter.snapshot()
+    assert snap["stage"] == "tts"
+    assert snap["stage_progress"] == {"asr": 100.0, "punctuation": 100.0, "mt": 100.0, "tts": 25.0}
+    assert snap["progress"] == round(30 + 5 + 15 + 25 * 0.25, 1)
@@ -0,0 +1,52 @@
+import threading
+import time
+import urllib.request
+
+from werkzeug.serving import make_server
+from werkzeug.wrappers import Response
+
+from serve import WorkerTable, _limit_threads, _PoolMiddleware
+
+
+def test_threaded_worker_serves_up_to_threads_requests_at_once():
+    release = threading.Event()
+    running = []
+    peak = []
+
+    def app(environ, start_response):
+        running.append(1)
+        peak.append(len(running))
+        release.wait(5)
+        running.pop()
+        return Response("ok")(environ, start_response)
+
+    table = WorkerTable(1)
+    middleware = _PoolMiddleware(app, table, 0, threading.Event())
+    server = make_server("127.0.0.1", 0, middleware, threaded=True)
+    _limit_threads(server, 2)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/full"
+
+    clients = [threading.Thread(target=urllib.request.urlopen, args=(url,), kwargs={"timeout": 10}) for _ in range(3)]
+    try:
+        for client in clients:
+            client.start()
+        for _ in range(200):
+            if middleware.in_flight() == 2:
+                break
+            time.sleep(0.01)
+        time.sleep(0.2)
+
+        # The third request waits in the accept queue, not in this worker
+        assert middleware.in_flight() == 2
+        assert table.row(0)["busy_since"] > 0
+    finally:
+        release.set()
+        for client in clients:
+            client.join(10)
+        server.shutdown()
+
+    assert max(peak) == 2
+    assert middleware.in_flight() == 0
+    assert table.row(0)["busy_since"] == 0
+    assert table.row(0)["requests"] == 3
@@ -0,0 +1,128 @@
+import os
+import time
+from pathlib import Path
+
+from stage_cache import DiskLRU, StageCache
+from stub_pipeline import StubDubbingPipeline
+
+
+def _put(cache, tmp_path, key, size):
+    src = tmp_path / f"{key}.bin"
+    src.write_bytes(b"x" * size)
+    return cache.put(key, {"key": key}, files={"data.bin": str(src)})
+
+
+def _age(cache, key, seconds_ago):
+    then = time.time() - seconds_ago
+    os.utime(cache._entry_dir(key), (then, then))
+
+
+def test_round_trip_and_miss(tmp_path):
+    cache = DiskLRU(str(tmp_path / "cache"), max_bytes=10_000)
+    entry = _put(cache, tmp_path, "aa11", 100)
+
+    assert entry["value"] == {"key": "aa11"}
+    with open(entry["files"]["data.bin"], "rb") as fh:
+        assert len(fh.read()) == 100
+    assert cache.get("bb22") is None
+
+
+def test_entry_evicted_during_get_is_a_miss(tmp_path, monkeypatch):
+    cache = DiskLRU(str(tmp_path / "cache"), max_bytes=10_000)
+    _put(cache, tmp_path, "aa11", 100)
+    entry = cache._entry_dir("aa11")
+    iterdir = Path.iterdir
+
+    def evicted_meanwhile(path):
+        if path == entry:
+            raise FileNotFoundError(path)
+        return iterdir(path)
+
+    monkeypatch.setattr(Path, "iterdir", evicted_meanwhile)
+    assert cache.get("aa11") is None
+
+
+def test_evicts_least_recently_used_past_the_cap(tmp_path):
+    cache = DiskLRU(str(tmp_path / "cache"), max_bytes=3_500)
+    for i, key in enumerate(["aa01", "aa02", "aa03"]):
+        _put(cache, tmp_path, key, 1_000)
+        _age(cache, key, 100 - i)
+    # A hit makes the oldest entry the most recently used
+    assert cache.get("aa01") is not None
+
+    _put(cache, tmp_path, "aa04", 1_000)
+
+    assert cache.get("aa02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("aa03") is not None
+    assert cache.get("aa04") is not None
+    assert cache.size_bytes() <= 3_500
+
+
+def test_put_scans_only_when_the_total_crosses_the_cap(tmp_path, monkeypatch):
+    cache = DiskLRU(str(tmp_path / "cache"), max_bytes=5_000, rescan_seconds=3600)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+
+    for i in range(4):
+        _put(cache, tmp_path, f"aa{i:02d}", 1_000)
+    # The first put learns the size of what is already on disk
+    assert len(scans) == 1
+
+    _put(cache, tmp_path, "aa99", 1_000)
+    assert len(scans) == 2
+    assert cache._total == cache.size_bytes() <= 5_000
+
+
+def test_replacing_an_entry_keeps_the_total_exact(tmp_path):
+    cache = DiskLRU(str(tmp_path / "cache"), max_bytes=10_000)
+    _put(cache, tmp_path, "aa01", 1_000)
+    _put(cache, tmp_path, "aa01", 300)
+
+    assert cache._total == cache.size_bytes()
+
+
+def test_stage_key_changes_with_upstream_models():
+    versions = {"asr": "whisper-small", "punctuation": "p1", "mt": "nllb-lora-3", "tts": "mms", "separation": "demucs"}
+
+    key = StageCache.stage_key("f00d", "tts", versions)
+    assert key == StageCache.stage_key("f00d", "tts", dict(versions))
+    assert key != StageCache.stage_key("f00d", "tts", {**versions, "asr": "whisper-medium"})
+    # Separation doesn't feed the ASR output
+    assert StageCache.stage_key("f00d", "asr", versions) == StageCache.stage_key(
+        "f00d", "asr", {**versions, "separation": "other"}
+    )
+
+
+def test_stub_pipeline_skips_cached_stages_on_a_second_run(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = tmp_path / "lecture.mp4"
+    video.write_bytes(b"video bytes")
+    cache = StageCache(str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+    pipe = StubDubbingPipeline()
+    versions = server.pipeline_model_versions(pipe)
+    calls = []
+
+    def translate(sentences):
+        calls.append(list(sentences))
+        return pipe.translate_batch(sentences)
+
+    first_view = cache.for_input(server.fingerprint_file(str(video)), versions)
+    first = server.run_pipeline(pipe, str(video), "first", stage_cache=first_view, translate=translate)
+    assert first_view.stats()["hits"] == []
+    assert first_view.completed == ["asr", "mt", "tts"]
+    assert len(calls) == 1
+
+    second_view = cache.for_input(server.fingerprint_file(str(video)), versions)
+    second = server.run_pipeline(pipe, str(video), "second", stage_cache=second_view, translate=translate)
+    assert second_view.stats()["hits"] == ["asr", "mt", "tts"]
+    # MT was skipped, not re-run
+    assert len(calls) == 1
+    assert second["swahili_segments"] == first["swahili_segments"]
+
+    # A different MT model invalidates MT (and TTS, which depends on it) but not ASR
+    third_view = cache.for_input(server.fingerprint_file(str(video)), {**versions, "mt": "nllb-lora-4"})
+    server.run_pipeline(pipe, str(video), "third", stage_cache=third_view, translate=translate)
+    assert third_view.stats()["hits"] == ["asr"]
+    assert len(calls) == 2
@@ -0,0 +1,37 @@
+import time
+
+from stage_profiler import StageProfiler
+
+
+def test_stages_accumulate_wall_cpu_items_and_rss():
+    profiler = StageProfiler(sample_seconds=0.01)
+    for batch in (["a", "b"], ["c"]):
+        with profiler.stage("mt") as s:
+            time.sleep(0.02)
+            s.items += len(batch)
+    with profiler.stage("asr", items=4):
+        sum(i * i for i in range(200_000))
+    profiler.close()
+
+    stages = profiler.stages()
+    mt, asr = stages["mt"], stages["asr"]
+    assert mt["items"] == 3 and mt["calls"] == 2
+    assert mt["wall_seconds"] >= 0.04
+    assert mt["started_at"] <= mt["finished_at"] <= asr["started_at"]
+    assert asr["items"] == 4 and asr["cpu_seconds"] > 0
+    assert asr["peak_rss_mb"] is None or asr["peak_rss_mb"] > 0
+
+
+def test_pipeline_stages_win_over_observed_hooks():
+    profiler = StageProfiler(sample_seconds=0)
+    translate = profiler.observe("mt", lambda batch: [s.upper() for s in batch], batch=True)
+    synthesize = profiler.observe("tts", lambda text: b"", batch=False)
+
+    assert translate(["x", "y"]) == ["X", "Y"]
+    synthesize("x")
+    with profiler.stage("mt", items=10):
+        translate(["z"])
+
+    stages = profiler.stages()
+    assert stages["mt"]["items"] == 10
+    assert stages["tts"]["items"] == 1
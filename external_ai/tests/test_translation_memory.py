@@ -0,0 +1,96 @@
+import sqlite3
+
+from translation_memory import MemoTranslator, TranslationMemory
+
+
+def test_exact_normalised_and_miss(tmp_path):
+    tm = TranslationMemory(str(tmp_path / "tm.sqlite3"))
+    tm.store([("Welcome to today's lesson.", "Karibu kwenye somo la leo.")], model_version="mt-1")
+
+    found = tm.lookup(
+        [
+            "Welcome to today's lesson.",
+            "  welcome to   TODAY'S lesson. ",
+            "Welcome to today's lesson",
+            "Something else entirely.",
+            "",
+        ],
+        model_version="mt-1",
+    )
+
+    assert found == {
+        0: ("Karibu kwenye somo la leo.", "exact"),
+        1: ("Karibu kwenye somo la leo.", "normalised"),
+    }
+    assert tm.stats()["total_hits"] == 2
+
+
+def test_lookups_are_scoped_to_the_model_version(tmp_path):
+    tm = TranslationMemory(str(tmp_path / "tm.sqlite3"))
+    tm.store([("Good morning.", "Habari za asubuhi.")], model_version="mt-1")
+
+    assert tm.lookup(["Good morning."], model_version="mt-2") == {}
+
+    # Retranslating with the new model keeps the old model's entry
+    tm.store([("Good morning.", "Habari ya asubuhi.")], model_version="mt-2")
+    assert tm.lookup(["Good morning."], model_version="mt-2") == {0: ("Habari ya asubuhi.", "exact")}
+    assert tm.lookup(["Good morning."], model_version="mt-1") == {0: ("Habari za asubuhi.", "exact")}
+
+    # Hits are counted against the version that served them
+    conn = sqlite3.connect(tm.path)
+    assert dict(conn.execute("SELECT model_version, hits FROM tm_segment")) == {"mt-1": 1, "mt-2": 1}
+
+
+def test_memo_translator_only_sends_misses_to_the_model(tmp_path):
+    tm = TranslationMemory(str(tmp_path / "tm.sqlite3"))
+    tm.store([("Hello class.", "Habari darasa.")], model_version="mt-1")
+    calls = []
+
+    def translate_batch(sentences):
+        calls.append(list(sentences))
+        return [f"sw:{s}" for s in sentences]
+
+    translator = MemoTranslator(tm, translate_batch, model_version="mt-1")
+    assert translator(["hello  class.", "Open your books."]) == ["Habari darasa.", "sw:Open your books."]
+    assert calls == [["Open your books."]]
+
+    # The model's translation was written back for the next job
+    assert translator(["Open your books."]) == ["sw:Open your books."]
+    assert len(calls) == 1
+    assert translator.stats() == {"exact_hits": 1, "normalised_hits": 1, "misses": 1, "hit_rate": 0.6667}
+
+
+def test_old_files_are_migrated(tmp_path):
+    path = tmp_path / "tm.sqlite3"
+    conn = sqlite3.connect(path)
+    # The version 0 layout: keyed by source alone, and the old normalise()
+    # dropped trailing punctuation
+    conn.execute(
+        """
+        CREATE TABLE tm_segment (
+            source TEXT PRIMARY KEY,
+            source_norm TEXT NOT NULL,
+            target TEXT NOT NULL,
+            model_version TEXT,
+            hits INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_tm_source_norm ON tm_segment (source_norm)")
+    conn.executemany(
+        "INSERT INTO tm_segment (source, source_norm, target, model_version, hits, created_at) VALUES (?, ?, ?, ?, ?, 0)",
+        [("Thank you!", "thank you", "Asante!", "mt-1", 3), ("Goodbye.", "goodbye", "Kwaheri.", None, 0)],
+    )
+    conn.commit()
+    conn.close()
+
+    tm = TranslationMemory(str(path))
+    assert tm.lookup(["thank you"], model_version="mt-1") == {}
+    assert tm.lookup(["THANK YOU!"], model_version="mt-1") == {0: ("Asante!", "normalised")}
+    assert tm.lookup(["Goodbye."]) == {0: ("Kwaheri.", "exact")}
+    assert tm.stats()["total_hits"] == 5
+
+    tm.store([("Thank you!", "Ahsante!")], model_version="mt-2")
+    assert tm.lookup(["Thank you!"], model_version="mt-1") == {0: ("Asante!", "exact")}
+    assert tm.stats()["segments"] == 3
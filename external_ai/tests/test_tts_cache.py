@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from tts_cache import CachedSynthesizer, TTSCache
+
+
+class SpeakingPipeline:
+    """Synthesises each Swahili phrase through the `synthesize` hook."""
+
+    PHRASES = ["Karibu kwenye somo la leo.", "Tutaangalia mimea.", "Karibu kwenye somo la leo."]
+
+    def synthesize(self, text):
+        return np.full(2205, 0.25, dtype="float32"), 22050
+
+    def process(self, video_path, output_name="out", synthesize=None):
+        synthesize = synthesize or self.synthesize
+        return {"status": "success", "output": video_path, "audio": [synthesize(p) for p in self.PHRASES]}
+
+
+def _synthesizer(cache, pipe, calls, voice="default"):
+    def synthesize(text):
+        calls.append(text)
+        return pipe.synthesize(text)
+
+    return CachedSynthesizer(cache, synthesize, voice=voice, model_version="mms-1", sample_rate=22050)
+
+
+def test_second_run_is_served_from_the_cache(server, tmp_path):
+    cache = TTSCache(str(tmp_path / "tts"), max_bytes=10 * 1024**2)
+    pipe = SpeakingPipeline()
+    calls = []
+
+    first = _synthesizer(cache, pipe, calls)
+    result = server.run_pipeline(pipe, "in.mp4", "out", synthesize=first)
+    # The repeated phrase is already cached within the same run
+    assert calls == SpeakingPipeline.PHRASES[:2]
+    assert first.stats()["hits"] == 1
+    assert first.stats()["misses"] == 2
+
+    second = _synthesizer(cache, pipe, calls)
+    cached = server.run_pipeline(pipe, "in.mp4", "out", synthesize=second)
+    assert len(calls) == 2
+    assert second.stats()["hits"] == 3
+    assert second.stats()["audio_seconds_reused"] == pytest.approx(0.3)
+    for (audio, sr), (expected, expected_sr) in zip(cached["audio"], result["audio"]):
+        assert sr == expected_sr
+        np.testing.assert_allclose(audio, expected, atol=1e-4)
+
+
+def test_phrase_key_folds_whitespace_only():
+    key = TTSCache.phrase_key("Karibu kwenye somo.", "default", "mms-1", 22050)
+
+    assert key == TTSCache.phrase_key("  Karibu   kwenye somo. ", "default", "mms-1", 22050)
+    assert key != TTSCache.phrase_key("karibu kwenye somo.", "default", "mms-1", 22050)
+    assert key != TTSCache.phrase_key("Karibu kwenye somo.", "female", "mms-1", 22050)
+    assert key != TTSCache.phrase_key("Karibu kwenye somo.", "default", "mms-2", 22050)
+
+
+def test_pipelines_without_the_hook_run_uncached(server, tmp_path):
+    class OldPipeline:
+        def process(self, video_path, output_name="out"):
+            return {"status": "success", "output": video_path}
+
+    cache = TTSCache(str(tmp_path / "tts"), max_bytes=10 * 1024**2)
+    calls = []
+    synthesizer = _synthesizer(cache, SpeakingPipeline(), calls)
+
+    assert server.run_pipeline(OldPipeline(), "in.mp4", "out", synthesize=synthesizer)["status"] == "success"
+    assert calls == []
+    assert synthesizer.stats()["misses"] == 0
+
+
+def test_full_requests_reuse_the_stub_pipelines_phrases(server, tmp_path, monkeypatch):
+    import io
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(server, "TTS_CACHE", TTSCache(str(tmp_path / "tts"), max_bytes=10 * 1024**2))
+    monkeypatch.setattr(server, "OUTPUT_SINK", None)
+    client = server.app.test_client()
+
+    def full():
+        res = client.post("/full", data={"video": (io.BytesIO(b"video bytes"), "lecture.mp4")})
+        assert res.status_code == 200, res.data
+        return res.get_json()
+
+    first = full()["pipeline_metrics"]["tts_cache"]
+    assert (first["hits"], first["misses"]) == (0, 2)
+
+    second = full()
+    assert (second["pipeline_metrics"]["tts_cache"]["hits"], second["pipeline_metrics"]["tts_cache"]["misses"]) == (2, 0)
+    assert second["pipeline_metrics"]["tts_cache"]["audio_seconds_reused"] > 0
+    assert second["swahili_segments"][0]["end"] > second["swahili_segments"][0]["start"]
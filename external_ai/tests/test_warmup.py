@@ -0,0 +1,48 @@
+import threading
+
+from warmup import Warmup
+
+
+class SlowPipeline:
+    def __init__(self, gate):
+        self.gate = gate
+        self.loaded = []
+
+    def ensure_asr(self):
+        self.gate.wait(5)
+        self.loaded.append("asr")
+
+    def ensure_mt(self):
+        self.loaded.append("mt")
+
+
+def test_background_warmup_times_each_model():
+    gate = threading.Event()
+    pipe = SlowPipeline(gate)
+    warmup = Warmup(lambda: pipe).start()
+
+    assert not warmup.wait(0.05)
+    snap = warmup.snapshot()
+    assert snap["state"] == "loading" and snap["loading"] == "asr"
+
+    gate.set()
+    assert warmup.wait(5)
+    assert pipe.loaded == ["asr", "mt"]
+    assert set(warmup.snapshot()["load_seconds"]) == {"pipeline", "asr", "mt"}
+
+
+def test_failed_warmup_reports_and_can_retry():
+    attempts = []
+
+    def load():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("CUDA out of memory")
+        return object()
+
+    warmup = Warmup(load)
+    warmup.run()
+    assert warmup.state == "failed" and "pipeline: CUDA out of memory" in warmup.error
+
+    assert warmup.start().wait(5)
+    assert len(attempts) == 2
@@ -0,0 +1,210 @@
+# external_ai/translation_memory.py
+"""
+Segment-level translation memory for the MT stage.
+
+English segments are looked up exactly first, then by a normalised form
+(Unicode NFKC, case-folded, whitespace collapsed). Punctuation is left alone,
+since the stored target carries the punctuation of the sentence it was
+translated from. Only segments that miss both are sent to the NLLB+LoRA
+model, and their translations are written back so the next job with the
+same boilerplate skips the model for them.
+
+Entries are keyed by (source, model version) and lookups only return
+translations recorded for the current MT model version. After a model
+upgrade, old entries miss; they are kept alongside the new ones, so rolling
+back to the old model still finds them.
+
+Backed by a single SQLite file (WAL mode) shared by all requests in the
+process.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger("translation_memory")
+
+_WS_RE = re.compile(r"\s+")
+
+# PRAGMA user_version of the current layout; 1 = source_norm without punctuation
+# stripping, 2 = keyed by (source, model_version)
+SCHEMA_VERSION = 2
+
+
+def normalise(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _WS_RE.sub(" ", text).strip()
+
+
+class TranslationMemory:
+    """English → Swahili segment store with exact and normalised lookup."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            old = version < SCHEMA_VERSION and self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tm_segment'"
+            ).fetchone()
+            if old:
+                self._conn.execute("ALTER TABLE tm_segment RENAME TO tm_segment_old")
+            # model_version is '' rather than NULL when unknown, so it can be part of the key
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tm_segment (
+                    source TEXT NOT NULL,
+                    source_norm TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    model_version TEXT NOT NULL DEFAULT '',
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (source, model_version)
+                )
+                """
+            )
+            if old:
+                # Older files were keyed by source alone and normalised away trailing punctuation
+                rows = self._conn.execute(
+                    "SELECT source, target, model_version, hits, created_at FROM tm_segment_old"
+                ).fetchall()
+                self._conn.executemany(
+                    "INSERT INTO tm_segment (source, source_norm, target, model_version, hits, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (source, normalise(source), target, model_version or "", hits, created_at)
+                        for source, target, model_version, hits, created_at in rows
+                    ],
+                )
+                self._conn.execute("DROP TABLE tm_segment_old")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tm_source_norm ON tm_segment (source_norm, model_version)"
+            )
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.commit()
+
+    def reopen(self):
+        """New connection for a forked worker; SQLite handles must not cross fork()."""
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+    def lookup(self, sentences: list[str], model_version: str | None = None) -> dict[int, tuple[str, str]]:
+        """
+        Return {index: (target, "exact" | "normalised")} for every sentence
+        found with a translation recorded for `model_version`.
+        """
+        found = {}
+        if not sentences:
+            return found
+        model_version = model_version or ""
+
+        with self._lock:
+            cur = self._conn.cursor()
+            hit_sources = []
+            for i, sentence in enumerate(sentences):
+                if not sentence or not sentence.strip():
+                    continue
+                row = cur.execute(
+                    "SELECT source, target FROM tm_segment WHERE source = ? AND model_version = ?",
+                    (sentence, model_version),
+                ).fetchone()
+                kind = "exact"
+                if row is None:
+                    row = cur.execute(
+                        "SELECT source, target FROM tm_segment WHERE source_norm = ? AND model_version = ? LIMIT 1",
+                        (normalise(sentence), model_version),
+                    ).fetchone()
+                    kind = "normalised"
+                if row is not None:
+                    found[i] = (row[1], kind)
+                    hit_sources.append((row[0], model_version))
+            if hit_sources:
+                cur.executemany(
+                    "UPDATE tm_segment SET hits = hits + 1 WHERE source = ? AND model_version = ?", hit_sources
+                )
+                self._conn.commit()
+        return found
+
+    def store(self, pairs, model_version: str | None = None) -> int:
+        """
+        Insert or replace (source, target) pairs translated by
+        `model_version`. Returns the number written.
+        """
+        now = time.time()
+        rows = [
+            (src, normalise(src), tgt, model_version or "", now)
+            for src, tgt in pairs
+            if src and src.strip() and tgt and tgt.strip()
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO tm_segment (source, source_norm, target, model_version, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(source, model_version) DO UPDATE SET target = excluded.target
+                """,
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM tm_segment"
+            ).fetchone()
+        return {"segments": count, "total_hits": hits, "path": self.path}
+
+
+class MemoTranslator:
+    """
+    The `translate` hook handed to the pipeline: list[str] → list[str].
+
+    Wraps the pipeline's batch translator with the translation memory and
+    keeps per-request hit/miss counters for pipeline_metrics.
+    """
+
+    def __init__(self, tm: TranslationMemory, translate_batch, model_version: str | None = None):
+        self.tm = tm
+        self.translate_batch = translate_batch
+        self.model_version = model_version
+        self.exact_hits = 0
+        self.normalised_hits = 0
+        self.misses = 0
+
+    def __call__(self, sentences: list[str]) -> list[str]:
+        sentences = list(sentences)
+        found = self.tm.lookup(sentences, self.model_version)
+        out = [None] * len(sentences)
+        for i, (target, kind) in found.items():
+            out[i] = target
+            if kind == "exact":
+                self.exact_hits += 1
+            else:
+                self.normalised_hits += 1
+
+        miss_idx = [i for i in range(len(sentences)) if i not in found]
+        if miss_idx:
+            self.misses += len(miss_idx)
+            translated = list(self.translate_batch([sentences[i] for i in miss_idx]))
+            for i, target in zip(miss_idx, translated):
+                out[i] = target
+            self.tm.store(((sentences[i], out[i]) for i in miss_idx), self.model_version)
+        return out
+
+    def stats(self) -> dict:
+        hits = self.exact_hits + self.normalised_hits
+        total = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "normalised_hits": self.normalised_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
@@ -0,0 +1,106 @@
+# external_ai/tts_cache.py
+"""
+Content-addressed cache of synthesised Swahili phrases.
+
+Each entry is the FLAC-encoded waveform for one phrase, keyed by the
+normalised text, voice, TTS model version and sample rate, and stored in a
+size-bounded DiskLRU. The cache is handed to the pipeline as the
+`synthesize` hook, wrapping its own synthesize(text) -> (audio, sample_rate).
+"""
+
+import hashlib
+import logging
+import re
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+from stage_cache import DiskLRU
+
+logger = logging.getLogger("tts_cache")
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalise_phrase(text: str) -> str:
+    # Case and punctuation change prosody, so only whitespace/Unicode form are folded
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WS_RE.sub(" ", text).strip()
+
+
+class TTSCache(DiskLRU):
+    AUDIO_FILE = "audio.flac"
+
+    @staticmethod
+    def phrase_key(text: str, voice: str, model_version: str, sample_rate: int) -> str:
+        raw = "|".join([normalise_phrase(text), voice or "", model_version or "", str(sample_rate)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CachedSynthesizer:
+    """
+    The `synthesize` hook: text -> (audio ndarray, sample_rate).
+
+    Keeps per-request counters for pipeline_metrics: cache hits/misses and the
+    seconds of synthesis avoided (the original synthesis time of every phrase
+    served from cache).
+    """
+
+    def __init__(self, cache: TTSCache, synthesize, voice: str, model_version: str, sample_rate: int):
+        self.cache = cache
+        self.synthesize = synthesize
+        self.voice = voice
+        self.model_version = model_version
+        self.sample_rate = sample_rate
+        self.hits = 0
+        self.misses = 0
+        self.synthesis_seconds_avoided = 0.0
+        self.audio_seconds_reused = 0.0
+
+    def __call__(self, text: str):
+        import soundfile as sf
+
+        key = self.cache.phrase_key(text, self.voice, self.model_version, self.sample_rate)
+        entry = self.cache.get(key)
+        if entry and self.cache.AUDIO_FILE in entry["files"]:
+            audio, sr = sf.read(entry["files"][self.cache.AUDIO_FILE], dtype="float32")
+            self.hits += 1
+            self.synthesis_seconds_avoided += float(entry["value"].get("synth_seconds", 0.0))
+            self.audio_seconds_reused += len(audio) / sr if sr else 0.0
+            return audio, sr
+
+        self.misses += 1
+        start = time.perf_counter()
+        audio, sr = self.synthesize(text)
+        synth_seconds = time.perf_counter() - start
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                flac_path = Path(tmp) / self.cache.AUDIO_FILE
+                sf.write(str(flac_path), audio, sr, format="FLAC", subtype="PCM_16")
+                self.cache.put(
+                    key,
+                    {
+                        "text": normalise_phrase(text),
+                        "voice": self.voice,
+                        "model_version": self.model_version,
+                        "sample_rate": sr,
+                        "synth_seconds": synth_seconds,
+                    },
+                    files={self.cache.AUDIO_FILE: str(flac_path)},
+                )
+        except Exception as exc:
+            logger.warning("[TTS-CACHE] Could not store phrase: %s", exc)
+
+        return audio, sr
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "synthesis_seconds_avoided": round(self.synthesis_seconds_avoided, 3),
+            "audio_seconds_reused": round(self.audio_seconds_reused, 3),
+        }
@@ -0,0 +1,95 @@
+# external_ai/warmup.py
+"""
+Background model warmup.
+
+At startup the server loads the pipeline on a background thread instead of
+on the first /full call, timing each model as it goes. /live only says the
+process is up; /ready says whether the models are loaded, so clients (and
+the Celery worker) can wait for readiness instead of running into a cold
+start.
+
+Per-model timings come from optional `ensure_<model>()` methods on the
+pipeline (e.g. `ensure_asr`, `ensure_mt`). A pipeline without them loads
+everything in its constructor, which is timed as "pipeline".
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger("warmup")
+
+MODELS = ("asr", "punctuation", "mt", "tts", "separation")
+
+
+class Warmup:
+    def __init__(self, load_pipeline, models=MODELS):
+        self.load_pipeline = load_pipeline
+        self.models = models
+        self.state = "pending"  # pending | loading | ready | failed
+        self.current = None
+        self.started_at = None
+        self.finished_at = None
+        self.timings = {}
+        self.error = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> "Warmup":
+        """Load in a daemon thread (idempotent; retries after a failed warmup)."""
+        with self._lock:
+            if self.state in ("pending", "failed") and not (self._thread and self._thread.is_alive()):
+                self._done.clear()
+                self.error = None
+                self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def run(self):
+        """Load synchronously (used by the pre-fork master before forking)."""
+        if self.state in ("loading", "ready"):
+            return
+        self.state = "loading"
+        self.started_at = time.time()
+        try:
+            pipe = self._timed("pipeline", self.load_pipeline)
+            for name in self.models:
+                ensure = getattr(pipe, f"ensure_{name}", None)
+                if callable(ensure):
+                    self._timed(name, ensure)
+            self.state = "ready"
+            logger.info("[WARMUP] Models ready in %.1fs: %s", time.time() - self.started_at, self.timings)
+        except Exception as exc:
+            logger.exception("[WARMUP] Loading %s failed: %s", self.current, exc)
+            self.error = f"{self.current}: {exc}"
+            self.state = "failed"
+        finally:
+            self.current = None
+            self.finished_at = time.time()
+            self._done.set()
+
+    def _timed(self, name, fn):
+        self.current = name
+        t0 = time.perf_counter()
+        value = fn()
+        self.timings[name] = round(time.perf_counter() - t0, 3)
+        return value
+
+    def wait(self, timeout: float | None = None) -> bool:
+        self._done.wait(timeout)
+        return self.ready
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        return {
+            "state": self.state,
+            "loading": self.current,
+            "load_seconds": dict(self.timings),
+            "elapsed_seconds": round((self.finished_at or now) - self.started_at, 1) if self.started_at else None,
+            "error": self.error,
+        }
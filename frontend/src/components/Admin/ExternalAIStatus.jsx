@@ -1,5 +1,39 @@
 // frontend/src/components/Admin/ExternalAIStatus.jsx
 
+const MODEL_LABELS = {
+  pipeline: 'Pipeline',
+  asr: 'Whisper ASR',
+  punctuation: 'Punctuation',
+  mt: 'NLLB + LoRA',
+  tts: 'TTS',
+  separation: 'Demucs',
+}
+
+function WarmupInfo({ warmup }) {
+  const timings = Object.entries(warmup.load_seconds || {})
+  return (
+    <div className="pt-2 border-t border-slate-200 space-y-1">
+      <div className="flex items-center justify-between">
+        <p className="text-[10px] font-medium text-slate-600">Model Warmup</p>
+        <span className="text-[10px] text-slate-500">
+          {warmup.state}
+          {warmup.elapsed_seconds !== null && warmup.elapsed_seconds !== undefined && ` · ${warmup.elapsed_seconds}s`}
+        </span>
+      </div>
+      {warmup.loading && (
+        <p className="text-[10px] text-sky-700">Loading {MODEL_LABELS[warmup.loading] || warmup.loading}...</p>
+      )}
+      {timings.map(([name, seconds]) => (
+        <div key={name} className="flex items-center justify-between">
+          <span className="text-[10px] text-slate-500">{MODEL_LABELS[name] || name}</span>
+          <span className="text-[10px] text-slate-700">{seconds.toFixed(1)} s</span>
+        </div>
+      ))}
+      {warmup.error && <p className="text-[10px] text-red-700">{warmup.error}</p>}
+    </div>
+  )
+}
+
 function getStatusBadgeClass(status) {
   switch (status) {
     case 'online':
@@ -8,6 +42,8 @@ function getStatusBadgeClass(status) {
       return 'bg-red-100 text-red-800'
     case 'timeout':
       return 'bg-amber-100 text-amber-800'
+    case 'warming_up':
+      return 'bg-sky-100 text-sky-800'
     case 'error':
       return 'bg-red-100 text-red-800'
     default:
@@ -40,7 +76,7 @@ export default function ExternalAIStatus({ status, loading }) {
         <div className="flex items-center justify-between">
           <span className="text-xs text-slate-600">Status</span>
           <span className={`px-2 py-0.5 rounded-full text-[10px] font-medium ${getStatusBadgeClass(status.status)}`}>
-            {status.status}
+            {status.status === 'warming_up' ? 'warming up' : status.status}
           </span>
         </div>
 
@@ -65,6 +101,8 @@ export default function ExternalAIStatus({ status, loading }) {
           </div>
         )}
 
+        {status.warmup && <WarmupInfo warmup={status.warmup} />}
+
         {status.error && (
           <div className="rounded-lg bg-red-50 border border-red-200 px-3 py-2 text-xs text-red-700">
             {status.error}
@@ -15,7 +15,9 @@ export default function StepDurationChart({ stepDurations }) {
     avg: stats.avg || 0,
     min: stats.min || 0,
     max: stats.max || 0,
+    cpu: stats.avg_cpu || 0,
   }))
+  const hasCpu = chartData.some((d) => d.cpu > 0)
 
   return (
     <ResponsiveContainer width="100%" height={300}>
@@ -28,6 +30,7 @@ export default function StepDurationChart({ stepDurations }) {
         <Bar dataKey="avg" fill="#0ea5e9" name="Avg Duration (s)" />
         <Bar dataKey="min" fill="#94a3b8" name="Min Duration (s)" />
         <Bar dataKey="max" fill="#f59e0b" name="Max Duration (s)" />
+        {hasCpu && <Bar dataKey="cpu" fill="#10b981" name="Avg CPU (s)" />}
       </BarChart>
     </ResponsiveContainer>
   )
@@ -6,16 +6,20 @@ export default function Pagination({
   total,
   onPageChange,
   compact = false,
+  // Cursor-paged lists: whether a next page exists, and whether `total` is an estimate
+  hasNext,
+  approximate = false,
 }) {
   const currentPage = page || 1
   const size = pageSize || 20
   const totalItems = total || 0
-  const totalPages = Math.max(1, Math.ceil(totalItems / size))
+  const totalPages = Math.max(currentPage, Math.ceil(totalItems / size))
+  const approx = approximate ? '~' : ''
 
   const canPrev = currentPage > 1
-  const canNext = currentPage < totalPages
+  const canNext = hasNext ?? currentPage < totalPages
 
-  if (totalPages <= 1 && totalItems <= size) {
+  if (totalPages <= 1 && totalItems <= size && !canNext) {
     return null
   }
 
@@ -31,7 +35,7 @@ export default function Pagination({
           <span className="font-medium">
             {Math.min(currentPage * size, totalItems)}
           </span>{' '}
-          of <span className="font-medium">{totalItems}</span> jobs
+          of <span className="font-medium">{approx}{totalItems}</span> jobs
         </div>
       )}
 
@@ -46,7 +50,7 @@ export default function Pagination({
         </button>
         <span className="px-2">
           Page <span className="font-semibold">{currentPage}</span> of{' '}
-          <span className="font-semibold">{totalPages}</span>
+          <span className="font-semibold">{approx}{totalPages}</span>
         </span>
         <button
           type="button"
@@ -1,11 +1,61 @@
 // frontend/src/hooks/useJobStatus.js
 import { useEffect, useRef, useState } from 'react'
 
+const TERMINAL_STATES = ['completed', 'succeeded', 'failed', 'cancelled']
+
+// Give up on the live stream after this many errors without a message in between
+const MAX_STREAM_ERRORS = 3
+
+function toStatus(data) {
+  return {
+    id: data.id,
+    state: data.state,
+    current_step: data.current_step,
+    progress: data.progress ?? data.meta?.progress ?? null,
+    steps: data.steps || [],
+    meta: data.meta || {},
+    input_s3_uri: data.input_s3_uri,
+    output_s3_uri: data.output_s3_uri,
+    created_at: data.created_at,
+    started_at: data.started_at,
+    finished_at: data.finished_at,
+
+    retry_count: data.retry_count || 0,
+    last_error_message: data.last_error_message || null,
+  }
+}
+
+// Apply a snapshot/delta from /events: job fields replace, steps merge by name
+function mergeLive(prev, delta) {
+  const next = { ...(prev || {}) }
+  Object.entries(delta).forEach(([key, value]) => {
+    if (key !== 'steps') next[key] = value
+  })
+  if (Array.isArray(delta.steps)) {
+    const byName = new Map((next.steps || []).map((s) => [s.name, s]))
+    delta.steps.forEach((s) => byName.set(s.name, { ...(byName.get(s.name) || {}), ...s }))
+    next.steps = Array.from(byName.values())
+  }
+  if (delta.progress !== undefined) {
+    next.meta = { ...(next.meta || {}), progress: delta.progress }
+  }
+  return next
+}
+
+/**
+ * Job status for `jobId`.
+ *
+ * Loads /api/jobs/status/<id> once, then follows /api/jobs/<id>/events
+ * (Server-Sent Events carrying only state/progress changes). Falls back to
+ * polling every `pollIntervalMs` when EventSource or the stream is
+ * unavailable.
+ */
 export default function useJobStatus(jobId, { pollIntervalMs = 2500 } = {}) {
   const [status, setStatus] = useState(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
   const intervalRef = useRef(null)
+  const sourceRef = useRef(null)
 
   useEffect(() => {
     if (!jobId) return
@@ -20,41 +70,73 @@ export default function useJobStatus(jobId, { pollIntervalMs = 2500 } = {}) {
         if (!res.ok) throw new Error(data.error || 'Failed to fetch job status')
 
         if (!cancelled) {
-          setStatus({
-            id: data.id,
-            state: data.state,
-            current_step: data.current_step,
-            progress: data.progress ?? data.meta?.progress ?? null,
-            steps: data.steps || [],
-            meta: data.meta || {},
-            input_s3_uri: data.input_s3_uri,
-            output_s3_uri: data.output_s3_uri,
-            created_at: data.created_at,
-            started_at: data.started_at,
-            finished_at: data.finished_at,
-
-            retry_count: data.retry_count || 0,
-            last_error_message: data.last_error_message || null,
-          })
+          setStatus(toStatus(data))
           setError('')
         }
 
-        if (['completed', 'succeeded', 'failed', 'cancelled'].includes(data.state)) {
+        if (TERMINAL_STATES.includes(data.state)) {
           clearInterval(intervalRef.current)
+          sourceRef.current?.close()
         }
+        return data
       } catch (err) {
         if (!cancelled) setError(err.message)
+        return null
       } finally {
         if (!cancelled) setLoading(false)
       }
     }
 
-    fetchStatus()
-    intervalRef.current = setInterval(fetchStatus, pollIntervalMs)
+    function startPolling() {
+      sourceRef.current?.close()
+      sourceRef.current = null
+      if (cancelled || intervalRef.current) return
+      intervalRef.current = setInterval(fetchStatus, pollIntervalMs)
+    }
+
+    function startStream() {
+      if (typeof EventSource === 'undefined') {
+        startPolling()
+        return
+      }
+      let errors = 0
+      const source = new EventSource(`/api/jobs/${jobId}/events`, { withCredentials: true })
+      sourceRef.current = source
+
+      const onMessage = (event) => {
+        errors = 0
+        const delta = JSON.parse(event.data)
+        if (!cancelled) setStatus((prev) => mergeLive(prev, delta))
+        if (TERMINAL_STATES.includes(delta.state)) {
+          source.close()
+          // Outputs and transcripts live in meta, which the stream doesn't carry
+          fetchStatus()
+        }
+      }
+      source.addEventListener('snapshot', onMessage)
+      source.addEventListener('delta', onMessage)
+      source.onerror = () => {
+        // The browser reconnects by itself (e.g. after the server's stream
+        // time limit); fall back to polling if the stream is refused or keeps failing
+        errors += 1
+        if (source.readyState === EventSource.CLOSED || errors >= MAX_STREAM_ERRORS) {
+          startPolling()
+        }
+      }
+    }
+
+    fetchStatus().then((data) => {
+      if (cancelled || (data && TERMINAL_STATES.includes(data.state))) return
+      if (data) startStream()
+      else startPolling()
+    })
 
     return () => {
       cancelled = true
       clearInterval(intervalRef.current)
+      intervalRef.current = null
+      sourceRef.current?.close()
+      sourceRef.current = null
     }
   }, [jobId, pollIntervalMs])
 
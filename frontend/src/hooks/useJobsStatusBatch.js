@@ -0,0 +1,65 @@
+// frontend/src/hooks/useJobsStatusBatch.js
+import { useEffect, useRef, useState } from 'react'
+
+const ACTIVE_STATES = ['queued', 'running']
+
+/**
+ * Live state/progress for the unfinished jobs in `jobs` (a loaded list page).
+ *
+ * Polls /api/jobs/status:batch for all of them in one request every
+ * `pollIntervalMs`. The server answers 304 while nothing changed (ETag,
+ * revalidated by the browser cache). Returns { [jobId]: { state, progress,
+ * current_step, retry_count, steps, ... } } to merge over the list rows.
+ */
+export default function useJobsStatusBatch(jobs, { pollIntervalMs = 5000 } = {}) {
+  const [live, setLive] = useState({})
+  const etagRef = useRef(null)
+
+  // A freshly loaded list is newer than anything polled for the previous one
+  useEffect(() => {
+    setLive({})
+    etagRef.current = null
+  }, [jobs])
+
+  const ids = jobs
+    .filter((job) => ACTIVE_STATES.includes((live[job.id] || job).state))
+    .map((job) => job.id)
+    .join(',')
+
+  useEffect(() => {
+    if (!ids) return
+    let cancelled = false
+
+    async function poll() {
+      try {
+        const res = await fetch(`/api/jobs/status:batch?ids=${ids}`, {
+          credentials: 'include',
+          cache: 'no-cache',
+        })
+        if (!res.ok || cancelled) return
+        const etag = res.headers.get('ETag')
+        if (etag && etag === etagRef.current) return
+        const data = await res.json()
+        if (cancelled) return
+        etagRef.current = etag
+        setLive((prev) => {
+          const next = { ...prev }
+          data.jobs.forEach((job) => {
+            next[job.id] = job
+          })
+          return next
+        })
+      } catch (err) {
+        console.error('Batch status fetch error', err)
+      }
+    }
+
+    const timer = setInterval(poll, pollIntervalMs)
+    return () => {
+      cancelled = true
+      clearInterval(timer)
+    }
+  }, [ids, pollIntervalMs])
+
+  return live
+}
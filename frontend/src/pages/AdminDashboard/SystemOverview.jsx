@@ -129,7 +129,7 @@ export default function SystemOverview() {
       ) : (
         <>
           {/* Metric Cards */}
-          <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-4">
+          <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-5">
             <MetricCard
               title="Total Jobs"
               value={metrics?.total_jobs || 0}
@@ -147,6 +147,11 @@ export default function SystemOverview() {
               title="Succeeded Jobs"
               value={metrics?.jobs_by_state?.succeeded || 0}
             />
+            <MetricCard
+              title="Dedup Hit Rate"
+              value={metrics?.dedup?.hit_rate != null ? `${(metrics.dedup.hit_rate * 100).toFixed(1)}%` : '—'}
+              subtitle={`${metrics?.dedup?.hits || 0} of ${metrics?.dedup?.eligible || 0} hashed uploads`}
+            />
           </div>
 
           {/* Charts Row */}
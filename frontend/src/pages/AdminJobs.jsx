@@ -1,8 +1,9 @@
 // frontend/src/pages/AdminJobs.jsx
-import { useEffect, useState } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import { Link } from 'react-router-dom'
 import useAuth from '../hooks/useAuth'
 import { retryJob, fetchJobLogs, bulkRetryFailed } from '../utils/jobActions'
+import useJobsStatusBatch from '../hooks/useJobsStatusBatch'
 import StatusBadge from '../components/StatusBadge'
 import Pagination from '../components/Pagination'
 import SearchBar from '../components/SearchBar'
@@ -25,6 +26,13 @@ export default function AdminJobs() {
   const [page, setPage] = useState(1)
   const [pageSize] = useState(50)
   const [total, setTotal] = useState(0)
+  const [hasNext, setHasNext] = useState(false)
+  // Keyset paging: cursorsRef.current[n] is the cursor that loads page n + 1
+  const cursorsRef = useRef([''])
+
+  // Keep unfinished rows current without reloading the page of jobs
+  const live = useJobsStatusBatch(jobs)
+  const rows = jobs.map((job) => ({ ...job, ...(live[job.id] || {}) }))
 
   const isAdmin = user?.role === 'admin'
 
@@ -42,7 +50,9 @@ export default function AdminJobs() {
       setError('')
 
       const params = new URLSearchParams()
-      params.set('page', String(nextPage))
+      if (nextPage === 1) cursorsRef.current = ['']
+      params.set('cursor', cursorsRef.current[nextPage - 1] ?? '')
+      params.set('total', 'approx')
       params.set('page_size', String(pageSize))
       if (searchTerm) params.set('search', searchTerm)
       if (state) params.set('state', state)
@@ -57,7 +67,9 @@ export default function AdminJobs() {
       }
 
       setJobs(data.jobs || [])
-      setPage(data.page || nextPage)
+      cursorsRef.current[nextPage] = data.next_cursor
+      setHasNext(Boolean(data.next_cursor))
+      setPage(nextPage)
       setTotal(data.total || 0)
     } catch (err) {
       console.error('AdminJobs fetch error', err)
@@ -208,7 +220,7 @@ export default function AdminJobs() {
                     </tr>
                   </thead>
                   <tbody>
-                    {jobs.map((job) => (
+                    {rows.map((job) => (
                       <tr key={job.id} className="border-b border-slate-100">
                         <td className="px-3 py-2 font-mono text-[11px] text-slate-700">
                           {job.id.slice(0, 8)}…
@@ -279,6 +291,8 @@ export default function AdminJobs() {
                 page={page}
                 pageSize={pageSize}
                 total={total}
+                hasNext={hasNext}
+                approximate
                 onPageChange={handlePageChange}
               />
             </>
@@ -2,6 +2,7 @@
 import { useEffect, useState } from 'react'
 import { Link } from 'react-router-dom'
 import { retryJob, fetchJobLogs } from '../utils/jobActions'
+import useJobsStatusBatch from '../hooks/useJobsStatusBatch'
 import StatusBadge from '../components/StatusBadge'
 import Pagination from '../components/Pagination'
 import SearchBar from '../components/SearchBar'
@@ -24,6 +25,10 @@ export default function MyJobs() {
   const [pageSize] = useState(20)
   const [total, setTotal] = useState(0)
 
+  // Keep unfinished rows current without reloading the page of jobs
+  const live = useJobsStatusBatch(jobs)
+  const rows = jobs.map((job) => ({ ...job, ...(live[job.id] || {}) }))
+
   async function loadJobs(opts = {}) {
     const { nextPage = page, searchTerm = search, state = stateFilter } = opts
 
@@ -167,7 +172,7 @@ export default function MyJobs() {
                 </tr>
               </thead>
               <tbody>
-                {jobs.map((job) => (
+                {rows.map((job) => (
                   <tr key={job.id} className="border-b border-slate-100">
                     <td className="px-3 py-2 font-mono text-[11px] text-slate-700">
                       {job.id.slice(0, 8)}…